@@ -4,8 +4,8 @@ Now powered by the unified pipeline for consistency and reliability.
 
 HTMX + Alpine.js compatible REST API
 """
-from fastapi import FastAPI, Request, BackgroundTasks, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
@@ -34,8 +34,10 @@ load_dotenv(Path(__file__).parent / ".env")  # Also load from app/.env
 from language_config import MULTILINGUAL_VOICES, LANGUAGE_INFO, list_available_languages
 
 # Import unified pipeline
-from video_gen.pipeline import get_pipeline
+from video_gen.pipeline import get_pipeline, TaskEventBroker, TaskState, TaskStatus, Event, EventType
 from video_gen.shared.models import InputConfig
+from video_gen.shared.exceptions import QueueFullError
+from video_gen.shared.metrics import registry as metrics_registry
 
 # Configure logging
 logging.basicConfig(
@@ -44,6 +46,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline events are pushed to SSE clients through per-task queues
+task_events = TaskEventBroker(max_backlog=100)
+_task_events_attached = False
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def get_task_events() -> TaskEventBroker:
+    """Return the SSE event broker, attached to the pipeline's event emitter."""
+    global _task_events_attached
+
+    if not _task_events_attached:
+        task_events.attach(get_pipeline().event_emitter)
+        _task_events_attached = True
+    return task_events
+
 
 # ============================================================================
 # Modern Lifespan Context Manager (replaces deprecated on_event)
@@ -60,6 +79,8 @@ async def lifespan(app: FastAPI):
     try:
         pipeline = get_pipeline()
         logger.info(f"✅ Pipeline initialized with {len(pipeline.stages)} stages")
+        get_task_events()
+        pipeline.job_queue.start()
         logger.info("✅ Video generation system ready!")
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}", exc_info=True)
@@ -69,6 +90,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("🛑 Shutting down video generation system...")
+    # Running jobs are persisted and resume on the next startup
+    pipeline = get_pipeline()
+    await pipeline.job_queue.stop()
+    # Stops the render worker processes
+    await asyncio.to_thread(pipeline.close)
 
 
 app = FastAPI(
@@ -174,7 +200,7 @@ async def create(request: Request):
 # ============================================================================
 
 @app.post("/api/parse/document")
-async def parse_document(input: DocumentInput, background_tasks: BackgroundTasks):
+async def parse_document(input: DocumentInput, http_request: Request, priority: str = "normal"):
     """
     Parse document and generate video set.
     Now uses unified pipeline for consistency.
@@ -200,13 +226,8 @@ async def parse_document(input: DocumentInput, background_tasks: BackgroundTasks
         # Get pipeline singleton
         pipeline = get_pipeline()
 
-        # Execute asynchronously in background - PASS task_id!
-        background_tasks.add_task(
-            execute_pipeline_task,
-            pipeline,
-            input_config,
-            task_id  # Pass the task_id as third argument
-        )
+        # Queue for a pipeline worker - PASS task_id!
+        submit_pipeline_task(pipeline, input_config, task_id, http_request, priority)
 
         logger.info(f"Document parsing started: {task_id}")
 
@@ -216,12 +237,14 @@ async def parse_document(input: DocumentInput, background_tasks: BackgroundTasks
             "message": "Document parsing started"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Document parsing failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/parse/youtube")
-async def parse_youtube(input: YouTubeInput, background_tasks: BackgroundTasks):
+async def parse_youtube(input: YouTubeInput, http_request: Request, priority: str = "normal"):
     """
     Parse YouTube video and generate script.
     Now uses unified pipeline.
@@ -243,13 +266,8 @@ async def parse_youtube(input: YouTubeInput, background_tasks: BackgroundTasks):
 
         pipeline = get_pipeline()
 
-        # Pass task_id to background task
-        background_tasks.add_task(
-            execute_pipeline_task,
-            pipeline,
-            input_config,
-            task_id
-        )
+        # Queue for a pipeline worker with this task_id
+        submit_pipeline_task(pipeline, input_config, task_id, http_request, priority)
 
         logger.info(f"YouTube parsing started: {task_id}")
 
@@ -259,12 +277,14 @@ async def parse_youtube(input: YouTubeInput, background_tasks: BackgroundTasks):
             "message": "YouTube parsing started"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"YouTube parsing failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/generate")
-async def generate_videos(video_set: VideoSet, background_tasks: BackgroundTasks):
+async def generate_videos(video_set: VideoSet, http_request: Request, priority: str = "normal"):
     """
     Generate videos from video set.
     Now uses unified pipeline.
@@ -285,13 +305,8 @@ async def generate_videos(video_set: VideoSet, background_tasks: BackgroundTasks
 
         pipeline = get_pipeline()
 
-        # Pass task_id to background task
-        background_tasks.add_task(
-            execute_pipeline_task,
-            pipeline,
-            input_config,
-            task_id
-        )
+        # Queue for a pipeline worker with this task_id
+        submit_pipeline_task(pipeline, input_config, task_id, http_request, priority)
 
         logger.info(f"Video generation started: {task_id} for set {video_set.set_id}")
 
@@ -301,6 +316,8 @@ async def generate_videos(video_set: VideoSet, background_tasks: BackgroundTasks
             "message": "Video generation started"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Video generation failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -324,11 +341,17 @@ async def get_task_status(task_id: str):
         return {
             "task_id": task_state.task_id,
             "status": _map_status(task_state.status.value),
-            "progress": int(task_state.overall_progress),
+            "progress": int(task_state.overall_progress * 100),
             "message": task_state.current_stage or "Processing...",
             "type": _infer_type_from_input(task_state.input_config),
             "errors": task_state.errors if task_state.errors else None,
-            "result": task_state.result if task_state.status.value == "completed" else None
+            "result": task_state.result if task_state.status.value == "completed" else None,
+            # Per-stage timings, CPU and memory (see video_gen/shared/metrics.py)
+            "metrics": {
+                name: stage.metadata["metrics"]
+                for name, stage in task_state.stages.items()
+                if "metrics" in stage.metadata
+            }
         }
 
     except HTTPException:
@@ -341,52 +364,50 @@ async def get_task_status(task_id: str):
 async def stream_task_progress(task_id: str):
     """
     Stream real-time progress via Server-Sent Events.
-    Now uses pipeline event system for real-time updates.
+
+    Subscribes to the pipeline's events for the task, so updates are
+    pushed as they happen; the state file is only read once up front
+    (plus once per idle keep-alive, in case the task finished elsewhere).
     """
     async def event_generator():
         pipeline = get_pipeline()
-
-        # Check if task exists
-        task_state = pipeline.state_manager.load(task_id)
-        if not task_state:
-            # Send error and close
-            yield f"data: {json.dumps({'error': 'Task not found'})}\n\n"
-            return
-
-        last_progress = -1
-
-        # Poll for updates (simplified - could use actual event subscription)
-        while True:
-            try:
-                # Reload state
-                task_state = pipeline.state_manager.load(task_id)
-                if not task_state:
-                    break
-
-                current_progress = int(task_state.overall_progress)
-
-                # Send update if progress changed
-                if current_progress != last_progress:
-                    last_progress = current_progress
-
-                    event_data = {
-                        "task_id": task_id,
-                        "status": _map_status(task_state.status.value),
-                        "progress": current_progress,
-                        "message": task_state.current_stage or "Processing..."
-                    }
-
-                    yield f"data: {json.dumps(event_data)}\n\n"
-
-                # Stop if completed or failed
-                if task_state.status.value in ["completed", "failed", "cancelled"]:
-                    break
-
-                await asyncio.sleep(0.5)
-
-            except Exception as e:
-                logger.error(f"Error streaming progress: {e}")
-                break
+        broker = get_task_events()
+
+        # Subscribe before reading the state so no event is missed in between
+        queue = broker.subscribe(task_id)
+        try:
+            if not pipeline.state_manager.exists(task_id):
+                # Send error and close
+                yield f"data: {json.dumps({'error': 'Task not found'})}\n\n"
+                return
+
+            task_state = pipeline.state_manager.load(task_id)
+            yield _sse_progress(task_state)
+            if task_state.status.value in TERMINAL_STATUSES:
+                return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    task_state = pipeline.state_manager.load(task_id)
+                    if task_state.status.value in TERMINAL_STATUSES:
+                        yield _sse_progress(task_state)
+                        return
+                    continue
+
+                message = _apply_event(task_state, event)
+                yield _sse_progress(task_state, message, event)
+
+                if task_state.status.value in TERMINAL_STATUSES:
+                    return
+
+        except Exception as e:
+            logger.error(f"Error streaming progress: {e}")
+        finally:
+            broker.unsubscribe(task_id, queue)
 
     return StreamingResponse(
         event_generator(),
@@ -398,6 +419,41 @@ async def stream_task_progress(task_id: str):
         }
     )
 
+
+def _apply_event(task_state: TaskState, event: Event) -> Optional[str]:
+    """Fold a pipeline event into a task state copy, returning its message."""
+    if event.type == EventType.STAGE_STARTED:
+        task_state.start_stage(event.stage)
+    elif event.type == EventType.STAGE_PROGRESS and event.progress is not None:
+        task_state.update_stage_progress(event.stage, event.progress)
+    elif event.type == EventType.STAGE_COMPLETED:
+        task_state.complete_stage(event.stage)
+    elif event.type == EventType.STAGE_FAILED:
+        task_state.fail_stage(event.stage, event.message or "Stage failed")
+    elif event.type == EventType.PIPELINE_COMPLETED:
+        task_state.status = TaskStatus.COMPLETED
+        task_state.overall_progress = 1.0
+    elif event.type == EventType.PIPELINE_FAILED:
+        task_state.status = TaskStatus.FAILED
+    elif event.type == EventType.PIPELINE_CANCELLED:
+        task_state.status = TaskStatus.CANCELLED
+    return event.message
+
+
+def _sse_progress(task_state: TaskState, message: Optional[str] = None,
+                  event: Optional[Event] = None) -> str:
+    """Format a task's progress as an SSE data line."""
+    event_data = {
+        "task_id": task_state.task_id,
+        "status": _map_status(task_state.status.value),
+        "progress": int(task_state.overall_progress * 100),
+        "message": message or task_state.current_stage or "Processing...",
+        "stage": task_state.current_stage,
+    }
+    if event is not None and event.type == EventType.STAGE_PROGRESS:
+        event_data["stage_progress"] = event.progress
+    return f"data: {json.dumps(event_data)}\n\n"
+
 @app.get("/api/scene-types")
 async def get_scene_types():
     """Get available scene types"""
@@ -467,7 +523,7 @@ async def get_language_voices(lang_code: str):
     }
 
 @app.post("/api/generate/multilingual")
-async def generate_multilingual(request: MultilingualRequest, background_tasks: BackgroundTasks):
+async def generate_multilingual(request: MultilingualRequest, http_request: Request, priority: str = "normal"):
     """
     Generate multilingual videos.
     Now uses unified pipeline with multilingual config.
@@ -494,13 +550,8 @@ async def generate_multilingual(request: MultilingualRequest, background_tasks:
 
         pipeline = get_pipeline()
 
-        # Pass task_id to the background task
-        background_tasks.add_task(
-            execute_pipeline_task,
-            pipeline,
-            input_config,
-            task_id  # Pass task_id so pipeline uses this ID
-        )
+        # Queue for a pipeline worker with this task_id
+        submit_pipeline_task(pipeline, input_config, task_id, http_request, priority)
 
         logger.info(f"Multilingual generation started: {task_id} for {len(request.target_languages)} languages")
 
@@ -512,37 +563,53 @@ async def generate_multilingual(request: MultilingualRequest, background_tasks:
             "source_language": request.source_language
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Multilingual generation failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
-# Pipeline Integration - Background Task Execution
+# Pipeline Integration - Job Queue Submission
 # ============================================================================
 
-async def execute_pipeline_task(pipeline: Any, input_config: InputConfig, task_id: str = None):
+def submit_pipeline_task(
+    pipeline: Any,
+    input_config: InputConfig,
+    task_id: str,
+    http_request: Request,
+    priority: str = "normal"
+):
     """
-    Execute pipeline in background.
+    Queue a pipeline execution.
 
     This is the unified execution path for all video generation tasks.
-    The pipeline handles all stages automatically with state persistence.
+    The job queue bounds how many pipelines run at once and takes
+    clients in turn; the pipeline handles all stages with state persistence.
 
     Args:
         pipeline: PipelineOrchestrator instance
         input_config: Input configuration for the pipeline
-        task_id: Optional task ID to use (if not provided, pipeline generates one)
+        task_id: Task ID to track the execution under
+        http_request: Incoming request (its client identifies the submitter)
+        priority: "high", "normal" or "low"
+
+    Raises:
+        HTTPException: 400 for an unknown priority, 429 (with Retry-After)
+            when the queue is full
     """
+    submitter = http_request.client.host if http_request.client else "anonymous"
     try:
-        # Execute the complete pipeline
-        # IMPORTANT: Pass task_id to ensure consistent tracking
-        result = await pipeline.execute(input_config, task_id=task_id)
-
-        logger.info(f"Pipeline completed successfully: {result.task_id}")
-
-    except Exception as e:
-        logger.error(f"Pipeline execution failed for task {task_id}: {e}", exc_info=True)
-        # Pipeline automatically persists failure state
-        # No need for manual error handling
+        pipeline.job_queue.submit(input_config, task_id, priority=priority, submitter=submitter)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFullError as e:
+        logger.warning(f"Rejected task {task_id}: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
 
 
 # ============================================================================
@@ -674,6 +741,31 @@ async def health_check():
             "error": str(e)
         }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics.
+
+    Per-stage durations, CPU time, peak RSS, span timings and counters
+    (frames, bytes written, ...) of stages run by this process, plus the
+    current job queue depth.
+    """
+    pipeline = get_pipeline()
+    stats = pipeline.job_queue.stats()
+    metrics_registry.gauge(
+        "video_gen_jobs_running", "Pipelines currently running"
+    ).set(stats["running"])
+    queued = metrics_registry.gauge(
+        "video_gen_jobs_queued", "Pipelines waiting in the job queue", ("priority",)
+    )
+    for priority, count in stats["queued_by_priority"].items():
+        queued.set(count, priority=priority)
+
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 # ============================================================================
 # Template Management Endpoints
 # ============================================================================
@@ -12,6 +12,7 @@ from pathlib import Path
 
 from video_gen.pipeline import get_pipeline, TaskStatus
 from video_gen.shared.models import InputConfig
+from video_gen.shared.exceptions import QueueFullError
 
 
 app = FastAPI(
@@ -73,6 +74,12 @@ async def create_video(request: CreateVideoRequest, background_tasks: Background
             "message": "Video generation started"
         }
 
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -114,8 +121,7 @@ async def list_tasks(status: Optional[str] = None, limit: int = 10):
         except KeyError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
 
-    tasks = pipeline.list_tasks(status_filter)
-    tasks = tasks[:limit]
+    tasks = pipeline.list_tasks(status_filter, limit)
 
     return {
         "tasks": [
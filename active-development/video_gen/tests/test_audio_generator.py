@@ -9,6 +9,7 @@ import asyncio
 from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 import json
+import os
 import sys
 
 # Add parent directory to path for imports
@@ -20,6 +21,9 @@ from video_gen.audio_generator.unified import (
     AudioGenerationResult,
     SceneAudioResult
 )
+from video_gen.audio_generator.tts import TTSBackend
+from video_gen.audio_generator.cache import AudioCache, audio_cache_key
+from video_gen.audio_generator.duration import mp3_duration, probe_duration, parse_ffmpeg_duration
 from video_gen.shared.models import VideoConfig, SceneConfig
 
 
@@ -434,5 +438,289 @@ class TestBackwardCompatibilityFunctions:
             assert results["test_video"].success is True
 
 
+class FakeTTSBackend(TTSBackend):
+    """Local TTS stand-in that records calls and concurrency."""
+
+    def __init__(self, delays=None, failures=None):
+        self.delays = delays or {}
+        self.failures = dict(failures or {})
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def synthesize(self, text, voice, output_file, rate="+0%", volume="+0%"):
+        self.calls.append((text, voice))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0))
+            if self.failures.get(text, 0) > 0:
+                self.failures[text] -= 1
+                raise ConnectionError(f"transient failure for {text}")
+            Path(output_file).write_bytes(b"fake mp3")
+        finally:
+            self.active -= 1
+
+
+class TestConcurrentSynthesis:
+    """Test concurrent scene synthesis against a fake TTS backend."""
+
+    @pytest.fixture
+    def scenes_video(self):
+        """Video whose later scenes finish first."""
+        return VideoConfig(
+            video_id="concurrent_video",
+            title="Concurrent",
+            description="Concurrent synthesis",
+            scenes=[
+                SceneConfig(
+                    scene_id=f"scene_{i}",
+                    scene_type="title",
+                    narration=f"Narration {i}",
+                    visual_content={},
+                    voice="male"
+                )
+                for i in range(4)
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, tmp_path, scenes_video):
+        """No more than max_concurrency requests run at once."""
+        backend = FakeTTSBackend(delays={f"Narration {i}": 0.02 for i in range(4)})
+        audio_config = AudioGenerationConfig(output_dir=tmp_path, max_concurrency=2)
+        generator = UnifiedAudioGenerator(audio_config, tts_backend=backend)
+
+        with patch.object(generator, '_measure_audio_duration', return_value=2.0):
+            result = await generator.generate_for_video(scenes_video)
+
+        assert result.success is True
+        assert len(backend.calls) == 4
+        assert backend.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_results_keep_scene_order(self, tmp_path, scenes_video):
+        """Scene results and timing report follow scene order, not completion order."""
+        backend = FakeTTSBackend(delays={f"Narration {i}": 0.01 * (4 - i) for i in range(4)})
+        audio_config = AudioGenerationConfig(output_dir=tmp_path, max_concurrency=4)
+        generator = UnifiedAudioGenerator(audio_config, tts_backend=backend)
+
+        with patch.object(generator, '_measure_audio_duration', return_value=2.0):
+            result = await generator.generate_for_video(scenes_video)
+
+        assert [r.scene_id for r in result.scene_results] == [f"scene_{i}" for i in range(4)]
+        report = json.loads(result.timing_report.read_text(encoding='utf-8'))
+        assert [s["scene_id"] for s in report["scenes"]] == [f"scene_{i}" for i in range(4)]
+        assert report["scenes"][1]["start_time"] == report["scenes"][0]["end_time"]
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_retried(self, tmp_path, scenes_video):
+        """A scene that fails fewer times than the retry budget still succeeds."""
+        backend = FakeTTSBackend(failures={"Narration 2": 2})
+        audio_config = AudioGenerationConfig(output_dir=tmp_path, retries=2, retry_backoff=0)
+        generator = UnifiedAudioGenerator(audio_config, tts_backend=backend)
+
+        with patch.object(generator, '_measure_audio_duration', return_value=2.0):
+            result = await generator.generate_for_video(scenes_video)
+
+        assert result.success is True
+        assert [text for text, _ in backend.calls].count("Narration 2") == 3
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_report_scene_error(self, tmp_path, scenes_video):
+        """A persistently failing scene is reported without losing the others."""
+        backend = FakeTTSBackend(failures={"Narration 1": 5})
+        audio_config = AudioGenerationConfig(output_dir=tmp_path, retries=1, retry_backoff=0)
+        generator = UnifiedAudioGenerator(audio_config, tts_backend=backend)
+
+        with patch.object(generator, '_measure_audio_duration', return_value=2.0):
+            result = await generator.generate_for_video(scenes_video)
+
+        assert result.success is False
+        assert len(result.errors) == 1
+        assert "scene_1" in result.errors[0]
+        assert [r.scene_id for r in result.scene_results] == ["scene_0", "scene_2", "scene_3"]
+
+
+class TestAudioCache:
+    """Test the content-addressed TTS audio cache."""
+
+    def _mp3(self, tmp_path, name, size=100):
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        return path
+
+    def test_key_covers_all_inputs(self):
+        """Text, voice, rate, volume and engine all change the key."""
+        base = audio_cache_key("Hello", "en-US-GuyNeural")
+        assert audio_cache_key("Hello", "en-US-GuyNeural") == base
+        assert audio_cache_key("Hello!", "en-US-GuyNeural") != base
+        assert audio_cache_key("Hello", "en-US-AriaNeural") != base
+        assert audio_cache_key("Hello", "en-US-GuyNeural", rate="+10%") != base
+        assert audio_cache_key("Hello", "en-US-GuyNeural", volume="-5%") != base
+        assert audio_cache_key("Hello", "en-US-GuyNeural", engine="edge-tts/9") != base
+
+    def test_round_trip_copies_audio_and_duration(self, tmp_path):
+        """A stored entry is copied to the destination with its duration."""
+        cache = AudioCache(tmp_path / "cache")
+        cache.put("abcd", self._mp3(tmp_path, "src.mp3"), 3.25)
+
+        dest = tmp_path / "dest.mp3"
+        assert cache.get("abcd", dest) == 3.25
+        assert dest.read_bytes() == b"x" * 100
+        assert cache.get("ffff", tmp_path / "missing.mp3") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+    def test_least_recently_used_entries_evicted(self, tmp_path):
+        """Exceeding max_bytes evicts the entries used longest ago."""
+        cache = AudioCache(tmp_path / "cache", max_bytes=250)
+        for i, key in enumerate(["aa01", "bb02"]):
+            cache.put(key, self._mp3(tmp_path, f"{key}.mp3"), 1.0)
+            os.utime(cache._paths(key)[0], (1000 + i, 1000 + i))
+
+        cache.get("aa01", tmp_path / "hit.mp3")  # aa01 is now most recent
+        cache.put("cc03", self._mp3(tmp_path, "cc03.mp3"), 1.0)
+
+        assert cache.get("bb02", tmp_path / "out.mp3") is None
+        assert cache.get("aa01", tmp_path / "out.mp3") == 1.0
+        assert cache.stats()["evictions"] == 1
+
+    def test_overwrite_does_not_inflate_size(self, tmp_path):
+        """Storing a key again replaces its size instead of adding to it."""
+        cache = AudioCache(tmp_path / "cache", max_bytes=250)
+        cache.put("aa01", self._mp3(tmp_path, "aa01.mp3"), 1.0)
+        for _ in range(3):
+            cache.put("bb02", self._mp3(tmp_path, "bb02.mp3"), 1.0)
+
+        assert cache._size == 200
+        assert cache.stats()["evictions"] == 0
+        assert cache.get("aa01", tmp_path / "out.mp3") == 1.0
+
+    def test_disabled_cache_is_a_no_op(self, tmp_path):
+        """Without a directory nothing is stored or returned."""
+        cache = AudioCache()
+        cache.put("abcd", self._mp3(tmp_path, "src.mp3"), 1.0)
+
+        assert cache.enabled is False
+        assert cache.get("abcd", tmp_path / "dest.mp3") is None
+
+    @pytest.mark.asyncio
+    async def test_generator_rerun_synthesizes_only_edited_scene(self, tmp_path):
+        """Re-running a video after editing one scene re-synthesizes only that scene."""
+        def video(narrations):
+            return VideoConfig(
+                video_id="cached_video",
+                title="Cached",
+                description="Cached",
+                scenes=[
+                    SceneConfig(
+                        scene_id=f"scene_{i}",
+                        scene_type="title",
+                        narration=text,
+                        visual_content={},
+                        voice="male"
+                    )
+                    for i, text in enumerate(narrations)
+                ]
+            )
+
+        backend = FakeTTSBackend()
+        audio_config = AudioGenerationConfig(
+            output_dir=tmp_path / "out",
+            cache_enabled=True,
+            cache_dir=tmp_path / "cache"
+        )
+        generator = UnifiedAudioGenerator(audio_config, tts_backend=backend)
+
+        with patch.object(generator, '_measure_audio_duration', return_value=3.0) as measure:
+            await generator.generate_for_video(video(["A", "B", "C"]))
+            result = await generator.generate_for_video(video(["A", "B2", "C"]))
+
+        assert [text for text, _ in backend.calls] == ["A", "B", "C", "B2"]
+        assert measure.call_count == 4
+        assert result.success is True
+        assert generator.audio_cache.stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_estimated_duration_is_not_cached(self, tmp_path):
+        """A file-size estimate times the scene but never enters the audio cache."""
+        audio_config = AudioGenerationConfig(
+            output_dir=tmp_path / "out",
+            cache_enabled=True,
+            cache_dir=tmp_path / "cache"
+        )
+        generator = UnifiedAudioGenerator(audio_config, tts_backend=FakeTTSBackend())
+        scene = SceneConfig(
+            scene_id="scene_1", scene_type="title", narration="Hello",
+            visual_content={}, voice="male"
+        )
+
+        # Unreadable by the MP3 parser, and FFmpeg reports no duration
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value.stderr = "Invalid data found when processing input"
+            result = await generator._generate_scene_audio(scene, tmp_path / "out", 1)
+
+        assert result.duration == pytest.approx(len(b"fake mp3") / 3000.0)
+        assert not list((tmp_path / "cache").glob("*/*.mp3"))
+
+        # Measured on the next run, and only then cached
+        with patch.object(generator, '_measure_audio_duration', return_value=2.5):
+            result = await generator._generate_scene_audio(scene, tmp_path / "out", 1)
+
+        assert result.duration == 2.5
+        assert len(list((tmp_path / "cache").glob("*/*.mp3"))) == 1
+
+
+class TestDurationProbe:
+    """Test in-process audio duration probing."""
+
+    # MPEG-2 Layer III, 48 kbps, 24 kHz, mono: 144-byte frames of 576 samples
+    HEADER = bytes([0xFF, 0xF3, 0x64, 0xC0])
+
+    def _frames(self, count):
+        return (self.HEADER + b"\x00" * 140) * count
+
+    def test_cbr_frames_are_walked(self):
+        """Without a tag every frame header is counted."""
+        assert mp3_duration(self._frames(100)) == pytest.approx(2.4)
+
+    def test_xing_frame_count_is_used(self):
+        """A Xing tag gives the frame count without walking the stream."""
+        first = bytearray(self._frames(1))
+        first[13:25] = b"Xing" + (1).to_bytes(4, "big") + (250).to_bytes(4, "big")
+        data = bytes(first) + self._frames(3)
+
+        assert mp3_duration(data) == pytest.approx(6.0)
+
+    def test_id3v2_tag_is_skipped(self, tmp_path):
+        """Leading ID3v2 tags do not hide the audio frames."""
+        tag = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+        audio_file = tmp_path / "tagged.mp3"
+        audio_file.write_bytes(tag + self._frames(50))
+
+        assert probe_duration(audio_file) == pytest.approx(1.2)
+
+    def test_non_mp3_data_is_rejected(self, tmp_path):
+        """Random bytes and missing files return None."""
+        assert mp3_duration(b"fake audio content" * 100) is None
+        assert mp3_duration(self.HEADER + b"\x00" * 200) is None
+        assert mp3_duration(tmp_path / "missing.mp3") is None
+
+    def test_parse_ffmpeg_duration(self):
+        """FFmpeg stderr durations are parsed; N/A gives None."""
+        assert parse_ffmpeg_duration("  Duration: 00:01:05.50, start: 0.0") == 65.5
+        assert parse_ffmpeg_duration("  Duration: N/A, bitrate: N/A") is None
+
+    def test_generator_skips_ffmpeg_for_mp3(self, tmp_path):
+        """Readable MP3s are measured without spawning FFmpeg."""
+        generator = UnifiedAudioGenerator(AudioGenerationConfig(output_dir=tmp_path))
+        audio_file = tmp_path / "scene.mp3"
+        audio_file.write_bytes(self._frames(25))
+
+        with patch('subprocess.run') as mock_run:
+            assert generator._measure_audio_duration(audio_file) == pytest.approx(0.6)
+            mock_run.assert_not_called()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -14,7 +14,7 @@ import pytest
 import os
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-from video_gen.shared.config import Config, config
+from video_gen.shared.config import Config, config, _env_int
 
 
 class TestConfigSingleton:
@@ -51,6 +51,13 @@ class TestConfigInitialization:
         assert cfg.video_height == 1080
         assert cfg.video_fps == 30
 
+    def test_config_has_encoder_settings(self):
+        """Test config has video encoder settings."""
+        cfg = Config()
+        assert cfg.video_encoder in ("auto", "nvenc", "libx264", "libx265")
+        assert isinstance(cfg.video_encoder_preset, str)
+        assert isinstance(cfg.video_encoder_crf, int)
+
     def test_config_has_voice_config(self):
         """Test config has voice configuration."""
         cfg = Config()
@@ -154,6 +161,20 @@ class TestConfigValidation:
         with pytest.raises(ValueError, match="max_workers"):
             cfg.validate()
 
+    def test_validate_checks_video_encoder(self):
+        """Test validate rejects unknown video encoders."""
+        cfg = Config()
+        original_workers = cfg.max_workers
+        original_encoder = cfg.video_encoder
+        cfg.max_workers = 4  # Ensure valid before testing the encoder
+        cfg.video_encoder = "mpeg2"
+        try:
+            with pytest.raises(ValueError, match="video_encoder"):
+                cfg.validate()
+        finally:
+            cfg.video_encoder = original_encoder
+            cfg.max_workers = original_workers
+
     def test_validate_checks_ffmpeg(self):
         """Test validate checks FFmpeg configuration."""
         cfg = Config()
@@ -286,6 +307,18 @@ class TestConfigEnvironmentVariables:
         assert cfg.max_workers is not None
 
 
+    @patch.dict(os.environ, {"VIDEO_GEN_ENCODER_CRF": "high"})
+    def test_malformed_int_falls_back_to_default(self, caplog):
+        """Test a malformed integer setting warns and uses the default."""
+        assert _env_int("VIDEO_GEN_ENCODER_CRF", 20) == 20
+        assert "VIDEO_GEN_ENCODER_CRF" in caplog.text
+
+    @patch.dict(os.environ, {"VIDEO_GEN_ENCODER_CRF": " 23 "})
+    def test_int_from_env(self):
+        """Test an integer setting is read from the environment."""
+        assert _env_int("VIDEO_GEN_ENCODER_CRF", 20) == 23
+
+
 class TestConfigPerformanceSettings:
     """Test performance-related configuration."""
 
@@ -3,12 +3,24 @@ Test suite for pipeline orchestrator.
 """
 
 import asyncio
+import threading
+import time
 import pytest
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from video_gen.pipeline import PipelineOrchestrator, Stage, StageResult
-from video_gen.pipeline.state_manager import StateManager, TaskStatus
-from video_gen.pipeline.events import EventEmitter, EventType
+from video_gen.pipeline.state_manager import StateManager, StateWriter, TaskState, TaskStatus
+from video_gen.pipeline.state_backends import (
+    JSONStateBackend, SQLiteStateBackend, create_state_backend
+)
+from video_gen.shared.cancellation import raise_if_cancelled
+from video_gen.shared import metrics
+from video_gen.shared.exceptions import QueueFullError, StateError
+from video_gen.pipeline.graph import build_stage_graph
+from video_gen.pipeline.job_queue import JobQueue
+from video_gen.pipeline.stage_cache import StageCache, fingerprint_inputs
+from video_gen.pipeline.events import EventEmitter, Event, EventType, TaskEventBroker
 from video_gen.shared.models import VideoConfig, SceneConfig, InputConfig
 from video_gen.stages import ValidationStage
 
@@ -219,5 +231,733 @@ async def test_validation_stage(sample_video_config):
     assert result.metadata["scene_count"] == 2
 
 
+@pytest.mark.asyncio
+async def test_task_event_broker_fan_out():
+    """Test that the broker delivers a task's events to every subscriber."""
+
+    emitter = EventEmitter()
+    broker = TaskEventBroker()
+    broker.attach(emitter)
+
+    first = broker.subscribe("task_a")
+    second = broker.subscribe("task_a")
+    other = broker.subscribe("task_b")
+
+    await emitter.emit(Event(type=EventType.STAGE_STARTED, task_id="task_a", stage="audio"))
+
+    assert first.get_nowait().stage == "audio"
+    assert second.get_nowait().stage == "audio"
+    assert other.empty()
+
+    broker.unsubscribe("task_a", first)
+    broker.unsubscribe("task_a", second)
+    broker.detach(emitter)
+    assert broker.subscriber_count("task_a") == 0
+    assert broker.subscriber_count() == 1
+
+    await emitter.emit(Event(type=EventType.STAGE_STARTED, task_id="task_b"))
+    assert other.empty()
+
+
+@pytest.mark.asyncio
+async def test_task_event_broker_bounded_backlog():
+    """Test that a full queue drops progress updates, not transitions."""
+
+    broker = TaskEventBroker(max_backlog=3)
+    queue = broker.subscribe("task")
+
+    broker.publish(Event(type=EventType.STAGE_STARTED, task_id="task", stage="video"))
+    for i in range(5):
+        broker.publish(Event(
+            type=EventType.STAGE_PROGRESS, task_id="task", stage="video", progress=i / 5
+        ))
+    broker.publish(Event(type=EventType.PIPELINE_COMPLETED, task_id="task"))
+
+    received = [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert [e.type for e in received] == [
+        EventType.STAGE_STARTED, EventType.STAGE_PROGRESS, EventType.PIPELINE_COMPLETED
+    ]
+    assert received[1].progress == 0.8
+    assert broker.dropped == 4
+
+
+@pytest.mark.asyncio
+async def test_queued_dispatch_isolates_slow_listener():
+    """Test that a slow listener does not delay emit() or other listeners."""
+
+    emitter = EventEmitter(dispatch="queued")
+    release = asyncio.Event()
+    fast_events = []
+    slow_events = []
+
+    async def slow_listener(event):
+        await release.wait()
+        slow_events.append(event)
+
+    emitter.on_all_async(slow_listener)
+    emitter.on_all(fast_events.append)
+
+    for stage in ("input", "audio", "video"):
+        await asyncio.wait_for(
+            emitter.emit(Event(type=EventType.STAGE_STARTED, task_id="t", stage=stage)),
+            timeout=1
+        )
+
+    await asyncio.sleep(0)
+    assert [e.stage for e in fast_events] == ["input", "audio", "video"]
+    assert slow_events == []
+
+    release.set()
+    await emitter.flush()
+    assert [e.stage for e in slow_events] == ["input", "audio", "video"]
+
+    metrics = {m["listener"]: m for m in emitter.metrics()}
+    slow = metrics[slow_listener.__qualname__]
+    assert slow["delivered"] == 3
+    assert slow["queue_depth"] == 0
+    assert slow["max_queue_depth"] >= 2
+    assert slow["max_latency"] > 0
+
+    await emitter.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy,expected_progress,dropped,coalesced", [
+    ("coalesce", [0.9], 0, 9),
+    ("drop", [0.1, 0.2], 8, 0),
+    ("keep", [0.8, 0.9], 8, 0),
+])
+async def test_queued_dispatch_progress_policies(policy, expected_progress, dropped, coalesced):
+    """Test progress drop/coalesce policies while a listener is blocked."""
+
+    emitter = EventEmitter(dispatch="queued", max_queue=3, progress_policy=policy)
+    release = asyncio.Event()
+    received = []
+
+    async def listener(event):
+        await release.wait()
+        received.append(event)
+
+    emitter.on_all_async(listener)
+
+    await emitter.emit(Event(type=EventType.STAGE_STARTED, task_id="t", stage="audio"))
+    await asyncio.sleep(0)  # Worker takes the first event and blocks
+    for i in range(10):
+        await emitter.emit(Event(
+            type=EventType.STAGE_PROGRESS, task_id="t", stage="audio", progress=i / 10
+        ))
+    await emitter.emit(Event(type=EventType.STAGE_COMPLETED, task_id="t", stage="audio"))
+
+    release.set()
+    await emitter.flush()
+
+    assert received[0].type == EventType.STAGE_STARTED
+    assert received[-1].type == EventType.STAGE_COMPLETED
+    assert [e.progress for e in received[1:-1]] == expected_progress
+
+    metrics = emitter.metrics()[0]
+    assert metrics["dropped"] == dropped
+    assert metrics["coalesced"] == coalesced
+
+    await emitter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_emit_sync_schedules_in_running_loop():
+    """Test that emit_sync inside a running loop schedules instead of nesting loops."""
+
+    emitter = EventEmitter()
+    received = []
+    emitter.on_all(received.append)
+
+    emitter.emit_sync(Event(type=EventType.STAGE_STARTED, task_id="t"))
+    await emitter.flush()
+
+    assert len(received) == 1
+
+
+def test_emit_sync_without_loop():
+    """Test that emit_sync delivers inline when no event loop exists."""
+
+    emitter = EventEmitter(dispatch="queued")
+    received = []
+    emitter.on(EventType.STAGE_STARTED, received.append)
+
+    emitter.emit_sync(Event(type=EventType.STAGE_STARTED, task_id="t"))
+
+    assert len(received) == 1
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend_state_manager(request, tmp_path):
+    """StateManager over each storage backend."""
+    backend = create_state_backend(request.param, tmp_path)
+    yield StateManager(tmp_path, backend=backend)
+    if isinstance(backend, SQLiteStateBackend):
+        backend.close()
+
+
+def test_state_backend_round_trip(backend_state_manager):
+    """Test save/load/exists/delete on each backend."""
+
+    state = TaskState(task_id="task_rt", input_config={"source": "test.md"})
+    state.start_stage("audio_generation")
+    backend_state_manager.save(state)
+
+    loaded = backend_state_manager.load("task_rt")
+    assert loaded.current_stage == "audio_generation"
+    assert loaded.input_config == {"source": "test.md"}
+    assert backend_state_manager.exists("task_rt")
+
+    assert backend_state_manager.delete("task_rt")
+    assert not backend_state_manager.exists("task_rt")
+    assert not backend_state_manager.delete("task_rt")
+    with pytest.raises(StateError):
+        backend_state_manager.load("task_rt")
+
+
+def test_state_backend_queries(backend_state_manager):
+    """Test status filtering, ordering, limits and cleanup on each backend."""
+
+    now = datetime.now()
+    for i, status in enumerate([TaskStatus.COMPLETED, TaskStatus.FAILED,
+                                TaskStatus.COMPLETED, TaskStatus.RUNNING]):
+        state = TaskState(task_id=f"task_{i}", input_config={},
+                          created_at=now - timedelta(days=i * 4))
+        state.status = status
+        backend_state_manager.save(state)
+
+    all_tasks = backend_state_manager.list_tasks()
+    assert [t.task_id for t in all_tasks] == ["task_0", "task_1", "task_2", "task_3"]
+
+    completed = backend_state_manager.list_tasks(TaskStatus.COMPLETED)
+    assert [t.task_id for t in completed] == ["task_0", "task_2"]
+    assert len(backend_state_manager.list_tasks(limit=2)) == 2
+
+    backend_state_manager.cleanup_old_tasks(days=7)
+    assert [t.task_id for t in backend_state_manager.list_tasks()] == ["task_0", "task_1"]
+
+
+def test_sqlite_backend_uses_wal(tmp_path):
+    """Test that the SQLite backend runs in WAL mode and can import JSON states."""
+
+    json_manager = StateManager(tmp_path / "json", backend=JSONStateBackend(tmp_path / "json"))
+    json_manager.save(TaskState(task_id="legacy", input_config={}))
+
+    backend = SQLiteStateBackend(tmp_path / "state.db")
+    try:
+        mode = backend._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+        assert backend.import_json(tmp_path / "json") == 1
+        assert backend.load("legacy")["task_id"] == "legacy"
+    finally:
+        backend.close()
+
+
+@pytest.mark.asyncio
+async def test_state_writer_coalesces_writes(temp_state_dir):
+    """Test that dirty marks within the flush interval become one write."""
+
+    state_manager = StateManager(temp_state_dir, backend=JSONStateBackend(temp_state_dir))
+    state = TaskState(task_id="task_wb", input_config={})
+    writer = StateWriter(state_manager, state, max_interval=0.05)
+
+    writer.save()
+    for stage in ("input", "parsing", "script"):
+        state.start_stage(stage)
+        writer.mark_dirty()
+
+    assert writer.writes == 1
+    assert writer.dirty
+    assert state_manager.load("task_wb").current_stage is None
+
+    await asyncio.sleep(0.1)  # Deferred write fires
+
+    assert writer.writes == 2
+    assert not writer.dirty
+    assert state_manager.load("task_wb").current_stage == "script"
+
+    assert not writer.flush()
+    writer.close()
+
+
+def test_json_state_save_is_atomic(temp_state_dir):
+    """Test that a failed save keeps the previous state file intact."""
+
+    backend = JSONStateBackend(temp_state_dir)
+    state_manager = StateManager(temp_state_dir, backend=backend)
+    state = TaskState(task_id="task_atomic", input_config={})
+    state_manager.save(state)
+
+    state.metadata["unserializable"] = object()
+    with pytest.raises(StateError):
+        state_manager.save(state)
+
+    assert state_manager.load("task_atomic").metadata == {}
+    assert [p.name for p in temp_state_dir.iterdir()] == ["task_atomic.json"]
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_coalesces_state_writes(temp_state_dir):
+    """Test that the orchestrator writes state at stage boundaries only."""
+
+    backend = JSONStateBackend(temp_state_dir)
+    writes = []
+    original_save = backend.save
+
+    def counting_save(data):
+        writes.append(data["current_stage"])
+        return original_save(data)
+
+    backend.save = counting_save
+    orchestrator = PipelineOrchestrator(
+        state_manager=StateManager(temp_state_dir, backend=backend),
+        event_emitter=EventEmitter()
+    )
+    orchestrator.register_stages([DummyStage("stage1"), DummyStage("stage2")])
+
+    result = await orchestrator.execute(InputConfig(input_type="programmatic", source="test"))
+
+    assert result.success
+    # Initial, one per completed stage, final result
+    assert writes == [None, "stage1", "stage2", "stage2"]
+
+
+class DeclaredStage(DummyStage):
+    """Dummy stage with dependency declarations that records its run window."""
+
+    def __init__(self, name, inputs, outputs, timeline, prepare_inputs=None):
+        super().__init__(name)
+        self.inputs = inputs
+        self.outputs = outputs
+        self.prepare_inputs = prepare_inputs
+        self.timeline = timeline
+
+    async def prepare(self, context):
+        self.timeline.append((self.name, "prepare", sorted(context)))
+
+    async def execute(self, context):
+        self.timeline.append((self.name, "start"))
+        await asyncio.sleep(0.05)
+        self.timeline.append((self.name, "end"))
+        return StageResult(
+            success=True,
+            stage_name=self.name,
+            artifacts={key: f"{self.name}:{key}" for key in self.outputs}
+        )
+
+
+def test_stage_graph_dependencies():
+    """Test dependency resolution from stage declarations."""
+
+    timeline = []
+    stages = [
+        DeclaredStage("input", ("input_config",), ("video_config",), timeline),
+        DeclaredStage("audio", ("video_config",), ("timing_report",), timeline),
+        DeclaredStage("video", ("video_config", "timing_report"), ("final_video_path",),
+                      timeline, prepare_inputs=("video_config",)),
+        DummyStage("legacy"),
+        DeclaredStage("output", ("video_config",), ("output_dir",), timeline),
+    ]
+
+    graph = build_stage_graph(stages)
+
+    assert graph[("input", "run")] == set()
+    assert graph[("audio", "run")] == {("input", "run")}
+    assert graph[("video", "prepare")] == {("input", "run")}
+    assert graph[("video", "run")] == {("video", "prepare"), ("input", "run"), ("audio", "run")}
+    # Undeclared stages keep the sequential behavior in both directions
+    assert graph[("legacy", "run")] == {("input", "run"), ("audio", "run"), ("video", "run")}
+    assert graph[("output", "run")] == {("input", "run"), ("legacy", "run")}
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_runs_independent_stages_concurrently(temp_state_dir):
+    """Test that a stage's prepare step overlaps an unrelated stage."""
+
+    timeline = []
+    orchestrator = PipelineOrchestrator(
+        state_manager=StateManager(temp_state_dir),
+        event_emitter=EventEmitter()
+    )
+    orchestrator.register_stages([
+        DeclaredStage("input", ("input_config",), ("scenes",), timeline),
+        DeclaredStage("audio", ("scenes",), ("timing_report",), timeline),
+        DeclaredStage("video", ("scenes", "timing_report"), ("final_video_path",),
+                      timeline, prepare_inputs=("scenes",)),
+    ])
+
+    result = await orchestrator.execute(InputConfig(input_type="programmatic", source="test"))
+
+    assert result.success
+    assert result.video_path == "video:final_video_path"
+    events = [entry[:2] for entry in timeline]
+    # Prepare ran after its input existed, while audio was still running
+    assert events.index(("video", "prepare")) > events.index(("input", "end"))
+    assert events.index(("video", "prepare")) < events.index(("audio", "end"))
+    assert events.index(("video", "start")) > events.index(("audio", "end"))
+    assert "timing_report" not in timeline[events.index(("video", "prepare"))][2]
+
+
+class QueueProbe:
+    """Stand-in orchestrator that records how the job queue runs jobs."""
+
+    def __init__(self, state_dir, duration=0.05):
+        self.state_manager = StateManager(state_dir)
+        self.duration = duration
+        self.started = []
+        self.resumed = []
+        self.active = 0
+        self.peak = 0
+
+    async def execute(self, input_config, task_id=None, resume=False):
+        self.started.append(task_id)
+        if resume:
+            self.resumed.append(task_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.active -= 1
+
+
+async def _drain(queue, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while queue.running or queue.queued:
+        assert loop.time() < deadline, "job queue did not drain"
+        await asyncio.sleep(0.01)
+
+
+def _job_input():
+    return InputConfig(input_type="programmatic", source="test")
+
+
+@pytest.mark.asyncio
+async def test_job_queue_limits_running_jobs(temp_state_dir):
+    """Test that no more than `workers` pipelines run at once."""
+    probe = QueueProbe(temp_state_dir)
+    queue = JobQueue(probe, workers=2, max_queued=10, persist_path=False)
+
+    for i in range(6):
+        queue.submit(_job_input(), f"task_{i}")
+    assert queue.running == 2
+    assert queue.queued == 4
+    # Waiting tasks are visible to status endpoints
+    assert probe.state_manager.load("task_5").status == TaskStatus.PENDING
+
+    await _drain(queue)
+    assert sorted(probe.started) == [f"task_{i}" for i in range(6)]
+    assert probe.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_job_queue_priority_and_fairness(temp_state_dir):
+    """Test that high priority runs first and submitters take turns."""
+    probe = QueueProbe(temp_state_dir, duration=0.01)
+    queue = JobQueue(probe, workers=1, max_queued=10, persist_path=False)
+
+    queue.submit(_job_input(), "a1", submitter="alice")  # starts immediately
+    for task_id in ("a2", "a3", "a4"):
+        queue.submit(_job_input(), task_id, submitter="alice")
+    for task_id in ("b1", "b2"):
+        queue.submit(_job_input(), task_id, submitter="bob")
+    queue.submit(_job_input(), "h1", priority="high", submitter="carol")
+
+    with pytest.raises(ValueError):
+        queue.submit(_job_input(), "x1", priority="urgent")
+
+    await _drain(queue)
+    assert probe.started == ["a1", "h1", "a2", "b1", "a3", "b2", "a4"]
+
+
+@pytest.mark.asyncio
+async def test_job_queue_full_raises_with_retry_after(temp_state_dir):
+    """Test that a full queue rejects jobs with a Retry-After estimate."""
+    probe = QueueProbe(temp_state_dir, duration=10)
+    queue = JobQueue(probe, workers=1, max_queued=1, persist_path=False)
+
+    queue.submit(_job_input(), "task_1")
+    queue.submit(_job_input(), "task_2")
+
+    with pytest.raises(QueueFullError) as exc_info:
+        queue.submit(_job_input(), "task_3")
+    # No measured durations yet: default estimate for 2 waves of 1 worker
+    assert exc_info.value.retry_after == 120
+    assert not probe.state_manager.exists("task_3")
+
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_job_queue_recovers_persisted_jobs(temp_state_dir):
+    """Test that running and waiting jobs survive a restart."""
+    probe = QueueProbe(temp_state_dir, duration=10)
+    queue = JobQueue(probe, workers=1, max_queued=10)
+    queue.submit(_job_input(), "task_1")
+    queue.submit(_job_input(), "task_2")
+    await asyncio.sleep(0.01)
+    await queue.stop()
+    assert probe.started == ["task_1"]
+
+    restarted = QueueProbe(temp_state_dir, duration=0.01)
+    queue = JobQueue(restarted, workers=2, max_queued=10)
+    queue.start()
+    await _drain(queue)
+
+    assert sorted(restarted.started) == ["task_1", "task_2"]
+    assert sorted(restarted.resumed) == ["task_1", "task_2"]
+    assert queue._load_persisted() == []
+
+
+class BlockingStage(Stage):
+    """Stage that works in a thread until its task is cancelled."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.started = threading.Event()
+        self.stopped = threading.Event()
+
+    async def execute(self, context):
+        await asyncio.to_thread(self._work)
+        return StageResult(success=True, stage_name=self.name)
+
+    def _work(self):
+        self.started.set()
+        try:
+            for _ in range(500):
+                raise_if_cancelled()
+                time.sleep(0.01)
+        finally:
+            self.stopped.set()
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_running_task(temp_state_dir):
+    """Test that cancel() interrupts the task and stops its worker thread."""
+    emitter = EventEmitter()
+    events = []
+    emitter.on_all(events.append)
+    orchestrator = PipelineOrchestrator(
+        state_manager=StateManager(temp_state_dir), event_emitter=emitter
+    )
+    stage = BlockingStage("render")
+    orchestrator.register_stages([DummyStage("input"), stage, DummyStage("output")])
+
+    task = asyncio.create_task(orchestrator.execute(_job_input(), task_id="task_1"))
+    await asyncio.to_thread(stage.started.wait, 5)
+
+    assert orchestrator.cancel("task_1")
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The worker thread saw the token and stopped early
+    assert await asyncio.to_thread(stage.stopped.wait, 2)
+    state = orchestrator.state_manager.load("task_1")
+    assert state.status == TaskStatus.CANCELLED
+    assert state.get_completed_stages() == ["input"]
+    assert events[-1].type == EventType.PIPELINE_CANCELLED
+    assert not orchestrator.cancel("task_1")
+
+
+@pytest.mark.asyncio
+async def test_cancel_frees_job_queue_slot(temp_state_dir):
+    """Test that cancelling queued and running jobs lets others run."""
+    orchestrator = PipelineOrchestrator(
+        state_manager=StateManager(temp_state_dir), event_emitter=EventEmitter()
+    )
+    stage = BlockingStage("render")
+    orchestrator.register_stages([stage])
+    queue = JobQueue(orchestrator, workers=1, max_queued=10, persist_path=False)
+    orchestrator._job_queue = queue
+
+    await orchestrator.execute_async(_job_input(), "task_1")
+    await orchestrator.execute_async(_job_input(), "task_2")
+    await orchestrator.execute_async(_job_input(), "task_3")
+    await asyncio.to_thread(stage.started.wait, 5)
+
+    assert orchestrator.cancel("task_2")  # waiting
+    assert queue.queued == 1
+    stage.started.clear()
+    assert orchestrator.cancel("task_1")  # running
+
+    # task_3 takes the freed slot; cancel it too so the test ends quickly
+    assert await asyncio.to_thread(stage.started.wait, 5)
+    assert queue.running == 1 and queue.queued == 0
+    assert orchestrator.cancel("task_3")
+    await _drain(queue)
+
+    for task_id in ("task_1", "task_2", "task_3"):
+        assert orchestrator.state_manager.load(task_id).status == TaskStatus.CANCELLED
+
+
+class FileStage(Stage):
+    """Cacheable stage that writes a file derived from its input."""
+
+    inputs = ("input_config",)
+    outputs = ("file_output",)
+    cacheable = True
+
+    def __init__(self, name: str, out_dir: Path):
+        super().__init__(name)
+        self.out_dir = out_dir
+        self.runs = 0
+
+    async def execute(self, context):
+        self.runs += 1
+        out_file = self.out_dir / f"{self.name}.txt"
+        out_file.write_text(str(context["input_config"].source))
+        return StageResult(
+            success=True,
+            stage_name=self.name,
+            artifacts={"file_output": out_file}
+        )
+
+
+def _cached_orchestrator(temp_state_dir, tmp_path, stage):
+    orchestrator = PipelineOrchestrator(
+        state_manager=StateManager(temp_state_dir),
+        stage_cache=StageCache(tmp_path / "stages")
+    )
+    orchestrator.register_stages([stage, DummyStage("output")])
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_stage_cache_reuses_result_for_same_input(temp_state_dir, tmp_path):
+    """Test that a cacheable stage runs once for identical inputs."""
+    stage = FileStage("render", tmp_path)
+    orchestrator = _cached_orchestrator(temp_state_dir, tmp_path, stage)
+
+    first = await orchestrator.execute(_job_input(), task_id="task_1")
+    second = await orchestrator.execute(_job_input(), task_id="task_2")
+
+    assert first.success and second.success
+    assert stage.runs == 1
+    assert orchestrator.stage_cache.stats() == {"hits": 1, "misses": 1}
+    assert orchestrator.state_manager.load("task_2").stages["render"].artifacts == {
+        "file_output": str(tmp_path / "render.txt")
+    }
+
+    # A different input misses
+    changed = InputConfig(input_type="programmatic", source="other")
+    await orchestrator.execute(changed, task_id="task_3")
+    assert stage.runs == 2
+
+
+@pytest.mark.asyncio
+async def test_stage_cache_ignores_changed_artifacts(temp_state_dir, tmp_path):
+    """Test that an entry whose output file was rewritten is not reused."""
+    stage = FileStage("render", tmp_path)
+    orchestrator = _cached_orchestrator(temp_state_dir, tmp_path, stage)
+
+    await orchestrator.execute(_job_input(), task_id="task_1")
+    (tmp_path / "render.txt").write_text("overwritten by another task")
+    await orchestrator.execute(_job_input(), task_id="task_2")
+
+    assert stage.runs == 2
+    assert orchestrator.stage_cache.stats() == {"hits": 0, "misses": 2}
+
+
+def test_fingerprint_hashes_path_content(tmp_path):
+    """Test that Path inputs are fingerprinted by content, not name."""
+    source = tmp_path / "source.md"
+    source.write_text("# Title")
+    before = fingerprint_inputs("input", "1", {"source_file": source})
+
+    assert fingerprint_inputs("input", "1", {"source_file": source}) == before
+    assert fingerprint_inputs("input", "2", {"source_file": source}) != before
+
+    source.write_text("# Changed title")
+    assert fingerprint_inputs("input", "1", {"source_file": source}) != before
+
+
+class InstrumentedStage(Stage):
+    """Stage that reports spans and counters, including from a thread."""
+
+    async def execute(self, context):
+        with metrics.span("load"):
+            await asyncio.sleep(0.01)
+        await asyncio.to_thread(self._work)
+        frames = list(metrics.timed(iter(range(3)), "frames"))
+        metrics.count("frames", len(frames))
+        return StageResult(success=True, stage_name=self.name)
+
+    def _work(self):
+        with metrics.span("work"):
+            with metrics.span("draw"):
+                time.sleep(0.01)
+            metrics.count("bytes_written", 100)
+
+
+@pytest.mark.asyncio
+async def test_stage_metrics_recorded_in_state_and_registry(orchestrator):
+    """Test that stage spans and counters reach the task state and /metrics."""
+    orchestrator.register_stages([InstrumentedStage("render")])
+    runs = metrics.registry.counter(
+        "video_gen_stage_runs_total", "Stage runs by outcome", ("stage", "status")
+    )
+    runs_before = runs.value(stage="render", status="success")
+
+    await orchestrator.execute(_job_input(), task_id="task_1")
+
+    stage_metrics = orchestrator.state_manager.load("task_1").stages["render"].metadata["metrics"]
+    assert set(stage_metrics["spans"]) == {"load", "work", "work/draw", "frames"}
+    assert stage_metrics["spans"]["frames"]["calls"] == 4  # three items and the end
+    assert stage_metrics["spans"]["work/draw"]["seconds"] >= 0.01
+    assert stage_metrics["counters"] == {"bytes_written": 100, "frames": 3}
+    assert stage_metrics["frames_per_second"] > 0
+    assert stage_metrics["wall_seconds"] >= 0.02
+
+    assert runs.value(stage="render", status="success") == runs_before + 1
+    text = metrics.registry.render()
+    assert 'video_gen_stage_span_seconds_total{stage="render",span="work/draw"}' in text
+    assert 'video_gen_stage_duration_seconds_bucket{stage="render",le="+Inf"}' in text
+    assert "# TYPE video_gen_stage_frames_total counter" in text
+
+
+def test_orchestrator_close_closes_stages(orchestrator):
+    """Test that closing the orchestrator releases every stage's resources."""
+    closed = []
+
+    class ClosingStage(DummyStage):
+        def close(self):
+            closed.append(self.name)
+
+    orchestrator.register_stages([ClosingStage("first"), DummyStage("plain"), ClosingStage("second")])
+    orchestrator.close()
+
+    assert closed == ["first", "second"]
+
+
+def test_metrics_do_nothing_outside_a_stage():
+    """Test that instrumentation calls are no-ops without a collector."""
+    with metrics.span("orphan"):
+        metrics.count("frames")
+    assert list(metrics.timed([1, 2], "frames")) == [1, 2]
+    assert metrics.current_metrics() is None
+
+
+def test_stage_metrics_merge_worker_measurements():
+    """Test that a worker's measurements nest under the current span."""
+    worker = metrics.StageMetrics("segment")
+    with worker.measure():
+        with metrics.span("frames"):
+            metrics.count("frames", 10)
+
+    stage_metrics = metrics.StageMetrics("video_generation")
+    with stage_metrics.measure():
+        with metrics.span("encode"):
+            metrics.merge_metrics(worker.to_dict())
+
+    data = stage_metrics.to_dict()
+    assert set(data["spans"]) == {"encode", "encode/frames"}
+    assert data["counters"] == {"frames": 10}
+    assert data["worker_peak_rss_bytes"] == worker.peak_rss_bytes
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -32,6 +32,8 @@ from video_gen.renderers.constants import (
     WIDTH, HEIGHT,
     ACCENT_BLUE, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_PURPLE, ACCENT_PINK, ACCENT_CYAN
 )
+from video_gen.renderers.cache import KeyframeCache, keyframe_cache_key
+from video_gen.renderers import base
 
 
 class TestBasicSceneRenderers:
@@ -777,3 +779,116 @@ class TestRendererEdgeCases:
 
         # Start should be mostly blank/base, end should have content
         assert start_bytes != end_bytes, "Start and end frames should differ"
+
+
+class TestBaseFrameMemoization:
+    """Test that base frames are drawn once per accent color."""
+
+    def test_base_frame_drawn_once_per_color(self):
+        """Repeated calls with the same color reuse the cached layer."""
+        base._cached_base_frame.cache_clear()
+
+        first = base.create_base_frame(ACCENT_BLUE)
+        second = base.create_base_frame(ACCENT_BLUE)
+        base.create_base_frame(ACCENT_GREEN)
+
+        info = base._cached_base_frame.cache_info()
+        assert info.misses == 2
+        assert info.hits == 1
+        assert first is not second
+        assert first.tobytes() == second.tobytes()
+
+    def test_returned_frames_are_independent_copies(self):
+        """Drawing on a returned frame does not leak into later frames."""
+        frame = base.create_base_frame(ACCENT_PURPLE)
+        frame.paste((0, 0, 0, 255), (100, 100, 200, 200))
+
+        fresh = base.create_base_frame(ACCENT_PURPLE)
+        assert fresh.getpixel((150, 150)) != (0, 0, 0, 255)
+
+    def test_mesh_bg_cached_per_resolution(self):
+        """Different resolutions produce different cached backgrounds."""
+        small = base.create_modern_mesh_bg(320, 180, ACCENT_BLUE)
+        large = base.create_modern_mesh_bg(640, 360, ACCENT_BLUE)
+
+        assert small.size == (320, 180)
+        assert large.size == (640, 360)
+
+    def test_list_accent_color_accepted(self):
+        """Accent colors given as lists hit the same cache entry as tuples."""
+        from_list = base.create_base_frame(list(ACCENT_GREEN))
+        from_tuple = base.create_base_frame(ACCENT_GREEN)
+        assert from_list.tobytes() == from_tuple.tobytes()
+
+
+class TestKeyframeCache:
+    """Test the content-addressed keyframe cache."""
+
+    @staticmethod
+    def _frames(color=(255, 0, 0)):
+        return Image.new('RGB', (32, 18), (0, 0, 0)), Image.new('RGB', (32, 18), color)
+
+    def test_key_is_stable_and_order_independent(self):
+        """Same inputs give the same key regardless of dict ordering."""
+        key1 = keyframe_cache_key("title", {"title": "A", "subtitle": "B"}, ACCENT_BLUE)
+        key2 = keyframe_cache_key("title", {"subtitle": "B", "title": "A"}, ACCENT_BLUE)
+        assert key1 == key2
+
+    def test_key_changes_with_inputs(self):
+        """Scene type, content, color, resolution and version all affect the key."""
+        base = keyframe_cache_key("title", {"title": "A"}, ACCENT_BLUE)
+        assert keyframe_cache_key("outro", {"title": "A"}, ACCENT_BLUE) != base
+        assert keyframe_cache_key("title", {"title": "B"}, ACCENT_BLUE) != base
+        assert keyframe_cache_key("title", {"title": "A"}, ACCENT_GREEN) != base
+        assert keyframe_cache_key("title", {"title": "A"}, ACCENT_BLUE, resolution=(1280, 720)) != base
+        assert keyframe_cache_key("title", {"title": "A"}, ACCENT_BLUE, version="0.0.0") != base
+
+    def test_get_or_render_renders_once(self):
+        """Second lookup is a memory hit."""
+        cache = KeyframeCache()
+        calls = []
+
+        def render():
+            calls.append(1)
+            return self._frames()
+
+        first = cache.get_or_render("k", render)
+        second = cache.get_or_render("k", render)
+
+        assert len(calls) == 1
+        assert first is second
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        """Memory tier is bounded by max_entries."""
+        cache = KeyframeCache(max_entries=2)
+        cache.put("a", self._frames())
+        cache.put("b", self._frames())
+        cache.get("a")
+        cache.put("c", self._frames())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["entries"] == 2
+
+    def test_disk_tier_shared_across_instances(self, tmp_path):
+        """Entries written by one cache are read back by another."""
+        KeyframeCache(cache_dir=tmp_path).put("abcd", self._frames((0, 255, 0)))
+
+        fresh = KeyframeCache(cache_dir=tmp_path)
+        start, end = fresh.get("abcd")
+
+        assert fresh.stats()["disk_hits"] == 1
+        assert end.getpixel((0, 0)) == (0, 255, 0)
+        assert start.size == (32, 18)
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_unreadable_disk_entry_is_a_miss(self, tmp_path):
+        """Corrupt PNGs are ignored rather than raised."""
+        cache = KeyframeCache(cache_dir=tmp_path)
+        cache.put("abcd", self._frames())
+        for png in tmp_path.rglob("*.png"):
+            png.write_bytes(b"not a png")
+
+        assert KeyframeCache(cache_dir=tmp_path).get("abcd") is None
@@ -20,6 +20,7 @@ from datetime import datetime
 
 from video_gen.stages.output_stage import OutputStage
 from video_gen.stages.audio_generation_stage import AudioGenerationStage
+from video_gen.audio_generator.cache import AudioCache
 from video_gen.stages.video_generation_stage import VideoGenerationStage
 from video_gen.stages.script_generation_stage import ScriptGenerationStage
 from video_gen.shared.models import VideoConfig, Scene, InputConfig
@@ -611,7 +612,7 @@ Input #0, mp3, from 'test.mp3':
 
     @pytest.mark.asyncio
     async def test_get_audio_duration_handles_parse_failure(self, audio_stage, tmp_path):
-        """Test _get_audio_duration returns default on parse failure."""
+        """Test _get_audio_duration returns None on parse failure."""
         audio_file = tmp_path / "test.mp3"
         audio_file.write_text("fake audio")
 
@@ -620,8 +621,7 @@ Input #0, mp3, from 'test.mp3':
 
             duration = await audio_stage._get_audio_duration(audio_file)
 
-            # Should return default
-            assert duration == 5.0
+            assert duration is None
 
     @pytest.mark.asyncio
     async def test_get_audio_duration_handles_exception(self, audio_stage, tmp_path):
@@ -633,7 +633,30 @@ Input #0, mp3, from 'test.mp3':
 
             duration = await audio_stage._get_audio_duration(audio_file)
 
-            assert duration == 5.0
+            assert duration is None
+
+    @pytest.mark.asyncio
+    async def test_unmeasured_duration_is_not_cached(self, tmp_path):
+        """Test a fallback duration times the scene but never enters the audio cache."""
+        cache = AudioCache(tmp_path / "cache")
+        stage = AudioGenerationStage(audio_cache=cache)
+        stage._synthesize = AsyncMock(
+            side_effect=lambda text, voice, audio_file: audio_file.write_bytes(b"audio")
+        )
+        stage._get_audio_duration = AsyncMock(return_value=None)
+        scene = Scene(scene_id="s1", scene_type="title", narration="Hello", visual_content={})
+
+        await stage._generate_scene_audio(scene, tmp_path)
+
+        assert scene.actual_audio_duration == 5.0
+        assert not list((tmp_path / "cache").glob("*/*.mp3"))
+
+        # Measured on the next run, and only then cached
+        stage._get_audio_duration = AsyncMock(return_value=2.5)
+        await stage._generate_scene_audio(scene, tmp_path)
+
+        assert scene.actual_audio_duration == 2.5
+        assert len(list((tmp_path / "cache").glob("*/*.mp3"))) == 1
 
 
 class TestAudioGenerationStageTimingReport:
@@ -817,6 +840,145 @@ class TestAudioGenerationStageErrors:
                     await audio_stage.execute(context)
 
 
+class TestAudioGenerationStageConcurrency:
+    """Test concurrent synthesis in AudioGenerationStage."""
+
+    class SlowFirstBackend:
+        """Fake TTS backend where earlier scenes take longest."""
+
+        def __init__(self, fail_first=0):
+            self.fail_first = fail_first
+            self.calls = []
+            self.active = 0
+            self.peak = 0
+
+        async def synthesize(self, text, voice, output_file, rate="+0%", volume="+0%"):
+            self.calls.append(text)
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                raise ConnectionError("transient")
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01 * (5 - int(text.split()[-1])))
+            self.active -= 1
+            Path(output_file).write_bytes(b"fake mp3")
+
+    @pytest.fixture
+    def video_config(self):
+        """Create VideoConfig with five default-voice scenes."""
+        return VideoConfig(
+            video_id="concurrent",
+            title="Concurrent",
+            description="Test",
+            voices=["male", "female"],
+            scenes=[
+                Scene(
+                    scene_id=f"scene{i}",
+                    scene_type="title",
+                    narration=f"Scene {i}",
+                    visual_content={},
+                    voice="male",
+                    min_duration=0.0
+                )
+                for i in range(5)
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_synthesis_keeps_order_and_rotation(self, video_config, tmp_path):
+        """Voices and report order are deterministic under concurrency."""
+        backend = self.SlowFirstBackend()
+        stage = AudioGenerationStage(tts_backend=backend, max_concurrency=3, audio_cache=AudioCache())
+        stage.emit_progress = AsyncMock()
+        stage._get_audio_duration = AsyncMock(side_effect=[1.0, 2.0, 3.0, 4.0, 5.0])
+
+        with patch("video_gen.stages.audio_generation_stage.config") as mock_config:
+            mock_config.audio_dir = tmp_path / "audio"
+            mock_config.get_voice = Mock(return_value="en-US-GuyNeural")
+
+            result = await stage.execute({"task_id": "task-1", "video_config": video_config})
+
+        assert backend.peak == 3
+        assert [s.voice for s in video_config.scenes] == ["male", "female", "male", "female", "male"]
+
+        report = json.loads(Path(result.artifacts["timing_report"]).read_text())
+        assert [s["scene_id"] for s in report["scenes"]] == [f"scene{i}" for i in range(5)]
+        for previous, current in zip(report["scenes"], report["scenes"][1:]):
+            assert current["start_time"] == previous["end_time"]
+        assert result.metadata["total_duration"] == sum(s.final_duration for s in video_config.scenes)
+
+    @pytest.mark.asyncio
+    async def test_tts_failure_is_retried(self, video_config, tmp_path):
+        """A transient TTS failure is retried instead of failing the stage."""
+        backend = self.SlowFirstBackend(fail_first=1)
+        stage = AudioGenerationStage(
+            tts_backend=backend, max_concurrency=1, retry_backoff=0, audio_cache=AudioCache()
+        )
+        stage.emit_progress = AsyncMock()
+        stage._get_audio_duration = AsyncMock(return_value=1.0)
+        stage._generate_timing_report = AsyncMock(return_value=tmp_path / "timing.json")
+
+        with patch("video_gen.stages.audio_generation_stage.config") as mock_config:
+            mock_config.audio_dir = tmp_path / "audio"
+            mock_config.get_voice = Mock(return_value="en-US-GuyNeural")
+
+            result = await stage.execute({"task_id": "task-1", "video_config": video_config})
+
+        assert result.success is True
+        assert len(backend.calls) == 6
+
+
+class TestAudioGenerationStageCache:
+    """Test the TTS audio cache in AudioGenerationStage."""
+
+    class CountingBackend:
+        """Fake TTS backend that writes a small file per request."""
+
+        engine = "counting/1"
+
+        def __init__(self):
+            self.calls = []
+
+        async def synthesize(self, text, voice, output_file, rate="+0%", volume="+0%"):
+            self.calls.append(text)
+            Path(output_file).write_bytes(text.encode())
+
+    def _video(self, narrations):
+        return VideoConfig(
+            video_id="cached",
+            title="Cached",
+            description="Test",
+            scenes=[
+                Scene(scene_id=f"scene{i}", scene_type="title", narration=text, visual_content={})
+                for i, text in enumerate(narrations)
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_rerun_only_synthesizes_changed_scene(self, tmp_path):
+        """Unchanged narration is served from cache with its stored duration."""
+        backend = self.CountingBackend()
+        stage = AudioGenerationStage(
+            tts_backend=backend, audio_cache=AudioCache(tmp_path / "cache")
+        )
+        stage.emit_progress = AsyncMock()
+        stage._get_audio_duration = AsyncMock(return_value=4.0)
+
+        with patch("video_gen.stages.audio_generation_stage.config") as mock_config:
+            mock_config.audio_dir = tmp_path / "audio"
+            mock_config.get_voice = Mock(return_value="en-US-GuyNeural")
+
+            await stage.execute({"task_id": "t1", "video_config": self._video(["One", "Two", "Three"])})
+            edited = self._video(["One", "Two (edited)", "Three"])
+            result = await stage.execute({"task_id": "t2", "video_config": edited})
+
+        assert backend.calls == ["One", "Two", "Three", "Two (edited)"]
+        assert stage._get_audio_duration.await_count == 4
+        assert edited.scenes[0].actual_audio_duration == 4.0
+        assert edited.scenes[0].audio_file.read_bytes() == b"One"
+        assert result.metadata["audio_cache"]["hits"] == 2
+
+
 # ============================================================================
 # VIDEO GENERATION STAGE TESTS (42 missing lines)
 # ============================================================================
@@ -940,13 +1102,46 @@ class TestVideoGenerationStageRender:
 
             video_stage.emit_progress = AsyncMock()
 
-            # Mock generator to return None
+            # Mock generator to return None (rendering in a thread, since
+            # mocks don't reach render worker processes)
+            video_stage.render_workers = 0
             video_stage.generator._generate_single_video = Mock(return_value=None)
 
             with pytest.raises(VideoGenerationError, match="UnifiedVideoGenerator failed"):
                 await video_stage.execute(context)
 
 
+class TestVideoGenerationStagePrepare:
+    """Test VideoGenerationStage keyframe pre-rendering."""
+
+    @pytest.mark.asyncio
+    async def test_prepare_fills_keyframe_cache(self):
+        """Test prepare renders keyframes that execute() then reuses."""
+        from video_gen.renderers.cache import KeyframeCache
+
+        stage = VideoGenerationStage(render_workers=0)
+        stage.generator.keyframe_cache = KeyframeCache()
+        video_config = VideoConfig(
+            video_id="prep", title="Prep", description="", total_duration=0.0,
+            scenes=[
+                Scene(scene_id="s1", scene_type="title", narration="Hi",
+                      visual_content={"title": "Hello", "subtitle": "World"}),
+                Scene(scene_id="s2", scene_type="unknown_type", narration="Skip",
+                      visual_content={}),
+            ]
+        )
+
+        await stage.prepare({"video_config": video_config})
+
+        cache = stage.generator.keyframe_cache
+        assert cache.stats()["entries"] == 1
+        stage.generator._render_scene_keyframes(
+            {"type": "title", "visual_content": {"title": "Hello", "subtitle": "World"}},
+            (59, 130, 246)
+        )
+        assert cache.stats()["hits"] == 1
+
+
 # ============================================================================
 # SCRIPT GENERATION STAGE TESTS (16 missing lines)
 # ============================================================================
@@ -16,6 +16,8 @@ from pathlib import Path
 from PIL import Image
 from unittest.mock import Mock, patch, MagicMock
 import sys
+import threading
+import time
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -26,6 +28,18 @@ from video_gen.video_generator.unified import (
     VideoConfig,
     generate_videos_from_timings
 )
+from video_gen.video_generator import encoders
+from video_gen.video_generator.render_pool import RenderPool, get_render_pool, shutdown_render_pool
+from video_gen.shared.cancellation import (
+    CancellationToken, cancellation_scope, raise_if_cancelled, run_process
+)
+from video_gen.shared.exceptions import TaskCancelledError
+from video_gen.renderers import KeyframeCache
+from video_gen.video_generator.encoders import (
+    EncoderBackend,
+    cpu_backend,
+    select_encoder,
+)
 
 
 @pytest.fixture
@@ -87,6 +101,16 @@ def generator_fast(tmp_path):
     return UnifiedVideoGenerator(mode="fast", output_dir=tmp_path / "videos")
 
 
+@pytest.fixture
+def generator_x264(tmp_path):
+    """Create fast mode generator with a fixed CPU encoder (no FFmpeg probe)"""
+    return UnifiedVideoGenerator(
+        mode="fast",
+        output_dir=tmp_path / "videos",
+        encoder=cpu_backend("libx264")
+    )
+
+
 @pytest.fixture
 def generator_baseline(tmp_path):
     """Create baseline mode generator"""
@@ -242,6 +266,41 @@ class TestSceneRendering:
             generator_fast._render_scene_keyframes(scene, (59, 130, 246))
 
 
+class TestKeyframeCaching:
+    """Test keyframe cache integration"""
+
+    def test_next_scene_keyframes_drawn_once(self, tmp_path):
+        """Transition lookahead reuses the cached next-scene keyframes"""
+        generator = UnifiedVideoGenerator(
+            output_dir=tmp_path / "videos",
+            keyframe_cache=KeyframeCache()
+        )
+        timing_data = {
+            "video_id": "cached",
+            "scenes": [
+                {"scene_id": "a", "type": "title", "duration": 1.0, "visual_content": {"title": "A"}},
+                {"scene_id": "b", "type": "title", "duration": 1.0, "visual_content": {"title": "B"}},
+            ]
+        }
+
+        with patch.object(generator, '_draw_scene_keyframes',
+                          side_effect=lambda scene, accent: _blank_keyframes(generator, scene, accent)) as draw:
+            list(generator._iter_frame_spans(timing_data))
+
+        assert draw.call_count == 2
+        assert generator.keyframe_cache.stats()["hits"] == 1
+
+    def test_identical_visuals_share_cache_entry(self, generator_fast):
+        """Scenes differing only in narration hit the same entry"""
+        scene = {"type": "title", "narration": "one", "visual_content": {"title": "T"}}
+        other = dict(scene, narration="two")
+
+        first = generator_fast._render_scene_keyframes(scene, (59, 130, 246))
+        second = generator_fast._render_scene_keyframes(other, (59, 130, 246))
+
+        assert first is second
+
+
 class TestFrameBlending:
     """Test frame blending optimizations"""
 
@@ -288,6 +347,119 @@ class TestFrameBlending:
         assert all(isinstance(f, np.ndarray) for f in frames)
 
 
+class TestLazyFramePipeline:
+    """Test generator-based frame production"""
+
+    @staticmethod
+    def _small_keyframes(scene, accent_color):
+        color = (255, 0, 0) if scene['scene_id'] == 'a' else (0, 0, 255)
+        return Image.new('RGB', (16, 9), (0, 0, 0)), Image.new('RGB', (16, 9), color)
+
+    def _timing_data(self):
+        return {
+            "video_id": "lazy",
+            "scenes": [
+                {"scene_id": "a", "type": "title", "duration": 2.0},
+                {"scene_id": "b", "type": "title", "duration": 1.5},
+            ]
+        }
+
+    def test_iter_frames_is_lazy(self, generator_fast):
+        """Keyframes are rendered only as frames are consumed"""
+        with patch.object(generator_fast, '_render_scene_keyframes',
+                          side_effect=self._small_keyframes) as render:
+            frames = generator_fast._iter_frames(self._timing_data())
+            assert render.call_count == 0
+
+            next(frames)
+            assert render.call_count == 1
+
+    def test_iter_frames_matches_render_all_scenes(self, generator_fast):
+        """Lazy iterator yields the same frames as the list API"""
+        with patch.object(generator_fast, '_render_scene_keyframes',
+                          side_effect=self._small_keyframes):
+            lazy = list(generator_fast._iter_frames(self._timing_data()))
+            eager = generator_fast._render_all_scenes(self._timing_data())
+
+        # 2.0s + 0.5s transition + 1.5s at 30 fps
+        assert len(lazy) == len(eager) == 60 + 15 + 45
+        assert all(np.array_equal(a, b) for a, b in zip(lazy, eager))
+
+
+def _fake_encoders(returncode=0, stderr=b""):
+    """Popen side effect standing in for FFmpeg (creates the output file)"""
+    processes = []
+
+    def popen(cmd, **kwargs):
+        Path(cmd[-1]).touch()
+        process = MagicMock()
+        process.stderr.read.return_value = stderr
+        process.wait.return_value = returncode
+        processes.append(process)
+        return process
+
+    return popen, processes
+
+
+class TestHoldSpans:
+    """Test static holds represented as (frame, count) spans"""
+
+    def test_scene_hold_is_single_span(self, generator_fast):
+        """The end-frame hold is emitted once with its frame count"""
+        img1 = Image.new('RGB', (16, 9), color=(255, 0, 0))
+        img2 = Image.new('RGB', (16, 9), color=(0, 0, 255))
+
+        spans = list(generator_fast._iter_scene_spans(img1, img2, anim_frames=5, scene_duration=2.0))
+
+        assert len(spans) == 6
+        assert all(count == 1 for _, count in spans[:5])
+        assert spans[-1][1] == 60 - 5
+        assert np.array_equal(spans[-1][0], np.array(img2))
+
+    def test_no_hold_span_when_scene_shorter_than_animation(self, generator_fast):
+        """Scenes shorter than the animation produce no hold span"""
+        img = Image.new('RGB', (16, 9))
+
+        spans = list(generator_fast._iter_scene_spans(img, img, anim_frames=30, scene_duration=0.5))
+
+        assert [count for _, count in spans] == [1] * 30
+
+    @patch('subprocess.run')
+    def test_png_path_writes_hold_once(self, mock_run, generator_x264, tmp_path, monkeypatch):
+        """Concat encoding writes one PNG per span with its duration"""
+        monkeypatch.chdir(tmp_path)
+        concat_lines = []
+
+        def capture_concat(cmd, **kwargs):
+            concat_file = Path(cmd[cmd.index("-i") + 1])
+            concat_lines.extend(concat_file.read_text().splitlines())
+            return MagicMock(returncode=0)
+
+        mock_run.side_effect = capture_concat
+        frame = np.zeros((9, 16, 3), dtype=np.uint8)
+
+        generator_x264._encode_spans([(frame, 1), (frame, 90)], "spans")
+
+        assert sum(line.startswith("file") for line in concat_lines) == 3
+        assert "duration 3.0" in concat_lines
+
+    @patch('subprocess.run')
+    @patch('subprocess.Popen')
+    def test_stream_path_encodes_hold_once(self, mock_popen, mock_run, generator_x264):
+        """A long hold is piped to the encoder as a single frame"""
+        mock_popen.side_effect, processes = _fake_encoders()
+        mock_run.return_value = MagicMock(returncode=0)
+        frame = np.zeros((9, 16, 3), dtype=np.uint8)
+
+        generator_x264._encode_spans_stream([(frame, 1), (frame, 9000), (frame, 1)], "spans")
+
+        assert sum(process.stdin.write.call_count for process in processes) == 3
+        hold_cmd = mock_popen.call_args_list[1][0][0]
+        assert hold_cmd[hold_cmd.index("-r") + 1] == "30/9000"
+        concat_cmd = mock_run.call_args[0][0]
+        assert concat_cmd[concat_cmd.index("-c") + 1] == "copy"
+
+
 class TestVideoGeneration:
     """Test complete video generation pipeline"""
 
@@ -345,6 +517,408 @@ class TestVideoGeneration:
         assert all(call['stage'] == 'video' for call in callback_calls)
 
 
+class TestStreamingEncoder:
+    """Test raw-frame streaming into FFmpeg"""
+
+    @patch('subprocess.Popen')
+    def test_stream_encode_pipes_raw_frames(self, mock_popen, generator_x264):
+        """Frames are written to FFmpeg stdin as rawvideo, no temp dir"""
+        mock_popen.side_effect, processes = _fake_encoders()
+
+        frames = (np.zeros((108, 192, 3), dtype=np.uint8) for _ in range(5))
+        output = generator_x264._encode_video_stream(frames, "test_stream")
+
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index("-f") + 1] == "rawvideo"
+        assert cmd[cmd.index("-pix_fmt") + 1] == "rgb24"
+        assert cmd[cmd.index("-s") + 1] == "192x108"
+        assert cmd[cmd.index("-i") + 1] == "-"
+        assert len(processes) == 1
+        assert processes[0].stdin.write.call_count == 5
+        assert output.name == "test_stream_silent.mp4"
+        assert not Path("temp_unified_test_stream").exists()
+        assert not (generator_x264.output_dir / "temp_stream_test_stream").exists()
+
+    @patch('subprocess.Popen')
+    def test_stream_encode_failure(self, mock_popen, generator_x264):
+        """Non-zero FFmpeg exit raises RuntimeError"""
+        process = MagicMock()
+        process.stderr.read.return_value = b"Unknown encoder"
+        process.wait.return_value = 1
+        mock_popen.return_value = process
+
+        frames = [np.zeros((108, 192, 3), dtype=np.uint8) for _ in range(3)]
+
+        with pytest.raises(RuntimeError, match="Video encoding failed"):
+            generator_x264._encode_video_stream(frames, "test_stream")
+
+    @patch('subprocess.Popen')
+    def test_stream_encode_rejects_mismatched_frames(self, mock_popen, generator_x264):
+        """Frames with a different shape abort the encode"""
+        mock_popen.return_value = MagicMock()
+
+        frames = [
+            np.zeros((108, 192, 3), dtype=np.uint8),
+            np.zeros((100, 100, 3), dtype=np.uint8),
+        ]
+
+        with pytest.raises(ValueError, match="shape"):
+            generator_x264._encode_video_stream(frames, "test_stream")
+        mock_popen.return_value.kill.assert_called_once()
+
+    def test_stream_encode_no_frames(self, generator_fast):
+        """Empty frame source is rejected before FFmpeg starts"""
+        with pytest.raises(ValueError, match="No frames"):
+            generator_fast._encode_video_stream(iter([]), "test_stream")
+
+
+ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC (codec h264)
+ V....D libx265              libx265 H.265 / HEVC (codec hevc)
+ V....D h264_nvenc           NVIDIA NVENC H.264 encoder (codec h264)
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+
+
+class TestEncoderBackend:
+    """Test encoder probing and backend selection"""
+
+    @pytest.fixture(autouse=True)
+    def clear_probe_cache(self):
+        encoders.probe_encoders.cache_clear()
+        encoders.nvenc_usable.cache_clear()
+        yield
+        encoders.probe_encoders.cache_clear()
+        encoders.nvenc_usable.cache_clear()
+
+    @patch('subprocess.run')
+    def test_probe_parses_video_encoders(self, mock_run):
+        """Only video encoder names are collected"""
+        mock_run.return_value = MagicMock(returncode=0, stdout=ENCODERS_OUTPUT)
+
+        found = encoders.probe_encoders("ffmpeg")
+
+        assert {"libx264", "libx265", "h264_nvenc"} <= found
+        assert "aac" not in found
+
+    @patch('subprocess.run')
+    def test_probe_runs_once_per_binary(self, mock_run):
+        """Probe result is cached per FFmpeg path"""
+        mock_run.return_value = MagicMock(returncode=0, stdout=ENCODERS_OUTPUT)
+
+        encoders.probe_encoders("ffmpeg")
+        encoders.probe_encoders("ffmpeg")
+
+        assert mock_run.call_count == 1
+
+    @patch('subprocess.run')
+    def test_auto_selects_nvenc_when_usable(self, mock_run):
+        """NVENC is chosen when listed and the test encode succeeds"""
+        mock_run.return_value = MagicMock(returncode=0, stdout=ENCODERS_OUTPUT)
+
+        backend = select_encoder("ffmpeg")
+
+        assert isinstance(backend, EncoderBackend)
+        assert backend.name == "nvenc"
+        assert backend.is_gpu
+        assert "h264_nvenc" in backend.output_args()
+
+    @patch('subprocess.run')
+    def test_auto_falls_back_when_nvenc_test_encode_fails(self, mock_run):
+        """Listed-but-unusable NVENC falls back to libx264"""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout=ENCODERS_OUTPUT),
+            MagicMock(returncode=1, stdout="", stderr="No NVENC capable devices found"),
+        ]
+
+        backend = select_encoder("ffmpeg")
+
+        assert backend.name == "libx264"
+        args = backend.output_args()
+        assert args[args.index("-preset") + 1] == "veryfast"
+        assert args[args.index("-tune") + 1] == "stillimage"
+
+    def test_missing_ffmpeg_falls_back_to_cpu(self):
+        """An unrunnable FFmpeg yields a CPU backend instead of raising"""
+        backend = select_encoder("/invalid/path/to/ffmpeg")
+
+        assert isinstance(backend, EncoderBackend)
+        assert backend.name == "libx264"
+
+    def test_libx265_ignores_unsupported_tune(self):
+        """x265 has no stillimage tune, so it is dropped"""
+        backend = cpu_backend("libx265", tune="stillimage")
+
+        assert "-tune" not in backend.output_args()
+        assert "hvc1" in backend.output_args()
+
+    def test_unknown_preference_rejected(self):
+        """Invalid encoder names raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown video encoder"):
+            select_encoder("ffmpeg", preference="mpeg2")
+
+    def test_generator_uses_given_encoder(self, tmp_path):
+        """An explicit backend is used without probing FFmpeg"""
+        backend = cpu_backend("libx264", preset="ultrafast", tune=None)
+        generator = UnifiedVideoGenerator(output_dir=tmp_path, encoder=backend)
+
+        with patch('subprocess.run') as mock_run:
+            args = generator._encoder_args()
+
+        mock_run.assert_not_called()
+        assert args == ["-c:v", "libx264", "-preset", "ultrafast", "-crf", "20", "-pix_fmt", "yuv420p"]
+
+
+class _InlinePool:
+    """In-process stand-in for multiprocessing.Pool"""
+
+    def __init__(self, processes=None):
+        self.processes = processes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, func, iterable):
+        return [func(item) for item in iterable]
+
+    def map_async(self, func, iterable):
+        result = MagicMock()
+        result.get.return_value = self.map(func, iterable)
+        return result
+
+
+def _blank_keyframes(self, scene, accent_color):
+    """Stand-in for UnifiedVideoGenerator._render_scene_keyframes"""
+    return Image.new('RGB', (16, 9), (0, 0, 0)), Image.new('RGB', (16, 9), (255, 255, 255))
+
+
+class TestSceneParallel:
+    """Test per-scene segment rendering with stream-copy concat"""
+
+    def _timing_data(self):
+        return {
+            "video_id": "scene_par",
+            "scenes": [
+                {"scene_id": "a", "type": "title", "duration": 2.0},
+                {"scene_id": "b", "type": "title", "duration": 1.5},
+                {"scene_id": "c", "type": "title", "duration": 1.0},
+            ]
+        }
+
+    def test_scene_parallel_disabled_by_default(self, generator_x264):
+        """Default generators render serially"""
+        assert not generator_x264._use_scene_parallel(self._timing_data())
+
+    def test_segments_concatenated_with_stream_copy(self, tmp_path, monkeypatch):
+        """Each scene becomes a segment, joined with -c copy"""
+        monkeypatch.chdir(tmp_path)
+        generator = UnifiedVideoGenerator(
+            output_dir=tmp_path / "videos",
+            encoder=cpu_backend("libx264"),
+            scene_parallel=True,
+            scene_workers=2
+        )
+        written = {}
+        concat_lines = []
+
+        def fake_stream(self, spans, video_id):
+            written[video_id] = sum(count for _, count in spans)
+            return self.output_dir / f"{video_id}_silent.mp4"
+
+        def fake_run(cmd, **kwargs):
+            concat_lines.extend(Path(cmd[cmd.index("-i") + 1]).read_text().splitlines())
+            assert cmd[cmd.index("-c") + 1] == "copy"
+            return MagicMock(returncode=0)
+
+        with patch('video_gen.video_generator.unified.Pool', _InlinePool), \
+                patch.object(UnifiedVideoGenerator, '_render_scene_keyframes', _blank_keyframes), \
+                patch.object(UnifiedVideoGenerator, '_encode_spans_stream', fake_stream), \
+                patch('subprocess.run', side_effect=fake_run):
+            assert generator._use_scene_parallel(self._timing_data())
+            output = generator._encode_scenes_parallel(self._timing_data())
+
+        # Scene frames plus a 15-frame outgoing transition (none after the last)
+        assert written == {"segment_0000": 60 + 15, "segment_0001": 45 + 15, "segment_0002": 30}
+        assert [line.split("/")[-1] for line in concat_lines] == [
+            "segment_0000_silent.mp4'", "segment_0001_silent.mp4'", "segment_0002_silent.mp4'"
+        ]
+        assert output == tmp_path / "videos" / "scene_par_silent.mp4"
+        assert not (tmp_path / "temp_segments_scene_par").exists()
+
+    def test_concat_failure_raises(self, tmp_path, monkeypatch):
+        """A failed concat raises and still removes the segment directory"""
+        monkeypatch.chdir(tmp_path)
+        generator = UnifiedVideoGenerator(
+            output_dir=tmp_path / "videos",
+            encoder=cpu_backend("libx264"),
+            scene_parallel=True
+        )
+
+        with patch('video_gen.video_generator.unified.Pool', _InlinePool), \
+                patch.object(UnifiedVideoGenerator, '_render_scene_keyframes', _blank_keyframes), \
+                patch.object(UnifiedVideoGenerator, '_encode_spans_stream', return_value=Path("seg.mp4")), \
+                patch('subprocess.run', return_value=MagicMock(returncode=1, stderr="bad")):
+            with pytest.raises(RuntimeError, match="Video encoding failed"):
+                generator._encode_scenes_parallel(self._timing_data())
+
+        assert not (tmp_path / "temp_segments_scene_par").exists()
+
+
+class TestCancellation:
+    """Test that a cancelled task stops rendering and kills FFmpeg"""
+
+    def test_frame_spans_stop_between_scenes(self, generator_fast):
+        """No further scene is rendered once the task is cancelled"""
+        timing_data = {
+            "video_id": "cancel",
+            "scenes": [
+                {"scene_id": "a", "type": "title", "duration": 1.0},
+                {"scene_id": "b", "type": "title", "duration": 1.0},
+            ]
+        }
+        token = CancellationToken("task_1")
+        rendered = []
+
+        def render(self, scene, accent_color):
+            rendered.append(scene["scene_id"])
+            token.cancel()
+            return _blank_keyframes(self, scene, accent_color)
+
+        with patch.object(UnifiedVideoGenerator, '_render_scene_keyframes', render), \
+                cancellation_scope(token):
+            with pytest.raises(TaskCancelledError):
+                list(generator_fast._iter_frame_spans(timing_data))
+
+        # Scene "a" plus the start keyframe of "b" for the transition
+        assert rendered == ["a", "b"]
+
+    @patch('subprocess.Popen')
+    def test_stream_encoder_killed_on_cancel(self, mock_popen, generator_x264):
+        """Cancelling kills the streaming FFmpeg process"""
+        process = MagicMock()
+        process.stderr.read.return_value = b""
+        process.wait.return_value = -9
+        mock_popen.return_value = process
+        frame = np.zeros((9, 16, 3), dtype=np.uint8)
+        token = CancellationToken("task_1")
+
+        def spans():
+            yield frame, 1
+            token.cancel()
+            yield frame, 1
+
+        with cancellation_scope(token):
+            with pytest.raises(TaskCancelledError):
+                generator_x264._encode_spans_stream(spans(), "spans")
+
+        process.kill.assert_called()
+
+    def test_run_process_kills_child(self):
+        """A blocking subprocess is killed when the task is cancelled"""
+        token = CancellationToken("task_1")
+        timer = threading.Timer(0.2, token.cancel)
+        timer.start()
+
+        start = time.monotonic()
+        with cancellation_scope(token):
+            with pytest.raises(TaskCancelledError):
+                run_process([sys.executable, "-c", "import time; time.sleep(30)"], capture_output=True)
+        timer.join()
+
+        assert time.monotonic() - start < 10
+
+    def test_cancelled_video_removes_temp_files(self, generator_x264, sample_timing_report, tmp_path, monkeypatch):
+        """Temp audio and the partial silent video are removed on cancel"""
+        monkeypatch.chdir(tmp_path)
+        video_id = json.loads(sample_timing_report.read_text())["video_id"]
+        temp_audio = tmp_path / f"temp_audio_{video_id}"
+        silent_video = generator_x264.output_dir / f"{video_id}_silent.mp4"
+
+        def cancelled_encode(spans, video_id):
+            temp_audio.mkdir()
+            silent_video.write_bytes(b"partial")
+            raise TaskCancelledError("Task cancelled")
+
+        with patch.object(generator_x264, '_encode_spans_stream', side_effect=cancelled_encode), \
+                patch.object(UnifiedVideoGenerator, '_render_scene_keyframes', _blank_keyframes):
+            with pytest.raises(TaskCancelledError):
+                generator_x264._generate_single_video(sample_timing_report)
+
+        assert not temp_audio.exists()
+        assert not silent_video.exists()
+
+
+class _ScriptedGenerator:
+    """Picklable stand-in for UnifiedVideoGenerator in render workers"""
+
+    def __init__(self, scenes, scene_seconds=0.0):
+        self.scenes = scenes
+        self.scene_seconds = scene_seconds
+        self.progress_callback = None
+
+    def _generate_single_video(self, timing_report_path):
+        for i in range(self.scenes):
+            raise_if_cancelled()
+            self.progress_callback(stage="video", progress=i / self.scenes, message=f"scene {i}")
+            time.sleep(self.scene_seconds)
+        return Path(timing_report_path)
+
+
+class TestRenderPool:
+    """Test renders in worker processes"""
+
+    @pytest.fixture
+    def render_pool(self):
+        pool = RenderPool(workers=1)
+        yield pool
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_render_reports_progress(self, render_pool, tmp_path):
+        """The worker's result and progress reports reach the event loop"""
+        progress = []
+
+        async def on_progress(value, message):
+            progress.append((value, message))
+
+        result = await render_pool.render(_ScriptedGenerator(scenes=2), tmp_path / "report.json", on_progress)
+
+        assert result == tmp_path / "report.json"
+        assert progress == [(0.0, "scene 0"), (0.5, "scene 1")]
+
+    @pytest.mark.asyncio
+    async def test_cancel_reaches_worker(self, render_pool, tmp_path):
+        """Cancelling the task stops the render inside the worker"""
+        token = CancellationToken("task_1")
+
+        async def on_progress(value, message):
+            token.cancel()
+
+        generator = _ScriptedGenerator(scenes=1000, scene_seconds=0.05)
+        with cancellation_scope(token):
+            with pytest.raises(TaskCancelledError):
+                await render_pool.render(generator, tmp_path / "report.json", on_progress)
+
+    @pytest.mark.asyncio
+    async def test_stages_share_one_pool(self, tmp_path):
+        """Every caller renders in the same process-wide pool"""
+        pool = get_render_pool(1)
+        try:
+            assert get_render_pool(4) is pool
+            await pool.render(_ScriptedGenerator(scenes=1), tmp_path / "report.json")
+            assert pool._executor is not None
+        finally:
+            shutdown_render_pool()
+
+        assert pool._executor is None
+        assert pool._manager is None
+
+
 class TestBatchProcessing:
     """Test batch and parallel processing"""
 
@@ -77,6 +77,15 @@ def test_health_endpoint(client):
     assert data["features"]["state_persistence"] == True
 
 
+def test_metrics_endpoint(client):
+    """Test metrics are served in the Prometheus text format"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE video_gen_jobs_running gauge" in response.text
+    assert 'video_gen_jobs_queued{priority="normal"}' in response.text
+
+
 def test_scene_types_endpoint(client):
     """Test scene types endpoint"""
     response = client.get("/api/scene-types")
@@ -10,11 +10,21 @@ This module consolidates:
 Provides:
 - Neural TTS (Edge-TTS) with multiple voices
 - Precise duration measurement
+- Persistent TTS audio cache
 - Timing report generation
 - Support for single and batch processing
 - Progress tracking
 """
 
 from .unified import UnifiedAudioGenerator, AudioGenerationConfig, AudioGenerationResult
+from .tts import TTSBackend
+from .cache import AudioCache, audio_cache_key
 
-__all__ = ['UnifiedAudioGenerator', 'AudioGenerationConfig', 'AudioGenerationResult']
+__all__ = [
+    'UnifiedAudioGenerator',
+    'AudioGenerationConfig',
+    'AudioGenerationResult',
+    'TTSBackend',
+    'AudioCache',
+    'audio_cache_key',
+]
@@ -0,0 +1,194 @@
+"""
+Audio Cache
+===========
+Content-addressed disk cache for synthesized narration.
+
+A scene's audio depends only on its narration text, the voice, the
+rate/volume settings and the TTS engine, so a hash of those inputs
+identifies the MP3. Entries store the MP3 together with its measured
+duration, letting re-runs skip both synthesis and duration probing for
+unchanged scenes.
+
+Layout: ``cache_dir/<key[:2]>/<key>.mp3`` plus ``<key>.json`` (duration).
+The cache is bounded by total size; least recently used entries (by
+file mtime, refreshed on every hit) are evicted first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+
+def audio_cache_key(
+    text: str,
+    voice: str,
+    rate: str = "+0%",
+    volume: str = "+0%",
+    engine: str = "edge-tts"
+) -> str:
+    """Build the content hash identifying a synthesized narration.
+
+    Args:
+        text: Narration text
+        voice: TTS voice ID (e.g. "en-US-AndrewMultilingualNeural")
+        rate: Speech rate setting
+        volume: Volume setting
+        engine: TTS engine name and version
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {"text": text, "voice": voice, "rate": rate, "volume": volume, "engine": engine},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """Size-bounded LRU disk cache of (MP3, duration) entries.
+
+    Args:
+        cache_dir: Cache directory (None disables the cache)
+        max_bytes: Total MP3 size kept before evicting old entries
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._size: Optional[int] = None  # Lazily measured on first store
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are read and written."""
+        return self.cache_dir is not None
+
+    def get(self, key: str, dest: Path) -> Optional[float]:
+        """Copy a cached MP3 to ``dest`` and return its duration.
+
+        Returns:
+            Duration in seconds, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        audio_path, meta_path = self._paths(key)
+        try:
+            duration = float(json.loads(meta_path.read_text(encoding='utf-8'))["duration"])
+            shutil.copyfile(audio_path, dest)
+            os.utime(audio_path)  # Mark as recently used
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return duration
+
+    def put(self, key: str, audio_file: Path, duration: float):
+        """Store an MP3 and its duration, then enforce the size bound."""
+        if not self.enabled or not Path(audio_file).is_file():
+            return
+
+        def copy_audio(f):
+            with open(audio_file, 'rb') as src:
+                shutil.copyfileobj(src, f)
+
+        audio_path, meta_path = self._paths(key)
+        try:
+            # An overwritten entry's old size leaves the total
+            old_size = audio_path.stat().st_size
+        except OSError:
+            old_size = 0
+        try:
+            audio_path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(audio_path, copy_audio)
+            self._write_atomic(
+                meta_path,
+                lambda f: f.write(json.dumps({"duration": duration}).encode('utf-8'))
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write audio cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += audio_path.stat().st_size - old_size
+        self._evict_if_needed()
+
+    def clear(self):
+        """Delete every cache entry."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for path in self.cache_dir.glob("*/*"):
+                path.unlink(missing_ok=True)
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _paths(self, key: str):
+        base = self.cache_dir / key[:2]
+        return base / f"{key}.mp3", base / f"{key}.json"
+
+    @staticmethod
+    def _write_atomic(path: Path, write):
+        # Temp file plus rename so concurrent readers never see partial files
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _evict_if_needed(self):
+        with self._lock:
+            if self._size is not None and self._size <= self.max_bytes:
+                return
+
+            entries = []
+            for audio_path in self.cache_dir.glob("*/*.mp3"):
+                try:
+                    stat = audio_path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, audio_path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, audio_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                audio_path.unlink(missing_ok=True)
+                audio_path.with_suffix(".json").unlink(missing_ok=True)
+                total -= size
+                self.evictions += 1
+
+            self._size = total
+
+
+__all__ = ['AudioCache', 'audio_cache_key', 'DEFAULT_MAX_BYTES']
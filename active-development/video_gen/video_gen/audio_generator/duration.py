@@ -0,0 +1,195 @@
+"""
+Audio Duration Probe
+====================
+Reads audio durations in-process instead of spawning FFmpeg per file.
+
+MP3 files are measured by parsing frame headers: the Xing/Info or VBRI
+tag in the first frame gives the frame count directly, otherwise the
+frame headers are walked (exact for both CBR and VBR). Other formats use
+mutagen when it is installed. Callers fall back to FFmpeg only when
+both return None.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+try:
+    from mutagen import File as MutagenFile
+except ImportError:  # Optional dependency
+    MutagenFile = None
+
+logger = logging.getLogger(__name__)
+
+# Bitrates in kbps by (MPEG-1?, layer)
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+_FFMPEG_DURATION = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+# (frame length in bytes, samples per frame, sample rate, MPEG-1?, mono?)
+FrameHeader = Tuple[int, int, int, bool, bool]
+
+
+def parse_frame_header(data: bytes, pos: int) -> Optional[FrameHeader]:
+    """Decode the MPEG audio frame header at ``pos`` (None if invalid)."""
+    if pos + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[pos:pos + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][rate_index]
+    padding = (b2 >> 1) & 0x01
+    mono = ((b3 >> 6) & 0x03) == 3
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or mpeg1:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+
+    return length, samples, sample_rate, mpeg1, mono
+
+
+def _skip_id3v2(data: bytes, pos: int) -> int:
+    """Return the offset just past an ID3v2 tag at ``pos`` (or ``pos``)."""
+    if data[pos:pos + 3] != b"ID3" or pos + 10 > len(data):
+        return pos
+    size = 0
+    for byte in data[pos + 6:pos + 10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[pos + 5] & 0x10 else 0
+    return pos + 10 + size + footer
+
+
+def _tag_frame_count(data: bytes, pos: int, header: FrameHeader) -> Optional[int]:
+    """Frame count from a Xing/Info or VBRI tag in the first frame."""
+    _, _, _, mpeg1, mono = header
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+
+    xing = pos + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(data[xing + 4:xing + 8], "big")
+        if flags & 0x01:
+            return int.from_bytes(data[xing + 8:xing + 12], "big")
+        return None
+
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI":
+        return int.from_bytes(data[vbri + 14:vbri + 18], "big")
+
+    return None
+
+
+def mp3_duration(source: Union[str, Path, bytes]) -> Optional[float]:
+    """
+    Duration of an MP3 in seconds, parsed from its frame headers.
+
+    Args:
+        source: File path or the file's bytes
+
+    Returns:
+        Duration in seconds, or None if the data is not a readable MP3
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    else:
+        try:
+            data = Path(source).read_bytes()
+        except OSError:
+            return None
+
+    pos = _skip_id3v2(data, 0)
+    first = parse_frame_header(data, pos)
+    # Require a second frame right after the first so random bytes that
+    # happen to contain a sync word are not mistaken for audio
+    if first is None or parse_frame_header(data, pos + first[0]) is None:
+        return None
+
+    frames = _tag_frame_count(data, pos, first)
+    if frames is not None:
+        return frames * first[1] / first[2]
+
+    # No usable tag: walk every frame (an Info frame carries no audio, but
+    # is a single frame, well under the precision callers need)
+    seconds = 0.0
+    while pos < len(data):
+        header = parse_frame_header(data, pos)
+        if header is None:
+            # Concatenated files may carry further ID3v2 tags mid-stream
+            next_pos = _skip_id3v2(data, pos)
+            if next_pos == pos:
+                break
+            pos = next_pos
+            continue
+        length, samples, sample_rate, _, _ = header
+        seconds += samples / sample_rate
+        pos += length
+
+    return seconds
+
+
+def probe_duration(path: Union[str, Path]) -> Optional[float]:
+    """
+    Duration of an audio file without spawning a process.
+
+    Tries the MP3 frame parser, then mutagen (if installed) for other
+    formats.
+
+    Returns:
+        Duration in seconds, or None if neither could read the file
+    """
+    duration = mp3_duration(path)
+    if duration is not None:
+        return duration
+
+    if MutagenFile is not None:
+        try:
+            audio = MutagenFile(str(path))
+            if audio is not None and audio.info is not None:
+                return float(audio.info.length)
+        except Exception as e:  # mutagen raises many format-specific errors
+            logger.debug(f"mutagen could not read {path}: {e}")
+
+    return None
+
+
+def parse_ffmpeg_duration(output: str) -> Optional[float]:
+    """Parse ``Duration: HH:MM:SS.ss`` from FFmpeg/ffprobe stderr."""
+    match = _FFMPEG_DURATION.search(output or "")
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+__all__ = ['mp3_duration', 'probe_duration', 'parse_ffmpeg_duration', 'parse_frame_header']
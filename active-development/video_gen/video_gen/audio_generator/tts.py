@@ -0,0 +1,135 @@
+"""
+TTS Helpers
+===========
+Shared helpers for concurrent text-to-speech synthesis.
+
+Provides:
+- TTSBackend interface (Edge TTS is used when no backend is given)
+- Engine identifiers for audio cache keys
+- Per-scene retry with exponential backoff
+- Bounded-concurrency gather that preserves input order
+"""
+
+import asyncio
+import logging
+import edge_tts
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class TTSBackend(ABC):
+    """
+    Interface for text-to-speech engines.
+
+    Implementations write the spoken ``text`` to ``output_file`` as MP3.
+    Used to swap Edge TTS for a local engine, or a fake in tests.
+
+    ``engine`` is part of audio cache keys; change it whenever the
+    backend's output changes.
+    """
+
+    engine: str = "custom"
+
+    @abstractmethod
+    async def synthesize(
+        self,
+        text: str,
+        voice: str,
+        output_file: Path,
+        rate: str = "+0%",
+        volume: str = "+0%"
+    ) -> None:
+        """Synthesize ``text`` with ``voice`` into ``output_file``."""
+
+
+def tts_engine_id(backend: Optional[TTSBackend] = None) -> str:
+    """Identify the engine (and version) that produces a backend's audio."""
+    if backend is None:
+        return f"edge-tts/{getattr(edge_tts, '__version__', 'unknown')}"
+    return getattr(backend, "engine", type(backend).__name__)
+
+
+async def with_retry(
+    operation: Callable[[], Awaitable[Any]],
+    retries: int = 2,
+    backoff: float = 0.5,
+    description: str = "TTS request"
+) -> Any:
+    """
+    Await ``operation()``, retrying failures with exponential backoff.
+
+    Args:
+        operation: Zero-argument coroutine factory (called once per attempt)
+        retries: Extra attempts after the first failure
+        backoff: Delay before the first retry, doubled for each further one
+        description: Used in log messages
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        The last exception once all attempts have failed
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await operation()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = backoff * (2 ** attempt)
+            logger.warning(
+                f"{description} failed (attempt {attempt + 1}/{retries + 1}): {e}; "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+
+async def gather_bounded(
+    operations: Sequence[Callable[[], Awaitable[Any]]],
+    limit: int,
+    return_exceptions: bool = False
+) -> List[Any]:
+    """
+    Run coroutine factories with at most ``limit`` in flight.
+
+    Results are returned in the order of ``operations`` regardless of
+    completion order. Without ``return_exceptions`` the first failure
+    cancels the remaining operations and is re-raised.
+
+    Args:
+        operations: Zero-argument coroutine factories
+        limit: Maximum concurrent operations (values below 1 mean 1)
+        return_exceptions: Return exceptions in place of results
+
+    Returns:
+        List of results (or exceptions), one per operation
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(operation: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await operation()
+
+    tasks = [asyncio.ensure_future(run(op)) for op in operations]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def concurrency_limit(value: Optional[Any], default: int = 1) -> int:
+    """Coerce a configured worker count to a positive int."""
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+__all__ = ['TTSBackend', 'tts_engine_id', 'with_retry', 'gather_bounded', 'concurrency_limit']
@@ -5,7 +5,9 @@ Consolidates generate_all_videos_unified_v2.py and generate_video_set.py
 Supports both single videos and video sets
 """
 
+import asyncio
 import edge_tts
+import logging
 import subprocess
 import json
 from pathlib import Path
@@ -16,6 +18,11 @@ from datetime import datetime
 from ..shared.models import VideoConfig, SceneConfig
 from ..shared.config import config
 from ..shared.exceptions import AudioGenerationError
+from .tts import TTSBackend, tts_engine_id, with_retry, gather_bounded, concurrency_limit
+from .cache import AudioCache, audio_cache_key
+from .duration import probe_duration, parse_ffmpeg_duration
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -28,11 +35,20 @@ class AudioGenerationConfig:
     volume: str = "+0%"
     generate_timing_report: bool = True
     cache_enabled: bool = False
+    cache_dir: Optional[Path] = None  # Defaults to config.cache_dir / "audio"
+    cache_max_mb: Optional[int] = None  # Defaults to config.audio_cache_max_mb
+    max_concurrency: Optional[int] = None  # Defaults to config.max_workers
+    retries: int = 2
+    retry_backoff: float = 0.5
 
     def __post_init__(self):
         """Initialize with defaults."""
         if self.voices is None:
             self.voices = config.voice_config
+        if self.cache_dir is None:
+            self.cache_dir = config.cache_dir / "audio"
+        if self.cache_max_mb is None:
+            self.cache_max_mb = config.audio_cache_max_mb
 
         self.output_dir = Path(self.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -97,6 +113,8 @@ class UnifiedAudioGenerator:
 
     Features:
     - Neural TTS (Edge-TTS) with multiple voices
+    - Concurrent scene synthesis with per-scene retry
+    - Content-addressed audio cache (when cache_enabled)
     - Precise duration measurement
     - Timing report generation
     - Support for single and batch processing
@@ -106,7 +124,8 @@ class UnifiedAudioGenerator:
     def __init__(
         self,
         config: AudioGenerationConfig,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        tts_backend: Optional[TTSBackend] = None
     ):
         """
         Initialize audio generator.
@@ -115,9 +134,15 @@ class UnifiedAudioGenerator:
             config: Audio generation configuration
             progress_callback: Optional callback for progress updates
                              Signature: (stage: str, progress: float, message: str) -> None
+            tts_backend: TTS engine (default: Edge TTS)
         """
         self.config = config
         self.progress_callback = progress_callback
+        self.tts_backend = tts_backend
+        self.audio_cache = AudioCache(
+            cache_dir=config.cache_dir if config.cache_enabled else None,
+            max_bytes=config.cache_max_mb * 1024 * 1024
+        )
 
     async def generate_for_video_set(
         self,
@@ -169,22 +194,44 @@ class UnifiedAudioGenerator:
             audio_dir=audio_dir
         )
 
-        # Generate audio for each scene
-        for i, scene in enumerate(video.scenes):
+        # Generate audio for all scenes concurrently
+        limit = concurrency_limit(
+            self.config.max_concurrency
+            if self.config.max_concurrency is not None
+            else config.max_workers
+        )
+        completed = 0
+
+        async def generate(scene: SceneConfig, scene_num: int) -> SceneAudioResult:
+            nonlocal completed
+            scene_result = await self._generate_scene_audio(
+                scene=scene,
+                output_dir=audio_dir,
+                scene_num=scene_num
+            )
+            completed += 1
             if self.progress_callback:
                 self.progress_callback(
                     stage="audio",
-                    progress=i / len(video.scenes),
-                    message=f"Generating scene {i+1}/{len(video.scenes)}: {scene.scene_id}"
+                    progress=completed / len(video.scenes),
+                    message=f"Generated scene {completed}/{len(video.scenes)}: {scene.scene_id}"
                 )
+            return scene_result
+
+        outcomes = await gather_bounded(
+            [
+                lambda scene=scene, num=i + 1: generate(scene, num)
+                for i, scene in enumerate(video.scenes)
+            ],
+            limit,
+            return_exceptions=True
+        )
 
+        # Apply results in scene order
+        for scene, scene_result in zip(video.scenes, outcomes):
             try:
-                # Generate TTS audio
-                scene_result = await self._generate_scene_audio(
-                    scene=scene,
-                    output_dir=audio_dir,
-                    scene_num=i+1
-                )
+                if isinstance(scene_result, BaseException):
+                    raise scene_result
 
                 # Update scene with audio information
                 scene.actual_audio_duration = scene_result.duration
@@ -238,17 +285,35 @@ class UnifiedAudioGenerator:
         # Create output filename
         output_file = output_dir / f"scene_{scene_num:02d}.mp3"
 
-        # Generate audio using Edge-TTS
-        communicate = edge_tts.Communicate(
+        cache_key = audio_cache_key(
             scene.narration,
             voice,
-            rate=self.config.rate,
-            volume=self.config.volume
+            self.config.rate,
+            self.config.volume,
+            tts_engine_id(self.tts_backend)
         )
-        await communicate.save(str(output_file))
+        duration = self.audio_cache.get(cache_key, output_file)
+        if duration is None:
+            # Generate audio, retrying transient TTS failures
+            await with_retry(
+                lambda: self._synthesize(scene.narration, voice, output_file),
+                retries=self.config.retries,
+                backoff=self.config.retry_backoff,
+                description=f"TTS for scene {scene.scene_id}"
+            )
 
-        # Measure duration
-        duration = self._measure_audio_duration(output_file)
+            # Measure duration (off the event loop in case FFmpeg is needed)
+            duration = await asyncio.to_thread(self._measure_audio_duration, output_file)
+            if duration is None:
+                # Good enough for this run's timing, but never cached: the
+                # cache would keep the guess for good
+                duration = self._estimate_duration_from_filesize(output_file)
+                logger.warning(
+                    f"Could not measure {output_file.name}; "
+                    f"estimated {duration:.2f}s from file size"
+                )
+            else:
+                self.audio_cache.put(cache_key, output_file, duration)
 
         return SceneAudioResult(
             scene_id=scene.scene_id,
@@ -258,22 +323,47 @@ class UnifiedAudioGenerator:
             voice=scene.voice
         )
 
-    def _measure_audio_duration(self, audio_file: Path) -> float:
+    async def _synthesize(self, text: str, voice: str, output_file: Path):
+        """Run one TTS request (Edge-TTS unless another backend was given)."""
+        if self.tts_backend is not None:
+            await self.tts_backend.synthesize(
+                text,
+                voice,
+                output_file,
+                rate=self.config.rate,
+                volume=self.config.volume
+            )
+            return
+
+        communicate = edge_tts.Communicate(
+            text,
+            voice,
+            rate=self.config.rate,
+            volume=self.config.volume
+        )
+        await communicate.save(str(output_file))
+
+    def _measure_audio_duration(self, audio_file: Path) -> Optional[float]:
         """
-        Measure audio file duration with FFmpeg.
+        Measure audio file duration.
+
+        MP3 headers are parsed in-process; FFmpeg is only run for files
+        the parser (and mutagen, if installed) cannot read.
 
         Args:
             audio_file: Path to audio file
 
         Returns:
-            Duration in seconds
+            Duration in seconds, or None if no method could read it
         """
+        duration = probe_duration(audio_file)
+        if duration is not None:
+            return duration
+
         try:
             cmd = [
                 config.ffmpeg_path,
-                "-i", str(audio_file),
-                "-f", "null",
-                "-"
+                "-i", str(audio_file)
             ]
 
             result = subprocess.run(
@@ -284,21 +374,7 @@ class UnifiedAudioGenerator:
             )
 
             # Parse duration from FFmpeg output
-            for line in result.stderr.split('\n'):
-                if 'Duration:' in line:
-                    try:
-                        time_str = line.split('Duration:')[1].split(',')[0].strip()
-                        parts = time_str.split(':')
-                        if len(parts) != 3:
-                            continue
-                        h, m, s = parts
-                        duration = int(h) * 3600 + int(m) * 60 + float(s)
-                        return duration
-                    except (ValueError, IndexError) as e:
-                        self.logger.warning(f"Failed to parse duration from line: {line}")
-
-            # Fallback: estimate from file size
-            return self._estimate_duration_from_filesize(audio_file)
+            return parse_ffmpeg_duration(result.stderr)
 
         except Exception as e:
             raise AudioGenerationError(
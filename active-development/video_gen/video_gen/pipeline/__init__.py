@@ -6,8 +6,11 @@ Complete pipeline orchestration system.
 
 from .orchestrator import PipelineOrchestrator
 from .stage import Stage, StageResult
-from .state_manager import StateManager, TaskState, TaskStatus
-from .events import EventEmitter, Event, EventType
+from .state_manager import StateManager, StateWriter, TaskState, TaskStatus
+from .state_backends import StateBackend, JSONStateBackend, SQLiteStateBackend
+from .events import EventEmitter, Event, EventType, TaskEventBroker
+from .job_queue import Job, JobQueue
+from .stage_cache import StageCache
 from .complete_pipeline import create_complete_pipeline, get_pipeline
 
 __all__ = [
@@ -15,11 +18,19 @@ __all__ = [
     "Stage",
     "StageResult",
     "StateManager",
+    "StateWriter",
     "TaskState",
     "TaskStatus",
+    "StateBackend",
+    "JSONStateBackend",
+    "SQLiteStateBackend",
     "EventEmitter",
     "Event",
     "EventType",
+    "TaskEventBroker",
+    "Job",
+    "JobQueue",
+    "StageCache",
     "create_complete_pipeline",
     "get_pipeline",
 ]
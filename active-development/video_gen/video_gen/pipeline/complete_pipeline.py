@@ -47,6 +47,10 @@ def create_complete_pipeline(
         event_emitter=event_emitter
     )
 
+    # Stages share the orchestrator's emitter (the global one when none is
+    # given) so their progress events reach the same listeners
+    event_emitter = orchestrator.event_emitter
+
     # Register all stages in order
     orchestrator.register_stages([
         InputStage(event_emitter),
@@ -3,10 +3,13 @@ Event system for progress tracking and real-time updates.
 """
 
 import asyncio
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +21,7 @@ class EventType(Enum):
     PIPELINE_STARTED = "pipeline.started"
     PIPELINE_COMPLETED = "pipeline.completed"
     PIPELINE_FAILED = "pipeline.failed"
+    PIPELINE_CANCELLED = "pipeline.cancelled"
 
     STAGE_STARTED = "stage.started"
     STAGE_PROGRESS = "stage.progress"
@@ -73,15 +77,208 @@ class Event:
         return " ".join(parts)
 
 
+# Dispatch modes
+DISPATCH_INLINE = "inline"  # emit() awaits every listener in turn
+DISPATCH_QUEUED = "queued"  # emit() enqueues; each listener has its own worker
+
+# What queued dispatch does with STAGE_PROGRESS events
+PROGRESS_COALESCE = "coalesce"  # Replace a queued update for the same task/stage
+PROGRESS_DROP = "drop"          # Drop new updates while the queue is full
+PROGRESS_KEEP = "keep"          # Queue every update (oldest dropped when full)
+
+
+class _ListenerWorker:
+    """
+    Bounded queue plus worker task delivering events to one listener.
+
+    Only STAGE_PROGRESS events are ever dropped or coalesced: other
+    events are state transitions, so when the queue is full the oldest
+    queued progress update is evicted to make room for them (and the
+    queue exceeds its bound only if it holds nothing but transitions).
+    """
+
+    def __init__(
+        self,
+        callback: Callable,
+        is_async: bool,
+        event_type: Optional[EventType],
+        max_queue: int,
+        progress_policy: str
+    ):
+        self.callback = callback
+        self.is_async = is_async
+        self.event_type = event_type
+        self.max_queue = max(1, max_queue)
+        self.progress_policy = progress_policy
+        self.name = getattr(callback, "__qualname__", repr(callback))
+
+        # Items are (coalesce key, event, enqueued at); coalesced progress
+        # updates are queued as (key, None, None) with the latest one in
+        # _latest, so newer updates replace it without moving in the queue
+        self._items: Deque[Tuple[Optional[tuple], Optional[Event], Optional[float]]] = deque()
+        self._latest: Dict[tuple, Tuple[Event, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._busy = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def accepts(self, event: Event) -> bool:
+        return self.event_type is None or event.type == self.event_type
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start the worker in ``loop`` (restarting it if the loop changed)."""
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        if self._items:
+            self._wakeup.set()
+        else:
+            self._idle.set()
+        self._task = loop.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def offer(self, event: Event):
+        """Queue an event without blocking."""
+        now = time.monotonic()
+        progress = event.type == EventType.STAGE_PROGRESS
+        key = (event.task_id, event.stage) if progress else None
+
+        if progress and self.progress_policy == PROGRESS_COALESCE and key in self._latest:
+            # Keep the original enqueue time so latency reflects the wait
+            self._latest[key] = (event, self._latest[key][1])
+            self.coalesced += 1
+            return
+
+        if len(self._items) >= self.max_queue:
+            if progress and self.progress_policy == PROGRESS_DROP:
+                self.dropped += 1
+                return
+            if not self._evict_progress() and progress:
+                self.dropped += 1
+                return
+
+        if progress and self.progress_policy == PROGRESS_COALESCE:
+            self._items.append((key, None, None))
+            self._latest[key] = (event, now)
+        else:
+            self._items.append((None, event, now))
+
+        self.max_depth = max(self.max_depth, len(self._items))
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def flush(self):
+        """Wait until every queued event has been delivered."""
+        if self._idle is not None and (self._items or self._busy):
+            await self._idle.wait()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "listener": self.name,
+            "event_type": self.event_type.value if self.event_type else None,
+            "queue_depth": len(self._items),
+            "max_queue_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "avg_latency": self.total_latency / self.delivered if self.delivered else 0.0,
+            "max_latency": self.max_latency,
+        }
+
+    def _evict_progress(self) -> bool:
+        # Drop the oldest queued progress update to make room
+        for index, (key, event, _) in enumerate(self._items):
+            if key is not None or event.type == EventType.STAGE_PROGRESS:
+                del self._items[index]
+                if key is not None:
+                    self._latest.pop(key, None)
+                self.dropped += 1
+                return True
+        return False
+
+    async def _run(self):
+        while True:
+            if not self._items:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            key, event, enqueued_at = self._items.popleft()
+            if key is not None:
+                event, enqueued_at = self._latest.pop(key)
+
+            self._busy = True
+            try:
+                if self.is_async:
+                    await self.callback(event)
+                else:
+                    self.callback(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error in event listener {self.name}: {e}", exc_info=True)
+            finally:
+                self._busy = False
+
+            latency = time.monotonic() - enqueued_at
+            self.delivered += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+
 class EventEmitter:
     """
     Event emitter for broadcasting pipeline events.
 
     Supports both synchronous and asynchronous listeners.
     Thread-safe for concurrent operations.
+
+    Dispatch modes:
+    - inline (default): emit() calls every listener in turn and returns
+      once all of them have handled the event.
+    - queued: emit() only enqueues. Each listener gets its own bounded
+      queue and worker task, so a slow listener (webhook, DB writer)
+      delays only itself, never the stages emitting events. Events reach
+      each listener in emit order; high-frequency STAGE_PROGRESS events
+      are dropped or coalesced per ``progress_policy`` when a listener
+      falls behind. Use flush() to wait for delivery and metrics() for
+      queue depth and listener latency.
+
+    Args:
+        dispatch: "inline" or "queued"
+        max_queue: Per-listener queue bound (queued dispatch)
+        progress_policy: "coalesce", "drop" or "keep" (queued dispatch)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        dispatch: str = DISPATCH_INLINE,
+        max_queue: int = 1000,
+        progress_policy: str = PROGRESS_COALESCE
+    ):
+        if dispatch not in (DISPATCH_INLINE, DISPATCH_QUEUED):
+            raise ValueError(f"Unknown dispatch mode: {dispatch}")
+        if progress_policy not in (PROGRESS_COALESCE, PROGRESS_DROP, PROGRESS_KEEP):
+            raise ValueError(f"Unknown progress policy: {progress_policy}")
+
         self._listeners: Dict[EventType, List[Callable]] = {}
         self._async_listeners: Dict[EventType, List[Callable]] = {}
         self._global_listeners: List[Callable] = []
@@ -89,6 +286,13 @@ class EventEmitter:
         self._lock = asyncio.Lock()
         self._enabled = True
 
+        self.dispatch = dispatch
+        self.max_queue = max_queue
+        self.progress_policy = progress_policy
+        self._workers: List[_ListenerWorker] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: set = set()  # emit_sync tasks (kept referenced until done)
+
     def on(self, event_type: EventType, callback: Callable):
         """
         Register a synchronous event listener.
@@ -100,6 +304,7 @@ class EventEmitter:
         if event_type not in self._listeners:
             self._listeners[event_type] = []
         self._listeners[event_type].append(callback)
+        self._add_worker(callback, False, event_type)
 
     def on_async(self, event_type: EventType, callback: Callable):
         """
@@ -112,14 +317,25 @@ class EventEmitter:
         if event_type not in self._async_listeners:
             self._async_listeners[event_type] = []
         self._async_listeners[event_type].append(callback)
+        self._add_worker(callback, True, event_type)
 
     def on_all(self, callback: Callable):
         """Register a global listener for all events."""
         self._global_listeners.append(callback)
+        self._add_worker(callback, False, None)
 
     def on_all_async(self, callback: Callable):
         """Register an async global listener for all events."""
         self._async_global_listeners.append(callback)
+        self._add_worker(callback, True, None)
+
+    def off_all(self, callback: Callable):
+        """Unregister a global listener."""
+        self._global_listeners = [cb for cb in self._global_listeners if cb != callback]
+        self._async_global_listeners = [
+            cb for cb in self._async_global_listeners if cb != callback
+        ]
+        self._remove_workers(callback, None)
 
     def off(self, event_type: EventType, callback: Callable):
         """Unregister an event listener."""
@@ -131,6 +347,7 @@ class EventEmitter:
             self._async_listeners[event_type] = [
                 cb for cb in self._async_listeners[event_type] if cb != callback
             ]
+        self._remove_workers(callback, event_type)
 
     async def emit(self, event: Event):
         """
@@ -142,6 +359,19 @@ class EventEmitter:
         if not self._enabled:
             return
 
+        self._loop = asyncio.get_running_loop()
+
+        if self.dispatch == DISPATCH_QUEUED:
+            logger.debug(f"Event queued: {event}")
+            for worker in self._workers:
+                if worker.accepts(event):
+                    worker.start(self._loop)
+                    worker.offer(event)
+            return
+
+        await self._emit_inline(event)
+
+    async def _emit_inline(self, event: Event):
         async with self._lock:
             # Log event
             logger.debug(f"Event emitted: {event}")
@@ -175,16 +405,51 @@ class EventEmitter:
                         logger.error(f"Error in async event listener: {e}", exc_info=True)
 
     def emit_sync(self, event: Event):
-        """Synchronous emit (creates event loop if needed)."""
+        """
+        Emit from synchronous code.
+
+        Inside a running event loop the emit is scheduled as a task. From
+        another thread it is handed to the loop the emitter last ran in.
+        Only when no loop exists at all are listeners called inline in a
+        temporary loop.
+        """
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self.emit(event))
-            else:
-                loop.run_until_complete(self.emit(event))
+            loop = asyncio.get_running_loop()
         except RuntimeError:
-            # No event loop available
-            asyncio.run(self.emit(event))
+            loop = None
+
+        if loop is not None:
+            task = loop.create_task(self.emit(event))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        elif self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.emit(event), self._loop)
+        elif self._enabled:
+            # Queued workers would die with a temporary loop, so deliver inline
+            asyncio.run(self._emit_inline(event))
+
+    async def flush(self):
+        """Wait until queued events have reached every listener."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        await asyncio.gather(*(worker.flush() for worker in self._workers))
+
+    async def aclose(self):
+        """Deliver queued events, then stop the listener workers."""
+        await self.flush()
+        for worker in self._workers:
+            worker.stop()
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """
+        Per-listener dispatch metrics (queued dispatch).
+
+        Returns:
+            One dict per listener with queue depth (current and max),
+            delivered/dropped/coalesced/error counts and delivery latency
+            (seconds from emit to handler completion, average and max)
+        """
+        return [worker.metrics() for worker in self._workers]
 
     def enable(self):
         """Enable event emission."""
@@ -200,6 +465,128 @@ class EventEmitter:
         self._async_listeners.clear()
         self._global_listeners.clear()
         self._async_global_listeners.clear()
+        for worker in self._workers:
+            worker.stop()
+        self._workers.clear()
+
+    def _add_worker(self, callback: Callable, is_async: bool, event_type: Optional[EventType]):
+        if self.dispatch == DISPATCH_QUEUED:
+            self._workers.append(_ListenerWorker(
+                callback, is_async, event_type, self.max_queue, self.progress_policy
+            ))
+
+    def _remove_workers(self, callback: Callable, event_type: Optional[EventType]):
+        for worker in [w for w in self._workers
+                       if w.callback == callback and w.event_type == event_type]:
+            worker.stop()
+            self._workers.remove(worker)
+
+
+class TaskEventBroker:
+    """
+    Fans emitted events out to per-task subscriber queues.
+
+    Used to push pipeline progress to streaming clients (e.g. SSE) as it
+    happens instead of having each client poll the task state file.
+
+    Every subscriber gets its own bounded queue, so a slow consumer can
+    never block the pipeline: publishing never waits, and when a queue
+    is full the oldest progress update is dropped to make room (the
+    oldest event of any type only if no progress update is queued).
+    Stage and pipeline transitions therefore still reach the client.
+    """
+
+    def __init__(self, max_backlog: int = 100):
+        self.max_backlog = max(1, max_backlog)
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._loops: Dict[int, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def attach(self, emitter: "EventEmitter"):
+        """Start receiving every event emitted by ``emitter``."""
+        emitter.on_all(self.publish)
+
+    def detach(self, emitter: "EventEmitter"):
+        """Stop receiving events from ``emitter``."""
+        emitter.off_all(self.publish)
+
+    def subscribe(self, task_id: str) -> asyncio.Queue:
+        """
+        Register a subscriber for a task's events.
+
+        Must be called from the event loop that will consume the queue.
+        Always pair with unsubscribe() (e.g. in a ``finally`` block).
+
+        Returns:
+            Queue receiving the task's Event objects
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_backlog)
+        with self._lock:
+            self._subscribers.setdefault(task_id, []).append(queue)
+            self._loops[id(queue)] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, task_id: str, queue: asyncio.Queue):
+        """Remove a subscriber queue returned by subscribe()."""
+        with self._lock:
+            queues = self._subscribers.get(task_id, [])
+            if queue in queues:
+                queues.remove(queue)
+            if not queues:
+                self._subscribers.pop(task_id, None)
+            self._loops.pop(id(queue), None)
+
+    def subscriber_count(self, task_id: Optional[str] = None) -> int:
+        """Number of subscribers for one task, or for all tasks."""
+        with self._lock:
+            if task_id is not None:
+                return len(self._subscribers.get(task_id, []))
+            return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, event: Event):
+        """Deliver an event to its task's subscribers without blocking."""
+        with self._lock:
+            targets = [
+                (queue, self._loops.get(id(queue)))
+                for queue in self._subscribers.get(event.task_id, [])
+            ]
+        if not targets:
+            return
+
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for queue, loop in targets:
+            if loop is None or loop is current_loop:
+                self._offer(queue, event)
+            elif not loop.is_closed():
+                # asyncio queues are not thread-safe; hand over to their loop
+                loop.call_soon_threadsafe(self._offer, queue, event)
+
+    def _offer(self, queue: asyncio.Queue, event: Event):
+        if queue.full():
+            self._make_room(queue)
+        queue.put_nowait(event)
+
+    def _make_room(self, queue: asyncio.Queue):
+        # asyncio.Queue has no API for removing an arbitrary item, so drain
+        # it, drop one event and put the rest back in order
+        pending = []
+        while not queue.empty():
+            pending.append(queue.get_nowait())
+
+        victim = next(
+            (i for i, e in enumerate(pending) if e.type == EventType.STAGE_PROGRESS),
+            0
+        )
+        del pending[victim]
+        self.dropped += 1
+
+        for item in pending:
+            queue.put_nowait(item)
 
 
 # Global event emitter instance
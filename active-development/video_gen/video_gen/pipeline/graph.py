@@ -0,0 +1,80 @@
+"""
+Stage dependency graph.
+
+Turns the ``inputs``/``outputs``/``prepare_inputs`` declarations of an
+ordered list of stages into a dependency graph the orchestrator can run
+concurrently. Registration order stays authoritative: a stage only ever
+depends on stages registered before it, and reads each key from the
+latest earlier stage that produces it.
+"""
+
+from typing import Dict, List, Sequence, Set, Tuple
+
+from .stage import Stage
+
+# Node kinds
+RUN = "run"
+PREPARE = "prepare"
+
+# (stage name, kind)
+Node = Tuple[str, str]
+
+
+def build_stage_graph(stages: Sequence[Stage]) -> Dict[Node, Set[Node]]:
+    """
+    Build the dependency graph of a list of stages.
+
+    Rules:
+    - A stage depends on the latest earlier stage producing each of its
+      inputs (keys nobody produces come from the initial context).
+    - A stage also depends on earlier stages producing the same outputs,
+      so writes to a key keep their registration order.
+    - A stage with undeclared inputs or outputs depends on every earlier
+      stage, and every later stage depends on it.
+    - A stage's prepare node follows the same rules for ``prepare_inputs``
+      and the stage depends on its own prepare node.
+
+    Args:
+        stages: Stages in registration order
+
+    Returns:
+        Mapping of node to the nodes it depends on, in execution order
+    """
+    graph: Dict[Node, Set[Node]] = {}
+    providers: Dict[str, Node] = {}
+    earlier: List[Node] = []
+    barrier = None
+
+    def inputs_deps(keys) -> Set[Node]:
+        deps = {providers[key] for key in keys if key in providers}
+        if barrier is not None:
+            deps.add(barrier)
+        return deps
+
+    for stage in stages:
+        run = (stage.name, RUN)
+
+        if stage.inputs is None or stage.outputs is None:
+            deps = set(earlier)
+        else:
+            deps = inputs_deps(stage.inputs)
+            deps |= {providers[key] for key in stage.outputs if key in providers}
+
+        if stage.prepare_inputs is not None:
+            prepare = (stage.name, PREPARE)
+            graph[prepare] = inputs_deps(stage.prepare_inputs)
+            deps.add(prepare)
+
+        graph[run] = deps
+
+        if stage.outputs is None:
+            barrier = run
+        else:
+            for key in stage.outputs:
+                providers[key] = run
+        earlier.append(run)
+
+    return graph
+
+
+__all__ = ['build_stage_graph', 'RUN', 'PREPARE']
@@ -0,0 +1,367 @@
+"""
+Job queue for pipeline executions.
+
+Bounds how many pipelines run at once in a process. Jobs wait in a queue
+with three priority levels; within a level, submitters take turns (round
+robin), so one client submitting 50 videos cannot starve the others.
+
+The queue itself is bounded: once ``max_queued`` jobs are waiting,
+submit() raises QueueFullError with a Retry-After estimate (HTTP 429 for
+the web API). Waiting and running jobs are persisted, so after a restart
+start() re-queues them; interrupted jobs resume from their last
+completed stage.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from .state_manager import TaskState, TaskStatus
+from ..shared.config import config
+from ..shared.exceptions import QueueFullError, TaskCancelledError
+from ..shared.models import InputConfig
+
+logger = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+# Assumed job duration until real ones have been measured (seconds)
+DEFAULT_JOB_SECONDS = 60.0
+
+
+@dataclass
+class Job:
+    """A queued pipeline execution."""
+
+    task_id: str
+    input_config: InputConfig
+    priority: str = "normal"
+    submitter: str = "anonymous"
+    submitted_at: datetime = field(default_factory=datetime.now)
+    resume: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for persistence."""
+        input_config = asdict(self.input_config)
+        if input_config.get("output_dir") is not None:
+            input_config["output_dir"] = str(input_config["output_dir"])
+        return {
+            "task_id": self.task_id,
+            "input_config": input_config,
+            "priority": self.priority,
+            "submitter": self.submitter,
+            "submitted_at": self.submitted_at.isoformat(),
+            "resume": self.resume,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Job':
+        """Create from dictionary."""
+        input_config = dict(data["input_config"])
+        if input_config.get("output_dir") is not None:
+            input_config["output_dir"] = Path(input_config["output_dir"])
+        return cls(
+            task_id=data["task_id"],
+            input_config=InputConfig(**input_config),
+            priority=data.get("priority", "normal"),
+            submitter=data.get("submitter", "anonymous"),
+            submitted_at=datetime.fromisoformat(data["submitted_at"]),
+            resume=data.get("resume", False),
+        )
+
+
+class JobQueue:
+    """
+    Prioritized, fair, bounded job queue with a fixed number of worker slots.
+
+    Args:
+        orchestrator: PipelineOrchestrator that executes the jobs
+        workers: Pipelines run at once (default: config.job_workers)
+        max_queued: Jobs allowed to wait (default: config.job_queue_max)
+        persist_path: File holding waiting/running jobs (default:
+            ``queue/jobs.json`` in the state directory; False disables)
+    """
+
+    def __init__(
+        self,
+        orchestrator: Any,
+        workers: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        persist_path: Union[Path, bool, None] = None
+    ):
+        self.orchestrator = orchestrator
+        self.workers = max(1, workers if workers is not None else config.job_workers)
+        self.max_queued = max(0, max_queued if max_queued is not None else config.job_queue_max)
+        if persist_path is None:
+            # Kept in a subdirectory so JSON state listings don't pick it up
+            persist_path = orchestrator.state_manager.state_dir / "queue" / "jobs.json"
+        self.persist_path = Path(persist_path) if persist_path else None
+
+        # priority -> submitter -> jobs; submitters rotate after each dispatch
+        self._queues: Dict[int, "OrderedDict[str, Deque[Job]]"] = {
+            level: OrderedDict() for level in sorted(PRIORITIES.values())
+        }
+        self._queued: Dict[str, Job] = {}
+        self._running: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._durations: Deque[float] = deque(maxlen=20)
+        self._started = False
+
+    @property
+    def queued(self) -> int:
+        """Number of waiting jobs."""
+        return len(self._queued)
+
+    @property
+    def running(self) -> int:
+        """Number of running jobs."""
+        return len(self._running)
+
+    def start(self):
+        """Re-queue persisted jobs and start dispatching (needs a running loop)."""
+        if self._started:
+            return
+        self._started = True
+
+        for job in self._load_persisted():
+            if job.task_id in self._queued or job.task_id in self._running:
+                continue
+            # Interrupted jobs resume from their last completed stage
+            if self.orchestrator.state_manager.exists(job.task_id):
+                task_state = self.orchestrator.state_manager.load(job.task_id)
+                if task_state.status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
+                    continue
+                job.resume = True
+            self._enqueue(job)
+            logger.info(f"Recovered queued job: {job.task_id}")
+
+        self._dispatch()
+
+    async def stop(self):
+        """
+        Stop running jobs without forgetting them.
+
+        Jobs stay in the persisted queue and are resumed by the next start().
+        """
+        self._started = False
+        self._reap_orphans()
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Interrupted jobs go back in the queue, to resume on the next start
+        interrupted = list(self._running.values())
+        self._running.clear()
+        for job in interrupted:
+            job.resume = True
+            self._enqueue(job)
+
+    def submit(
+        self,
+        input_config: InputConfig,
+        task_id: str,
+        priority: str = "normal",
+        submitter: str = "anonymous"
+    ) -> Job:
+        """
+        Queue a pipeline execution.
+
+        Args:
+            input_config: Pipeline input
+            task_id: Task ID for tracking
+            priority: "high", "normal" or "low"
+            submitter: Client identity used for fair scheduling
+
+        Returns:
+            The queued Job
+
+        Raises:
+            ValueError: Unknown priority
+            QueueFullError: Too many jobs waiting (carries retry_after)
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+
+        if len(self._queued) >= self.max_queued and len(self._running) >= self.workers:
+            retry_after = self.retry_after()
+            raise QueueFullError(
+                f"Job queue is full ({len(self._queued)} waiting)",
+                retry_after=retry_after,
+                details={"queued": len(self._queued), "running": len(self._running)}
+            )
+
+        job = Job(task_id=task_id, input_config=input_config, priority=priority, submitter=submitter)
+
+        # Make the task visible to status endpoints while it waits
+        if not self.orchestrator.state_manager.exists(task_id):
+            self.orchestrator.state_manager.save(TaskState(
+                task_id=task_id,
+                input_config=input_config.to_dict(),
+                status=TaskStatus.PENDING,
+            ))
+
+        self._enqueue(job)
+        logger.info(
+            f"Job queued: {task_id} (priority={priority}, submitter={submitter}, "
+            f"waiting={len(self._queued)}, running={len(self._running)})"
+        )
+
+        if self._started:
+            self._dispatch()
+        else:
+            self.start()
+        return job
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Remove a waiting job from the queue.
+
+        Running jobs are stopped through PipelineOrchestrator.cancel().
+
+        Returns:
+            False if the job was not waiting
+        """
+        # Its entry in the per-submitter queue is skipped by _next_job()
+        if self._queued.pop(task_id, None) is None:
+            return False
+        self._persist()
+        logger.info(f"Job removed from queue: {task_id}")
+        return True
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up."""
+        average = (
+            sum(self._durations) / len(self._durations)
+            if self._durations else DEFAULT_JOB_SECONDS
+        )
+        # Jobs ahead of a new one finish in waves of `workers`
+        waves = (len(self._queued) + 1) / self.workers
+        return max(1, min(3600, math.ceil(average * waves)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and worker usage."""
+        by_priority = {name: 0 for name in PRIORITIES}
+        for job in self._queued.values():
+            by_priority[job.priority] = by_priority.get(job.priority, 0) + 1
+        return {
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": len(self._queued),
+            "max_queued": self.max_queued,
+            "queued_by_priority": by_priority,
+            "retry_after": self.retry_after(),
+        }
+
+    def _enqueue(self, job: Job):
+        level = PRIORITIES.get(job.priority, PRIORITIES["normal"])
+        self._queues[level].setdefault(job.submitter, deque()).append(job)
+        self._queued[job.task_id] = job
+        self._persist()
+
+    def _next_job(self) -> Optional[Job]:
+        for submitters in self._queues.values():
+            while submitters:
+                submitter, jobs = next(iter(submitters.items()))
+                job = jobs.popleft()
+                # Round robin: the submitter goes to the back of its level
+                del submitters[submitter]
+                if jobs:
+                    submitters[submitter] = jobs
+                if self._queued.pop(job.task_id, None) is not None:
+                    return job
+        return None
+
+    def _dispatch(self):
+        if not self._started:
+            return
+        self._reap_orphans()
+        while len(self._running) < self.workers:
+            job = self._next_job()
+            if job is None:
+                break
+            self._running[job.task_id] = job
+            self._tasks[job.task_id] = asyncio.get_running_loop().create_task(self._run(job))
+        self._persist()
+
+    def _reap_orphans(self):
+        # A task whose event loop has closed will never finish; requeue its
+        # job instead of letting it hold a worker slot forever
+        for task_id, task in list(self._tasks.items()):
+            if task.get_loop().is_closed():
+                del self._tasks[task_id]
+                job = self._running.pop(task_id, None)
+                if job is not None:
+                    job.resume = True
+                    self._enqueue(job)
+
+    async def _run(self, job: Job):
+        start = time.monotonic()
+        interrupted = False
+        try:
+            await self.orchestrator.execute(job.input_config, task_id=job.task_id, resume=job.resume)
+        except asyncio.CancelledError:
+            # stop() interrupts jobs to resume them later; otherwise the task
+            # itself was cancelled (PipelineOrchestrator.cancel)
+            interrupted = not self._started
+            raise
+        except TaskCancelledError:
+            logger.info(f"Job {job.task_id} cancelled")
+        except Exception as e:
+            # The orchestrator has already persisted the failure
+            logger.error(f"Job {job.task_id} failed: {e}")
+        finally:
+            self._tasks.pop(job.task_id, None)
+            if not interrupted:
+                self._running.pop(job.task_id, None)
+                self._durations.append(time.monotonic() - start)
+                self._dispatch()
+
+    def _persist(self):
+        if self.persist_path is None:
+            return
+        jobs = [job.to_dict() for job in self._running.values()]
+        jobs += [job.to_dict() for job in self._queued.values()]
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.persist_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump({"jobs": jobs}, f)
+                os.replace(tmp_name, self.persist_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist job queue: {e}")
+
+    def _load_persisted(self) -> List[Job]:
+        if self.persist_path is None or not self.persist_path.exists():
+            return []
+        try:
+            data = json.loads(self.persist_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable job queue file {self.persist_path}: {e}")
+            return []
+
+        jobs = []
+        for item in data.get("jobs", []):
+            try:
+                jobs.append(Job.from_dict(item))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping unreadable queued job: {e}")
+        return jobs
+
+
+__all__ = ['Job', 'JobQueue', 'PRIORITIES']
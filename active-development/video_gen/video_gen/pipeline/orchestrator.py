@@ -15,14 +15,19 @@ import logging
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 
 from .stage import Stage, StageResult
-from .state_manager import StateManager, TaskState, TaskStatus
+from .graph import build_stage_graph, Node, PREPARE, RUN
+from .job_queue import JobQueue
+from .stage_cache import StageCache
+from .state_manager import StateManager, StateWriter, TaskState, TaskStatus
 from .events import EventEmitter, Event, EventType, event_emitter as default_event_emitter
 from ..shared.models import InputConfig, PipelineResult
+from ..shared.cancellation import CancellationToken, cancellation_scope
 from ..shared.config import config
-from ..shared.exceptions import VideoGenError
+from ..shared.exceptions import TaskCancelledError, VideoGenError
+from ..shared.metrics import registry
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +38,8 @@ class PipelineOrchestrator:
 
     Features:
     - Automatic progression through all stages
-    - State persistence after each stage
+    - Concurrent execution of stages whose inputs are ready
+    - Coalesced (write-behind) state persistence, flushed at stage boundaries
     - Resume capability from failures
     - Progress tracking and event emission
     - Error recovery and retry logic
@@ -43,12 +49,21 @@ class PipelineOrchestrator:
     def __init__(
         self,
         state_manager: Optional[StateManager] = None,
-        event_emitter: Optional[EventEmitter] = None
+        event_emitter: Optional[EventEmitter] = None,
+        stage_cache: Optional[StageCache] = None
     ):
         self.state_manager = state_manager or StateManager()
         self.event_emitter = event_emitter or default_event_emitter
+        if stage_cache is None:
+            stage_cache = StageCache(
+                config.cache_dir / "stages" if config.stage_cache_enabled else None
+            )
+        self.stage_cache = stage_cache
         self.stages: List[Stage] = []
         self.stage_map: Dict[str, Stage] = {}
+        self._job_queue: Optional[JobQueue] = None
+        # Executing tasks: task_id -> (asyncio task, cancellation token)
+        self._active: Dict[str, Tuple[Optional[asyncio.Task], CancellationToken]] = {}
 
         logger.info("Pipeline orchestrator initialized")
 
@@ -94,6 +109,23 @@ class PipelineOrchestrator:
         if task_id is None:
             task_id = f"task_{uuid.uuid4().hex[:12]}"
 
+        # cancel() uses the token to stop stages (including their worker
+        # threads and FFmpeg children) and the task to interrupt awaits
+        cancel_token = CancellationToken(task_id)
+        self._active[task_id] = (asyncio.current_task(), cancel_token)
+        try:
+            with cancellation_scope(cancel_token):
+                return await self._execute(input_config, task_id, resume, cancel_token)
+        finally:
+            self._active.pop(task_id, None)
+
+    async def _execute(
+        self,
+        input_config: InputConfig,
+        task_id: str,
+        resume: bool,
+        cancel_token: CancellationToken
+    ) -> PipelineResult:
         logger.info(f"Starting pipeline execution: {task_id}")
         start_time = datetime.now()
 
@@ -115,8 +147,10 @@ class PipelineOrchestrator:
         for stage in self.stages:
             task_state.add_stage(stage.name)
 
-        # Save initial state
-        self.state_manager.save(task_state)
+        # Save initial state; later changes are coalesced and written at
+        # least at every stage boundary and on failure
+        state_writer = StateWriter(self.state_manager, task_state)
+        state_writer.save()
 
         # Emit start event
         await self.event_emitter.emit(Event(
@@ -145,50 +179,13 @@ class PipelineOrchestrator:
                 except (ValueError, KeyError):
                     logger.warning(f"Could not find stage {last_completed}, starting from beginning")
 
-        # Execute stages
-        all_results: List[StageResult] = []
-        pipeline_success = True
-
         try:
-            for i, stage in enumerate(self.stages[start_index:], start=start_index):
-                logger.info(f"Executing stage {i+1}/{len(self.stages)}: {stage.name}")
-
-                # Update state
-                task_state.start_stage(stage.name)
-                self.state_manager.save(task_state)
-
-                # Execute stage
-                result = await stage.run(context, task_id)
-                all_results.append(result)
-
-                if not result.success:
-                    pipeline_success = False
-                    task_state.fail_stage(stage.name, result.error)
-                    self.state_manager.save(task_state)
-
-                    logger.error(f"Stage {stage.name} failed: {result.error}")
-
-                    # Check if we should continue or abort
-                    if self._should_abort_on_failure(stage.name):
-                        logger.error("Aborting pipeline due to critical failure")
-                        break
-                    else:
-                        logger.warning("Continuing pipeline despite failure")
-                        continue
-
-                # Stage succeeded - update context and state
-                context.update(result.artifacts)
-                task_state.complete_stage(stage.name, {
-                    k: str(v) if isinstance(v, Path) else str(v)
-                    for k, v in result.artifacts.items()
-                })
-                task_state.warnings.extend(result.warnings)
-                self.state_manager.save(task_state)
-
-                logger.info(
-                    f"Stage {stage.name} completed successfully "
-                    f"({result.duration:.2f}s)"
-                )
+            # Execute stages (independent ones concurrently)
+            all_results, pipeline_success = await self._execute_stage_graph(
+                self.stages[start_index:], context, task_id, task_state, state_writer
+            )
+            # A cancelled stage reports a plain failure
+            cancel_token.raise_if_cancelled()
 
             # Pipeline completed
             end_time = datetime.now()
@@ -210,7 +207,7 @@ class PipelineOrchestrator:
             )
 
             task_state.result = result.to_dict()
-            self.state_manager.save(task_state)
+            state_writer.save()
 
             # Emit completion event
             await self.event_emitter.emit(Event(
@@ -232,6 +229,24 @@ class PipelineOrchestrator:
 
             return result
 
+        except (asyncio.CancelledError, TaskCancelledError):
+            if cancel_token.cancelled:
+                task_state.status = TaskStatus.CANCELLED
+                task_state.completed_at = datetime.now()
+                state_writer.save()
+
+                await self.event_emitter.emit(Event(
+                    type=EventType.PIPELINE_CANCELLED,
+                    task_id=task_id,
+                    message="Pipeline cancelled",
+                    data={"stages_completed": len(task_state.get_completed_stages())}
+                ))
+                logger.info(f"Pipeline cancelled: {task_id}")
+            else:
+                # Interrupted (e.g. shutdown): keep the state resumable
+                state_writer.save()
+            raise
+
         except Exception as e:
             # Unexpected error
             error_msg = f"Pipeline execution failed: {e}"
@@ -239,7 +254,7 @@ class PipelineOrchestrator:
 
             task_state.status = TaskStatus.FAILED
             task_state.errors.append(error_msg)
-            self.state_manager.save(task_state)
+            state_writer.save()
 
             # Emit failure event
             await self.event_emitter.emit(Event(
@@ -258,6 +273,10 @@ class PipelineOrchestrator:
                 }
             )
 
+        finally:
+            # Don't leave a deferred write behind (e.g. on cancellation)
+            state_writer.close()
+
     def execute_sync(
         self,
         input_config: InputConfig,
@@ -277,39 +296,43 @@ class PipelineOrchestrator:
         """
         return asyncio.run(self.execute(input_config, task_id, resume))
 
+    @property
+    def job_queue(self) -> JobQueue:
+        """Queue that execute_async() submits to (created on first use)."""
+        if self._job_queue is None:
+            self._job_queue = JobQueue(self)
+        return self._job_queue
+
     async def execute_async(
         self,
         input_config: InputConfig,
-        task_id: Optional[str] = None
+        task_id: Optional[str] = None,
+        priority: str = "normal",
+        submitter: str = "anonymous"
     ) -> str:
         """
         Execute pipeline asynchronously in background.
 
-        Returns task_id immediately and executes in background.
+        Returns task_id immediately. The task waits in the job queue until
+        a worker slot is free, so only config.job_workers pipelines run at
+        once.
 
         Args:
             input_config: Input configuration
             task_id: Optional task ID
+            priority: "high", "normal" or "low"
+            submitter: Client identity, for fair scheduling between clients
 
         Returns:
             Task ID for tracking
+
+        Raises:
+            QueueFullError: If the queue is full (see retry_after)
         """
         if task_id is None:
             task_id = f"task_{uuid.uuid4().hex[:12]}"
 
-        # Create and track background task
-        task = asyncio.create_task(self.execute(input_config, task_id))
-
-        # Store task for potential cancellation
-        if not hasattr(self, '_background_tasks'):
-            self._background_tasks = {}
-        self._background_tasks[task_id] = task
-
-        # Clean up completed tasks
-        def cleanup_callback(future):
-            self._background_tasks.pop(task_id, None)
-        task.add_done_callback(cleanup_callback)
-
+        self.job_queue.submit(input_config, task_id, priority=priority, submitter=submitter)
         return task_id
 
     def get_status(self, task_id: str) -> Optional[TaskState]:
@@ -328,7 +351,11 @@ class PipelineOrchestrator:
 
     def cancel(self, task_id: str) -> bool:
         """
-        Cancel a running task.
+        Cancel a queued or running task.
+
+        A queued task is removed from the job queue. A running task is
+        stopped: its asyncio task is cancelled, stages stop at the next
+        scene, FFmpeg child processes are killed and temp files removed.
 
         Args:
             task_id: Task ID to cancel
@@ -347,9 +374,171 @@ class PipelineOrchestrator:
         task_state.status = TaskStatus.CANCELLED
         self.state_manager.save(task_state)
 
+        if self._job_queue is not None:
+            self._job_queue.cancel(task_id)
+
+        active = self._active.get(task_id)
+        if active is not None:
+            task, cancel_token = active
+            # Kills child processes and stops worker threads between scenes
+            cancel_token.cancel()
+            if task is not None and not task.done():
+                task.get_loop().call_soon_threadsafe(task.cancel)
+
         logger.info(f"Task cancelled: {task_id}")
         return True
 
+    async def _execute_stage_graph(
+        self,
+        stages: List[Stage],
+        context: Dict[str, Any],
+        task_id: str,
+        task_state: TaskState,
+        state_writer: StateWriter
+    ) -> Tuple[List[StageResult], bool]:
+        """
+        Run stages as a dependency graph, starting every ready node at once.
+
+        Stages without dependency declarations form a chain, so pipelines
+        of such stages run exactly in registration order.
+
+        Returns:
+            (stage results in registration order, whether all succeeded)
+        """
+        graph = build_stage_graph(stages)
+        stage_by_name = {stage.name: stage for stage in stages}
+        position = {stage.name: self.stages.index(stage) + 1 for stage in stages}
+
+        pending = dict(graph)
+        done: Set[Node] = set()
+        running: Dict[asyncio.Task, Node] = {}
+        results: Dict[str, StageResult] = {}
+        success = True
+
+        async def run_node(node: Node):
+            name, kind = node
+            stage = stage_by_name[name]
+            if kind == PREPARE:
+                try:
+                    await stage.prepare(context)
+                except Exception as e:
+                    logger.warning(f"Prepare step of {name} failed (ignored): {e}")
+                return None
+            return await self._run_stage(stage, context, task_id)
+
+        try:
+            while pending or running:
+                for node, deps in list(pending.items()):
+                    if not deps <= done:
+                        continue
+                    del pending[node]
+                    name, kind = node
+                    if kind == RUN:
+                        logger.info(f"Executing stage {position[name]}/{len(self.stages)}: {name}")
+                        # Update state (deferred: the stage's outcome is written anyway)
+                        task_state.start_stage(name)
+                        state_writer.mark_dirty()
+                    running[asyncio.create_task(run_node(node))] = node
+
+                if not running:
+                    break
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    node = running.pop(task)
+                    done.add(node)
+                    name, kind = node
+                    if kind == PREPARE:
+                        continue
+
+                    result = task.result()
+                    results[name] = result
+
+                    if not result.success:
+                        success = False
+                        task_state.fail_stage(name, result.error, self._state_metadata(result))
+                        state_writer.save()
+
+                        logger.error(f"Stage {name} failed: {result.error}")
+
+                        # Check if we should continue or abort
+                        if self._should_abort_on_failure(name):
+                            logger.error("Aborting pipeline due to critical failure")
+                            # Let running stages finish, start nothing new
+                            pending.clear()
+                            for other, other_node in running.items():
+                                if other_node[1] == PREPARE:
+                                    other.cancel()
+                        else:
+                            logger.warning("Continuing pipeline despite failure")
+                        continue
+
+                    # Stage succeeded - update context and state
+                    context.update(result.artifacts)
+                    task_state.complete_stage(name, {
+                        k: str(v) if isinstance(v, Path) else str(v)
+                        for k, v in result.artifacts.items()
+                    }, self._state_metadata(result))
+                    task_state.warnings.extend(result.warnings)
+                    state_writer.save()
+
+                    logger.info(
+                        f"Stage {name} completed successfully "
+                        f"({result.duration:.2f}s)"
+                    )
+
+        finally:
+            # Unexpected error or cancellation: stop whatever is still running
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        ordered = [results[stage.name] for stage in stages if stage.name in results]
+        return ordered, success
+
+    async def _run_stage(self, stage: Stage, context: Dict[str, Any], task_id: str) -> StageResult:
+        """Run a stage, or reuse its cached result if its inputs are unchanged."""
+        fingerprint = None
+        if self.stage_cache.enabled and stage.cacheable:
+            try:
+                fingerprint = await asyncio.to_thread(stage.fingerprint, context)
+            except Exception as e:
+                logger.warning(f"Could not fingerprint {stage.name} (not cached): {e}")
+
+        if fingerprint is not None:
+            cached = await asyncio.to_thread(self.stage_cache.get, stage.name, fingerprint)
+            registry.counter(
+                "video_gen_stage_cache_lookups_total", "Stage cache lookups by result", ("stage", "result")
+            ).inc(stage=stage.name, result="miss" if cached is None else "hit")
+            if cached is not None:
+                logger.info(f"Reusing cached result of {stage.name} ({fingerprint[:12]})")
+                cached.duration = 0.0
+                cached.metadata["cached"] = True
+                # Measurements of the original run would be misleading here
+                cached.metadata.pop("metrics", None)
+                if stage.event_emitter:
+                    await stage.event_emitter.emit(Event(
+                        type=EventType.STAGE_COMPLETED,
+                        task_id=task_id,
+                        stage=stage.name,
+                        progress=1.0,
+                        message=f"Reused cached {stage.name}",
+                        data=cached.metadata
+                    ))
+                return cached
+
+        result = await stage.run(context, task_id)
+
+        if fingerprint is not None and result.success:
+            await asyncio.to_thread(self.stage_cache.put, stage.name, fingerprint, result)
+        return result
+
+    @staticmethod
+    def _state_metadata(result: StageResult) -> Dict[str, Any]:
+        """Parts of a stage result's metadata kept in the task state."""
+        return {key: result.metadata[key] for key in ("metrics", "cached") if key in result.metadata}
+
     def _should_abort_on_failure(self, stage_name: str) -> bool:
         """
         Determine if pipeline should abort on stage failure.
@@ -399,17 +588,18 @@ class PipelineOrchestrator:
             warnings=task_state.warnings,
         )
 
-    def list_tasks(self, status: Optional[TaskStatus] = None) -> List[TaskState]:
+    def list_tasks(self, status: Optional[TaskStatus] = None, limit: Optional[int] = None) -> List[TaskState]:
         """
         List all tasks, optionally filtered by status.
 
         Args:
             status: Optional status filter
+            limit: Optional maximum number of tasks
 
         Returns:
-            List of TaskState objects
+            List of TaskState objects, newest first
         """
-        return self.state_manager.list_tasks(status)
+        return self.state_manager.list_tasks(status, limit)
 
     def cleanup_old_tasks(self, days: int = 7):
         """
@@ -419,3 +609,16 @@ class PipelineOrchestrator:
             days: Number of days to keep
         """
         self.state_manager.cleanup_old_tasks(days)
+
+    def close(self):
+        """
+        Release the stages' long-lived resources (e.g. render workers).
+
+        Call once no more pipelines will run, after the job queue has
+        stopped.
+        """
+        for stage in self.stages:
+            try:
+                stage.close()
+            except Exception as e:
+                logger.warning(f"Failed to close stage {stage.name}: {e}")
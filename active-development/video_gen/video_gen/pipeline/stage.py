@@ -9,10 +9,13 @@ import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from .events import EventEmitter, Event, EventType
-from ..shared.exceptions import StageError
+from .stage_cache import fingerprint_inputs
+from ..shared.cancellation import kill_process, on_cancel, raise_if_cancelled
+from ..shared.exceptions import StageError, TaskCancelledError
+from ..shared.metrics import StageMetrics, record_stage
 
 logger = logging.getLogger(__name__)
 
@@ -52,8 +55,39 @@ class Stage(ABC):
     - Error handling
     - Event emission
     - Logging
+
+    Dependencies:
+        Stages may declare the context keys they read (``inputs``) and the
+        artifacts they add (``outputs``). The orchestrator uses them to run
+        a stage as soon as the stages producing its inputs are done, in
+        parallel with unrelated stages. A stage that leaves either as None
+        runs after every earlier stage, and every later stage waits for it
+        (the original strictly sequential behavior).
+
+        ``prepare()`` is an optional sub-task for work that needs fewer
+        inputs than the stage itself (e.g. rendering keyframes before the
+        audio exists). It runs once ``prepare_inputs`` are available, and
+        the stage always waits for it.
+
+    Caching:
+        A ``cacheable`` stage is a pure function of its ``cache_inputs()``
+        (by default, its declared inputs). The orchestrator reuses its
+        stored result for any later task with the same fingerprint; see
+        stage_cache.py. Only the result is replayed, so objects changed in
+        place must also be returned as artifacts.
     """
 
+    #: Context keys read by execute() (None: depends on every earlier stage)
+    inputs: Optional[Tuple[str, ...]] = None
+    #: Artifact keys added to the context (None: unknown, acts as a barrier)
+    outputs: Optional[Tuple[str, ...]] = None
+    #: Context keys read by prepare() (None: the stage has no prepare step)
+    prepare_inputs: Optional[Tuple[str, ...]] = None
+    #: Whether results may be reused across tasks with the same fingerprint
+    cacheable: bool = False
+    #: Bump when the stage's output changes for the same inputs
+    cache_version: str = "1"
+
     def __init__(self, name: str, event_emitter: Optional[EventEmitter] = None):
         self.name = name
         self.event_emitter = event_emitter
@@ -89,6 +123,7 @@ class Stage(ABC):
         """
         start_time = datetime.now()
         self.logger.info(f"Starting stage: {self.name}")
+        stage_metrics = StageMetrics(self.name)
 
         # Emit start event
         if self.event_emitter:
@@ -101,12 +136,14 @@ class Stage(ABC):
             ))
 
         try:
-            # Execute the stage
-            result = await self.execute(context)
+            # Execute the stage (spans and counters report to stage_metrics)
+            with stage_metrics.measure():
+                result = await self.execute(context)
 
             # Calculate duration
             end_time = datetime.now()
             result.duration = (end_time - start_time).total_seconds()
+            result.metadata["metrics"] = stage_metrics.to_dict()
 
             # Log warnings
             for warning in result.warnings:
@@ -129,6 +166,7 @@ class Stage(ABC):
                 f"artifacts: {len(result.artifacts)})"
             )
 
+            record_stage(stage_metrics, success=True)
             return result
 
         except Exception as e:
@@ -149,13 +187,49 @@ class Stage(ABC):
                 ))
 
             # Return failed result
+            record_stage(stage_metrics, success=False)
             return StageResult(
                 success=False,
                 stage_name=self.name,
                 duration=duration,
+                metadata={"metrics": stage_metrics.to_dict()},
                 error=str(e)
             )
 
+    def cache_inputs(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Everything execute() depends on, or None if this run can't be cached.
+
+        The default is the declared ``inputs``. Override it to add values
+        from outside the context (a source file, settings that change the
+        output); ``Path`` values are hashed by content.
+        """
+        if not self.cacheable or self.inputs is None:
+            return None
+        return {key: context.get(key) for key in self.inputs}
+
+    def fingerprint(self, context: Dict[str, Any]) -> Optional[str]:
+        """Hash of cache_inputs(), or None if this run can't be cached."""
+        inputs = self.cache_inputs(context)
+        if inputs is None:
+            return None
+        return fingerprint_inputs(self.name, self.cache_version, inputs)
+
+    async def prepare(self, context: Dict[str, Any]):
+        """
+        Optional early work, run once ``prepare_inputs`` are in the context.
+
+        Must not modify the context. Failures are logged and ignored, so
+        only use it for work execute() can redo (caches, warm-up).
+        """
+
+    def close(self):
+        """
+        Release resources kept between runs (worker processes, clients).
+
+        Called by PipelineOrchestrator.close(). The default does nothing.
+        """
+
     async def emit_progress(self, task_id: str, progress: float, message: str = None):
         """
         Emit progress update event.
@@ -206,6 +280,7 @@ class Stage(ABC):
 
         Raises:
             StageError: If subprocess fails
+            TaskCancelledError: If the task was cancelled (the process is killed)
         """
         self.logger.debug(f"Running command: {' '.join(cmd)}")
 
@@ -217,7 +292,16 @@ class Stage(ABC):
                 cwd=cwd
             )
 
-            stdout, stderr = await process.communicate()
+            try:
+                # Kill the child if the task is cancelled, rather than
+                # leaving it running after the stage has gone away
+                with on_cancel(lambda: kill_process(process)):
+                    stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                kill_process(process)
+                await process.wait()
+                raise
+            raise_if_cancelled()
 
             return (
                 stdout.decode() if stdout else "",
@@ -225,6 +309,8 @@ class Stage(ABC):
                 process.returncode
             )
 
+        except TaskCancelledError:
+            raise
         except Exception as e:
             raise StageError(
                 f"Subprocess failed: {e}",
@@ -0,0 +1,217 @@
+"""
+Stage Result Cache
+==================
+Content-addressed store of stage results, shared across tasks.
+
+A cacheable stage hashes everything its execute() reads (its declared
+``inputs`` from the context, plus anything else it overrides
+``Stage.cache_inputs()`` to include). When a later task reaches that stage
+with the same fingerprint, e.g. the same document submitted again, the
+orchestrator reuses the stored StageResult instead of running the stage.
+Unchanged prefixes of a re-submission are then served from cache, and a
+one-line edit only reruns the stages whose inputs actually changed.
+
+Path inputs are hashed by content, not by name, because stages reuse
+paths such as ``<video_id>_audio/`` from run to run.
+
+Layout: ``cache_dir/<stage>/<fp[:2]>/<fp>.pkl``, holding the pickled
+StageResult plus the size and mtime of every file its artifacts point
+to. An entry whose files have since changed or disappeared is a miss.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .stage import StageResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when the entry format changes so old entries are ignored
+CACHE_FORMAT = 1
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def fingerprint_inputs(stage_name: str, version: str, inputs: Dict[str, Any]) -> str:
+    """Build the content hash identifying a stage's inputs.
+
+    Args:
+        stage_name: Stage name
+        version: Stage cache version (``Stage.cache_version``)
+        inputs: Input values by name; ``Path`` values are hashed by the
+            content of the file or directory they point to
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_FORMAT}:{stage_name}:{version}".encode('utf-8'))
+    for name in sorted(inputs):
+        value = inputs[name]
+        digest.update(b"\0" + name.encode('utf-8') + b"\0")
+        if isinstance(value, Path):
+            _hash_path(digest, value)
+        else:
+            digest.update(json.dumps(
+                value, sort_keys=True, default=_json_default, ensure_ascii=False
+            ).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _hash_path(digest: "hashlib._Hash", path: Path):
+    if path.is_dir():
+        for file in sorted(p for p in path.rglob("*") if p.is_file()):
+            digest.update(str(file.relative_to(path)).encode('utf-8') + b"\0")
+            _hash_file(digest, file)
+    elif path.is_file():
+        _hash_file(digest, path)
+    else:
+        digest.update(b"missing:" + str(path).encode('utf-8'))
+
+
+def _hash_file(digest: "hashlib._Hash", path: Path):
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+
+def _artifact_paths(value: Any) -> Iterator[Path]:
+    if isinstance(value, Path):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _artifact_paths(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _artifact_paths(item)
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class StageCache:
+    """Disk cache of StageResults keyed by stage name and input fingerprint.
+
+    Args:
+        cache_dir: Cache directory (None disables the cache)
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are read and written."""
+        return self.cache_dir is not None
+
+    def get(self, stage_name: str, fingerprint: str) -> Optional["StageResult"]:
+        """Return the stored result, or None on a miss or stale entry."""
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(stage_name, fingerprint)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable stage cache entry {path}: {e}")
+            self._count(hit=False)
+            return None
+
+        # Artifacts pointing at files that were since rewritten or removed
+        # (e.g. by a later task for the same video_id) can't be reused
+        for file, signature in entry["paths"].items():
+            if _signature(Path(file)) != signature:
+                logger.debug(f"Stale stage cache entry for {stage_name}: {file} changed")
+                path.unlink(missing_ok=True)
+                self._count(hit=False)
+                return None
+
+        self._count(hit=True)
+        return entry["result"]
+
+    def put(self, stage_name: str, fingerprint: str, result: "StageResult"):
+        """Store a successful stage result."""
+        if self.cache_dir is None or not result.success:
+            return
+
+        paths = {}
+        for file in _artifact_paths(result.artifacts):
+            signature = _signature(file)
+            if signature is None:
+                # Artifact doesn't exist; the result is not reproducible
+                return
+            if file.is_file():
+                paths[str(file)] = signature
+
+        path = self._path(stage_name, fingerprint)
+        try:
+            data = pickle.dumps({"result": result, "paths": paths})
+        except Exception as e:
+            logger.debug(f"Stage result of {stage_name} is not cacheable: {e}")
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write stage cache entry {path}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _path(self, stage_name: str, fingerprint: str) -> Path:
+        return self.cache_dir / stage_name / fingerprint[:2] / f"{fingerprint}.pkl"
+
+
+__all__ = ['CACHE_FORMAT', 'StageCache', 'fingerprint_inputs']
@@ -0,0 +1,279 @@
+"""
+Storage backends for task state.
+
+StateManager serializes TaskState objects to dictionaries and hands them
+to a backend for storage. Two backends are provided:
+
+- JSONStateBackend (default): one JSON file per task, replaced atomically
+  on every save. Simple and easy to inspect, but listing or cleaning up
+  tasks reads every file.
+- SQLiteStateBackend: a single SQLite database (WAL mode) with indexes on
+  status and created_at, so listing and cleanup only touch matching rows.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StateBackend(ABC):
+    """
+    Interface for task state storage.
+
+    Backends store the dictionaries produced by ``TaskState.to_dict()``;
+    they read ``task_id``, ``status`` and ``created_at`` from them but
+    otherwise treat them as opaque.
+    """
+
+    @abstractmethod
+    def save(self, data: Dict[str, Any]) -> Path:
+        """Store a task's state, returning where it was written."""
+
+    @abstractmethod
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return a task's stored state, or None if there is none."""
+
+    @abstractmethod
+    def exists(self, task_id: str) -> bool:
+        """Check if state is stored for a task."""
+
+    @abstractmethod
+    def delete(self, task_id: str) -> bool:
+        """Delete a task's state, returning False if there was none."""
+
+    @abstractmethod
+    def list(self, status: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored states (optionally only those with ``status``), newest first."""
+
+    @abstractmethod
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Delete states created before ``cutoff``, returning how many."""
+
+
+class JSONStateBackend(StateBackend):
+    """One pretty-printed JSON file per task under ``state_dir``."""
+
+    def __init__(self, state_dir: Path):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, task_id: str) -> Path:
+        """Get path to state file for a task."""
+        return self.state_dir / f"{task_id}.json"
+
+    def save(self, data: Dict[str, Any]) -> Path:
+        state_file = self.path(data["task_id"])
+
+        # Write a temp file and rename it over the old one, so a crash
+        # mid-write leaves the previous state intact instead of a torn file
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.state_dir, prefix=f".{state_file.stem}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, state_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return state_file
+
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        state_file = self.path(task_id)
+        if not state_file.exists():
+            return None
+        with open(state_file, 'r') as f:
+            return json.load(f)
+
+    def exists(self, task_id: str) -> bool:
+        return self.path(task_id).exists()
+
+    def delete(self, task_id: str) -> bool:
+        state_file = self.path(task_id)
+        if state_file.exists():
+            state_file.unlink()
+            return True
+        return False
+
+    def list(self, status: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        states = []
+        for state_file in self.state_dir.glob("*.json"):
+            try:
+                with open(state_file, 'r') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load state file {state_file}: {e}")
+                continue
+            if status is None or data.get("status") == status:
+                states.append(data)
+
+        states.sort(key=lambda d: d.get("created_at", ""), reverse=True)
+        return states[:limit] if limit is not None else states
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        deleted = 0
+        for state_file in self.state_dir.glob("*.json"):
+            try:
+                with open(state_file, 'r') as f:
+                    data = json.load(f)
+                created_at = datetime.fromisoformat(data["created_at"])
+
+                if created_at < cutoff:
+                    state_file.unlink()
+                    deleted += 1
+            except Exception as e:
+                logger.warning(f"Error processing {state_file}: {e}")
+        return deleted
+
+
+class SQLiteStateBackend(StateBackend):
+    """
+    All task states in one SQLite database.
+
+    Runs in WAL mode so the web server can read while the pipeline
+    writes. ``status`` and ``created_at`` are stored as indexed columns
+    next to the JSON state, so listing and cleanup never parse rows they
+    don't return.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS task_states (
+            task_id    TEXT PRIMARY KEY,
+            status     TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            data       TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_task_states_status_created
+            ON task_states (status, created_at);
+        CREATE INDEX IF NOT EXISTS idx_task_states_created
+            ON task_states (created_at);
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One connection shared across threads, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+            self._conn.commit()
+
+    def save(self, data: Dict[str, Any]) -> Path:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO task_states (task_id, status, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(task_id) DO UPDATE SET "
+                "status = excluded.status, created_at = excluded.created_at, "
+                "updated_at = excluded.updated_at, data = excluded.data",
+                (
+                    data["task_id"],
+                    data["status"],
+                    data["created_at"],
+                    datetime.now().isoformat(),
+                    json.dumps(data),
+                )
+            )
+        return self.db_path
+
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM task_states WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def exists(self, task_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM task_states WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return row is not None
+
+    def delete(self, task_id: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM task_states WHERE task_id = ?", (task_id,)
+            )
+        return cursor.rowcount > 0
+
+    def list(self, status: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        query = "SELECT data FROM task_states"
+        params: List[Any] = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM task_states WHERE created_at < ?", (cutoff.isoformat(),)
+            )
+        return cursor.rowcount
+
+    def import_json(self, state_dir: Path) -> int:
+        """
+        Copy task states from a JSON backend directory.
+
+        Existing rows are overwritten. Returns the number imported.
+        """
+        imported = 0
+        for data in JSONStateBackend(state_dir).list():
+            try:
+                self.save(data)
+                imported += 1
+            except (KeyError, sqlite3.Error) as e:
+                logger.warning(f"Skipping state {data.get('task_id')}: {e}")
+        return imported
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def create_state_backend(kind: str, state_dir: Path) -> StateBackend:
+    """
+    Create a backend by name.
+
+    Args:
+        kind: "json" or "sqlite"
+        state_dir: State directory (the SQLite database is ``state.db`` in it)
+    """
+    if kind == "json":
+        return JSONStateBackend(state_dir)
+    if kind == "sqlite":
+        return SQLiteStateBackend(Path(state_dir) / "state.db")
+    raise ValueError(f"Unknown state backend: {kind}")
+
+
+__all__ = [
+    'StateBackend',
+    'JSONStateBackend',
+    'SQLiteStateBackend',
+    'create_state_backend',
+]
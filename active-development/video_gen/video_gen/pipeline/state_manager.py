@@ -4,8 +4,10 @@ State management for pipeline execution.
 Handles task persistence, resume capability, and progress tracking.
 """
 
+import asyncio
 import json
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -13,6 +15,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from ..shared.config import config
 from ..shared.exceptions import StateError
+from .state_backends import StateBackend, create_state_backend
 
 logger = logging.getLogger(__name__)
 
@@ -117,7 +120,12 @@ class TaskState:
             self.stages[stage_name].progress = min(1.0, max(0.0, progress))
             self._recalculate_overall_progress()
 
-    def complete_stage(self, stage_name: str, artifacts: Dict[str, str] = None):
+    def complete_stage(
+        self,
+        stage_name: str,
+        artifacts: Dict[str, str] = None,
+        metadata: Dict[str, Any] = None
+    ):
         """Mark a stage as completed."""
         if stage_name in self.stages:
             self.stages[stage_name].status = TaskStatus.COMPLETED
@@ -125,13 +133,17 @@ class TaskState:
             self.stages[stage_name].completed_at = datetime.now()
             if artifacts:
                 self.stages[stage_name].artifacts.update(artifacts)
+            if metadata:
+                self.stages[stage_name].metadata.update(metadata)
             self._recalculate_overall_progress()
 
-    def fail_stage(self, stage_name: str, error: str):
+    def fail_stage(self, stage_name: str, error: str, metadata: Dict[str, Any] = None):
         """Mark a stage as failed."""
         if stage_name in self.stages:
             self.stages[stage_name].status = TaskStatus.FAILED
             self.stages[stage_name].error = error
+            if metadata:
+                self.stages[stage_name].metadata.update(metadata)
             self.errors.append(f"{stage_name}: {error}")
 
     def _recalculate_overall_progress(self):
@@ -227,42 +239,41 @@ class StateManager:
     Manages persistence and retrieval of task states.
 
     Provides:
-    - State persistence to disk
+    - State persistence (JSON files by default, or SQLite)
+    - Write-behind persistence via StateWriter
     - Resume capability
     - Progress tracking
     - Task querying
+
+    Args:
+        state_dir: State directory (defaults to config.state_dir)
+        backend: Storage backend; when omitted it is chosen by
+            config.state_backend ("json" or "sqlite")
     """
 
-    def __init__(self, state_dir: Optional[Path] = None):
+    def __init__(self, state_dir: Optional[Path] = None, backend: Optional[StateBackend] = None):
         self.state_dir = state_dir or config.state_dir
         self.state_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"State manager initialized: {self.state_dir}")
-
-    def _get_state_file(self, task_id: str) -> Path:
-        """Get path to state file for a task."""
-        return self.state_dir / f"{task_id}.json"
+        self.backend = backend or create_state_backend(config.state_backend, self.state_dir)
+        logger.info(f"State manager initialized: {self.state_dir} ({type(self.backend).__name__})")
 
     def save(self, state: TaskState) -> Path:
         """
-        Save task state to disk.
+        Save task state.
 
         Args:
             state: TaskState to save
 
         Returns:
-            Path to saved state file
+            Path the state was written to (state file or database)
 
         Raises:
             StateError: If save fails
         """
         try:
-            state_file = self._get_state_file(state.task_id)
-
-            with open(state_file, 'w') as f:
-                json.dump(state.to_dict(), f, indent=2)
-
-            logger.debug(f"State saved: {state_file}")
-            return state_file
+            location = self.backend.save(state.to_dict())
+            logger.debug(f"State saved: {state.task_id} -> {location}")
+            return location
 
         except Exception as e:
             raise StateError(
@@ -272,7 +283,7 @@ class StateManager:
 
     def load(self, task_id: str) -> TaskState:
         """
-        Load task state from disk.
+        Load task state.
 
         Args:
             task_id: ID of task to load
@@ -284,19 +295,16 @@ class StateManager:
             StateError: If load fails or state not found
         """
         try:
-            state_file = self._get_state_file(task_id)
+            data = self.backend.load(task_id)
 
-            if not state_file.exists():
+            if data is None:
                 raise StateError(
                     f"State not found: {task_id}",
                     details={"task_id": task_id}
                 )
 
-            with open(state_file, 'r') as f:
-                data = json.load(f)
-
             state = TaskState.from_dict(data)
-            logger.debug(f"State loaded: {state_file}")
+            logger.debug(f"State loaded: {task_id}")
             return state
 
         except json.JSONDecodeError as e:
@@ -312,7 +320,7 @@ class StateManager:
 
     def exists(self, task_id: str) -> bool:
         """Check if state exists for a task."""
-        return self._get_state_file(task_id).exists()
+        return self.backend.exists(task_id)
 
     def delete(self, task_id: str) -> bool:
         """
@@ -324,36 +332,30 @@ class StateManager:
         Returns:
             True if deleted, False if not found
         """
-        state_file = self._get_state_file(task_id)
-        if state_file.exists():
-            state_file.unlink()
+        if self.backend.delete(task_id):
             logger.info(f"State deleted: {task_id}")
             return True
         return False
 
-    def list_tasks(self, status: Optional[TaskStatus] = None) -> List[TaskState]:
+    def list_tasks(self, status: Optional[TaskStatus] = None, limit: Optional[int] = None) -> List[TaskState]:
         """
         List all tasks, optionally filtered by status.
 
         Args:
             status: Optional status to filter by
+            limit: Optional maximum number of tasks to return
 
         Returns:
-            List of TaskState objects
+            List of TaskState objects, newest first
         """
         tasks = []
-        for state_file in self.state_dir.glob("*.json"):
+        for data in self.backend.list(status.value if status else None, limit):
             try:
-                with open(state_file, 'r') as f:
-                    data = json.load(f)
-                state = TaskState.from_dict(data)
-
-                if status is None or state.status == status:
-                    tasks.append(state)
+                tasks.append(TaskState.from_dict(data))
             except Exception as e:
-                logger.warning(f"Failed to load state file {state_file}: {e}")
+                logger.warning(f"Failed to load state {data.get('task_id')}: {e}")
 
-        return sorted(tasks, key=lambda s: s.created_at, reverse=True)
+        return tasks
 
     def cleanup_old_tasks(self, days: int = 7):
         """
@@ -365,17 +367,88 @@ class StateManager:
         from datetime import timedelta
         cutoff = datetime.now() - timedelta(days=days)
 
-        deleted = 0
-        for state_file in self.state_dir.glob("*.json"):
-            try:
-                with open(state_file, 'r') as f:
-                    data = json.load(f)
-                created_at = datetime.fromisoformat(data["created_at"])
-
-                if created_at < cutoff:
-                    state_file.unlink()
-                    deleted += 1
-            except Exception as e:
-                logger.warning(f"Error processing {state_file}: {e}")
+        deleted = self.backend.delete_older_than(cutoff)
 
         logger.info(f"Cleaned up {deleted} old task states")
+
+
+class StateWriter:
+    """
+    Write-behind persistence for one task's state.
+
+    Changes are marked with mark_dirty() and coalesced: the state is
+    written at most once per ``max_interval`` seconds (a timer writes any
+    pending change when the interval runs out), while save() writes
+    immediately for points that must be durable, such as stage
+    boundaries and failures.
+
+    Args:
+        state_manager: StateManager to write through
+        state: Task state being tracked
+        max_interval: Longest a change may stay unwritten (seconds);
+            defaults to config.state_flush_interval
+    """
+
+    def __init__(self, state_manager: StateManager, state: TaskState,
+                 max_interval: Optional[float] = None):
+        self.state_manager = state_manager
+        self.state = state
+        self.max_interval = config.state_flush_interval if max_interval is None else max_interval
+        self.writes = 0
+        self._dirty = False
+        self._last_write = float("-inf")
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are unwritten changes."""
+        return self._dirty
+
+    def mark_dirty(self):
+        """Record a change, writing it now or within ``max_interval``."""
+        self._dirty = True
+        remaining = self.max_interval - (time.monotonic() - self._last_write)
+        if remaining <= 0:
+            self.flush()
+            return
+
+        if self._timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No loop to schedule on; write through
+                self.flush()
+                return
+            self._timer = loop.call_later(remaining, self._flush_on_timer)
+
+    def flush(self) -> bool:
+        """Write pending changes, returning whether anything was written."""
+        if not self._dirty:
+            self._cancel_timer()
+            return False
+        self.save()
+        return True
+
+    def save(self):
+        """Write the state now."""
+        self._cancel_timer()
+        self.state_manager.save(self.state)
+        self._dirty = False
+        self._last_write = time.monotonic()
+        self.writes += 1
+
+    def close(self):
+        """Write any pending change and stop the timer."""
+        self.flush()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush_on_timer(self):
+        self._timer = None
+        try:
+            self.flush()
+        except StateError as e:
+            logger.error(f"Deferred state write failed for {self.state.task_id}: {e}")
@@ -14,6 +14,7 @@ Architecture:
 - educational_scenes.py: Quiz, exercise, learning objectives
 - comparison_scenes.py: Code comparison, problem, solution
 - checkpoint_scenes.py: Checkpoint, quote
+- cache.py: Content-addressed keyframe cache (memory LRU + disk)
 
 Usage:
     from video_gen.renderers import create_title_keyframes, create_quiz_keyframes
@@ -72,6 +73,13 @@ from .checkpoint_scenes import (
     create_quote_keyframes
 )
 
+# Import keyframe cache
+from .cache import (
+    RENDERER_VERSION,
+    KeyframeCache,
+    keyframe_cache_key
+)
+
 # Public API - all scene renderers + utilities
 __all__ = [
     # Constants
@@ -107,7 +115,12 @@ __all__ = [
     # Checkpoint scenes
     'create_checkpoint_keyframes',
     'create_quote_keyframes',
+
+    # Keyframe cache
+    'RENDERER_VERSION',
+    'KeyframeCache',
+    'keyframe_cache_key',
 ]
 
 # Version
-__version__ = '1.0.0'
+__version__ = RENDERER_VERSION
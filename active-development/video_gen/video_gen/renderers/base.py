@@ -7,8 +7,12 @@ Provides:
 - Easing functions for smooth animations
 - Background generation with modern mesh design
 - Base frame creation with consistent styling
+
+Backgrounds and base frames depend only on the accent color and
+resolution, so each is drawn once and callers receive a copy.
 """
 
+from functools import lru_cache
 from PIL import Image, ImageDraw
 from typing import Tuple
 
@@ -55,8 +59,18 @@ def create_modern_mesh_bg(
         accent_color: RGB tuple for accent color
 
     Returns:
-        PIL Image with mesh background
+        PIL Image with mesh background (a fresh copy, safe to draw on)
     """
+    return _cached_mesh_bg(width, height, tuple(accent_color)).copy()
+
+
+@lru_cache(maxsize=8)
+def _cached_mesh_bg(
+    width: int,
+    height: int,
+    accent_color: Tuple[int, int, int]
+) -> Image.Image:
+    """Draw the mesh background (memoized, never mutate the result)."""
     img = Image.new('RGB', (width, height), BG_LIGHT)
     draw = ImageDraw.Draw(img, 'RGBA')
 
@@ -87,20 +101,30 @@ def create_base_frame(accent_color: Tuple[int, int, int]) -> Image.Image:
         accent_color: RGB tuple for accent color
 
     Returns:
-        PIL Image ready for additional content
+        PIL Image ready for additional content (a fresh copy, safe to draw on)
     """
-    img = create_modern_mesh_bg(WIDTH, HEIGHT, accent_color).convert('RGBA')
+    return _cached_base_frame(tuple(accent_color), WIDTH, HEIGHT).copy()
+
+
+@lru_cache(maxsize=16)
+def _cached_base_frame(
+    accent_color: Tuple[int, int, int],
+    width: int,
+    height: int
+) -> Image.Image:
+    """Draw the branded base frame (memoized, never mutate the result)."""
+    img = _cached_mesh_bg(width, height, accent_color).convert('RGBA')
     draw = ImageDraw.Draw(img, 'RGBA')
 
     # Left border accent
-    draw.rectangle([0, 0, 12, HEIGHT], fill=accent_color + (255,))
+    draw.rectangle([0, 0, 12, height], fill=accent_color + (255,))
 
     # Bottom stripe
-    draw.rectangle([0, HEIGHT-12, WIDTH, HEIGHT], fill=accent_color + (120,))
+    draw.rectangle([0, height-12, width, height], fill=accent_color + (120,))
 
     # CC logo (bottom right)
     logo_size = 60
-    logo_x, logo_y = WIDTH - 120, HEIGHT - 90
+    logo_x, logo_y = width - 120, height - 90
     draw.rounded_rectangle(
         [logo_x, logo_y, logo_x + logo_size, logo_y + logo_size],
         radius=12,
@@ -0,0 +1,200 @@
+"""
+Keyframe Cache
+==============
+Content-addressed cache for rendered scene keyframes.
+
+Keyframes depend only on the scene type, its visual content, the accent
+color, the output resolution and the renderer code itself, so a hash of
+those inputs identifies a (start, end) keyframe pair. Re-renders after
+narration-only edits, or multilingual variants with identical visuals,
+are served from cache without touching PIL.
+
+Tiers:
+- Memory: small LRU of PIL images (per process)
+- Disk: PNG pairs under ``cache_dir`` (shared across processes and runs)
+
+Cached images are shared between callers and must be treated as
+read-only.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PIL import Image
+
+from .constants import WIDTH, HEIGHT
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever any renderer's output changes so stale entries are ignored
+RENDERER_VERSION = '1.0.0'
+
+Keyframes = Tuple[Image.Image, Image.Image]
+
+
+def keyframe_cache_key(
+    scene_type: str,
+    visual_content: Dict[str, Any],
+    accent_color: Tuple[int, int, int],
+    resolution: Tuple[int, int] = (WIDTH, HEIGHT),
+    version: str = RENDERER_VERSION
+) -> str:
+    """Build the content hash identifying a scene's keyframes.
+
+    Args:
+        scene_type: Scene type (e.g. "title", "quiz")
+        visual_content: Scene visual content dictionary
+        accent_color: RGB accent color
+        resolution: (width, height) of the rendered frames
+        version: Renderer version
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "type": scene_type,
+            "visual": visual_content,
+            "accent": list(accent_color),
+            "resolution": list(resolution),
+            "version": version,
+        },
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class KeyframeCache:
+    """Two-tier (memory LRU + disk) cache of (start, end) keyframe pairs.
+
+    Args:
+        cache_dir: Directory for the disk tier (None disables it)
+        max_entries: Keyframe pairs kept in memory (~12 MB each at 1080p)
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 8):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Keyframes]" = OrderedDict()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Keyframes]:
+        """Look up a keyframe pair, promoting disk hits into memory."""
+        with self._lock:
+            frames = self._memory.get(key)
+            if frames is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return frames
+
+        frames = self._load(key)
+        if frames is not None:
+            self.disk_hits += 1
+            self._remember(key, frames)
+            return frames
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, frames: Keyframes):
+        """Store a keyframe pair in both tiers."""
+        self._remember(key, frames)
+        self._store(key, frames)
+
+    def get_or_render(self, key: str, render: Callable[[], Keyframes]) -> Keyframes:
+        """Return cached keyframes for ``key``, rendering them on a miss."""
+        frames = self.get(key)
+        if frames is None:
+            frames = render()
+            self.put(key, frames)
+        return frames
+
+    def clear(self):
+        """Drop the memory tier (the disk tier is left intact)."""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters."""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._memory),
+        }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies sent to worker processes share only the disk tier; the
+        # memory tier (and the lock guarding it) stays in this process
+        state = self.__dict__.copy()
+        state["_memory"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def _remember(self, key: str, frames: Keyframes):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = frames
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        base = self.cache_dir / key[:2]
+        return base / f"{key}_start.png", base / f"{key}_end.png"
+
+    def _load(self, key: str) -> Optional[Keyframes]:
+        if self.cache_dir is None:
+            return None
+
+        start_path, end_path = self._paths(key)
+        if not (start_path.exists() and end_path.exists()):
+            return None
+
+        try:
+            with Image.open(start_path) as start, Image.open(end_path) as end:
+                return start.copy(), end.copy()
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable keyframe cache entry {key}: {e}")
+            return None
+
+    def _store(self, key: str, frames: Keyframes):
+        if self.cache_dir is None:
+            return
+
+        try:
+            for path, frame in zip(self._paths(key), frames):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temp file and rename so concurrent readers
+                # (e.g. scene-parallel workers) never see partial PNGs
+                fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        frame.save(f, "PNG", compress_level=1)
+                    os.replace(tmp_name, path)
+                except BaseException:
+                    Path(tmp_name).unlink(missing_ok=True)
+                    raise
+        except OSError as e:
+            logger.warning(f"Failed to write keyframe cache entry {key}: {e}")
+
+
+__all__ = ['RENDERER_VERSION', 'KeyframeCache', 'keyframe_cache_key']
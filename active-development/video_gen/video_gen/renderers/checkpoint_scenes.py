@@ -39,47 +39,7 @@ except Exception:
     font_desc = ImageFont.load_default()
     font_small = ImageFont.load_default()
 
-
-def create_base_frame(accent_color: Tuple[int, int, int]) -> Image.Image:
-    """
-    Create base frame with modern mesh background and branding.
-
-    Args:
-        accent_color: RGB tuple for accent color
-
-    Returns:
-        PIL Image with base frame design
-    """
-    # Create mesh background
-    img = Image.new('RGB', (WIDTH, HEIGHT), BG_LIGHT)
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    # Add mesh gradient overlays
-    draw.ellipse([1200, -300, 2200, 500], fill=accent_color + (15,))
-    draw.ellipse([-200, 600, 600, 1300], fill=accent_color + (20,))
-    draw.ellipse([1400, 700, 2000, 1200], fill=accent_color + (12,))
-
-    # Grid pattern
-    for i in range(0, WIDTH, 40):
-        draw.line([(i, 0), (i, HEIGHT)], fill=CARD_SHADOW + (30,), width=1)
-    for i in range(0, HEIGHT, 40):
-        draw.line([(0, i), (WIDTH, i)], fill=CARD_SHADOW + (30,), width=1)
-
-    img = img.convert('RGBA')
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    # Side accent bar
-    draw.rectangle([0, 0, 12, HEIGHT], fill=accent_color + (255,))
-    draw.rectangle([0, HEIGHT-12, WIDTH, HEIGHT], fill=accent_color + (120,))
-
-    # Logo
-    logo_size = 60
-    logo_x, logo_y = WIDTH - 120, HEIGHT - 90
-    draw.rounded_rectangle([logo_x, logo_y, logo_x + logo_size, logo_y + logo_size],
-                          radius=12, fill=accent_color + (255,))
-    draw.text((logo_x + 12, logo_y + 8), "CC", font=font_subtitle, fill=BG_WHITE + (255,))
-
-    return img
+from .base import create_base_frame
 
 
 def create_quote_keyframes(
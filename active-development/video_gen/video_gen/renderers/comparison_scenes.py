@@ -41,40 +41,7 @@ font_desc = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 38)
 font_code = ImageFont.truetype("C:/Windows/Fonts/consola.ttf", 32)
 font_small = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 28)
 
-
-def create_modern_mesh_bg(width: int, height: int, accent_color: Tuple[int, int, int]) -> Image.Image:
-    """Create modern mesh background with gradient effects."""
-    img = Image.new('RGB', (width, height), BG_LIGHT)
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    draw.ellipse([1200, -300, 2200, 500], fill=accent_color + (15,))
-    draw.ellipse([-200, 600, 600, 1300], fill=accent_color + (20,))
-    draw.ellipse([1400, 700, 2000, 1200], fill=accent_color + (12,))
-
-    for i in range(0, width, 40):
-        draw.line([(i, 0), (i, height)], fill=CARD_SHADOW + (30,), width=1)
-    for i in range(0, height, 40):
-        draw.line([(0, i), (width, i)], fill=CARD_SHADOW + (30,), width=1)
-
-    return img
-
-
-def create_base_frame(accent_color: Tuple[int, int, int]) -> Image.Image:
-    """Create base frame with branding elements."""
-    img = create_modern_mesh_bg(WIDTH, HEIGHT, accent_color).convert('RGBA')
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    draw.rectangle([0, 0, 12, HEIGHT], fill=accent_color + (255,))
-    draw.rectangle([0, HEIGHT-12, WIDTH, HEIGHT], fill=accent_color + (120,))
-
-    logo_size = 60
-    logo_x, logo_y = WIDTH - 120, HEIGHT - 90
-    draw.rounded_rectangle([logo_x, logo_y, logo_x + logo_size, logo_y + logo_size],
-                          radius=12, fill=accent_color + (255,))
-    font_subtitle = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 48)
-    draw.text((logo_x + 12, logo_y + 8), "CC", font=font_subtitle, fill=BG_WHITE + (255,))
-
-    return img
+from .base import create_base_frame
 
 
 def create_code_comparison_keyframes(
@@ -0,0 +1,196 @@
+"""
+Cooperative cancellation for pipeline tasks.
+
+The orchestrator creates a CancellationToken for every task and makes it
+the *current* token while the task runs. The token is held in a context
+variable, so it follows the task into the stage coroutines and into
+worker threads started with asyncio.to_thread(), and concurrent tasks
+never see each other's token.
+
+Long-running code cooperates in two ways:
+
+- raise_if_cancelled() between units of work (e.g. scenes), which raises
+  TaskCancelledError once the task has been cancelled.
+- Child processes (FFmpeg) are started with run_process() or wrapped in
+  on_cancel(), so cancelling the task kills them instead of letting them
+  run to completion.
+
+Outside a task (tests, scripts) there is no current token and all of
+these behave like plain subprocess calls.
+"""
+
+import logging
+import subprocess
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .exceptions import TaskCancelledError
+
+logger = logging.getLogger(__name__)
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag with callbacks.
+
+    Callbacks run once, on the thread calling cancel(); a callback added
+    after cancellation runs immediately.
+    """
+
+    def __init__(self, task_id: Optional[str] = None):
+        self.task_id = task_id
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: Dict[int, Callable[[], Any]] = {}
+        self._next_id = 0
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() has been called."""
+        return self._event.is_set()
+
+    def cancel(self) -> bool:
+        """
+        Cancel the task and run the registered callbacks.
+
+        Returns:
+            False if the token was already cancelled
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+
+        for callback in callbacks:
+            _run_callback(callback)
+        return True
+
+    def raise_if_cancelled(self):
+        """Raise TaskCancelledError if the task has been cancelled."""
+        if self._event.is_set():
+            raise TaskCancelledError(
+                f"Task cancelled: {self.task_id}" if self.task_id else "Task cancelled",
+                details={"task_id": self.task_id}
+            )
+
+    def add_callback(self, callback: Callable[[], Any]) -> Callable[[], None]:
+        """
+        Run ``callback`` when the token is cancelled.
+
+        Returns:
+            Function that unregisters the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                callback_id = self._next_id
+                self._next_id += 1
+                self._callbacks[callback_id] = callback
+                return lambda: self._remove_callback(callback_id)
+
+        _run_callback(callback)
+        return lambda: None
+
+    def _remove_callback(self, callback_id: int):
+        with self._lock:
+            self._callbacks.pop(callback_id, None)
+
+
+def _run_callback(callback: Callable[[], Any]):
+    try:
+        callback()
+    except Exception as e:
+        logger.warning(f"Cancellation callback failed: {e}")
+
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar(
+    "video_gen_cancel_token", default=None
+)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Token of the task running in this context, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def cancellation_scope(token: CancellationToken) -> Iterator[CancellationToken]:
+    """Make ``token`` the current token for the duration of the block."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def raise_if_cancelled():
+    """Raise TaskCancelledError if the current task has been cancelled."""
+    token = _current_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+@contextmanager
+def on_cancel(callback: Callable[[], Any]) -> Iterator[None]:
+    """Run ``callback`` if the current task is cancelled during the block."""
+    token = _current_token.get()
+    if token is None:
+        yield
+        return
+
+    remove = token.add_callback(callback)
+    try:
+        yield
+    finally:
+        remove()
+
+
+def kill_process(process: Any):
+    """Kill a subprocess.Popen or asyncio process, ignoring exited ones."""
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+
+
+def run_process(cmd: List[str], check: bool = False, **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run() that kills the child if the current task is cancelled.
+
+    Raises:
+        TaskCancelledError: If the task was cancelled while it ran
+        subprocess.CalledProcessError: If ``check`` and the command failed
+    """
+    token = _current_token.get()
+    if token is None:
+        return subprocess.run(cmd, check=check, **kwargs)
+
+    token.raise_if_cancelled()
+
+    if kwargs.pop("capture_output", False):
+        kwargs["stdout"] = subprocess.PIPE
+        kwargs["stderr"] = subprocess.PIPE
+
+    with subprocess.Popen(cmd, **kwargs) as process:
+        with on_cancel(lambda: kill_process(process)):
+            stdout, stderr = process.communicate()
+
+    token.raise_if_cancelled()
+
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+__all__ = [
+    'CancellationToken',
+    'cancellation_scope',
+    'current_token',
+    'kill_process',
+    'on_cancel',
+    'raise_if_cancelled',
+    'run_process',
+]
@@ -14,6 +14,18 @@ from dotenv import load_dotenv
 logger = logging.getLogger(__name__)
 
 
+def _env_int(name: str, default: int) -> int:
+    """Integer from the environment; a malformed value warns and uses ``default``."""
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring {name}={value!r} (not an integer), using {default}")
+        return default
+
+
 class Config:
     """Global configuration singleton.
 
@@ -62,6 +74,13 @@ class Config:
         self.video_height = 1080
         self.video_fps = 30
 
+        # Video encoder: "auto" (NVENC when usable, else CPU), "nvenc",
+        # "libx264" or "libx265". Preset/tune/CRF apply to CPU encoders.
+        self.video_encoder = os.getenv("VIDEO_GEN_ENCODER", "auto")
+        self.video_encoder_preset = os.getenv("VIDEO_GEN_ENCODER_PRESET", "veryfast")
+        self.video_encoder_tune = os.getenv("VIDEO_GEN_ENCODER_TUNE", "stillimage") or None
+        self.video_encoder_crf = _env_int("VIDEO_GEN_ENCODER_CRF", 20)
+
         # Voice configuration
         self.voice_config = {
             "male": "en-US-AndrewMultilingualNeural",
@@ -90,9 +109,19 @@ class Config:
         # AI API keys
         self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
 
+        # Caches (keyframes, TTS audio); created on first use
+        self.cache_dir = self.output_dir / "cache"
+        self.keyframe_cache_enabled = os.getenv("VIDEO_GEN_KEYFRAME_CACHE", "1") != "0"
+        self.audio_cache_enabled = os.getenv("VIDEO_GEN_AUDIO_CACHE", "1") != "0"
+        self.audio_cache_max_mb = int(os.getenv("VIDEO_GEN_AUDIO_CACHE_MB", "1024"))
+        self.stage_cache_enabled = os.getenv("VIDEO_GEN_STAGE_CACHE", "1") != "0"
+
         # State storage
         self.state_dir = self.output_dir / "state"
         self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_backend = os.getenv("VIDEO_GEN_STATE_BACKEND", "json")  # json or sqlite
+        # Longest a task state change may stay unwritten (stage boundaries always write)
+        self.state_flush_interval = float(os.getenv("VIDEO_GEN_STATE_FLUSH_SECONDS", "1.0"))
 
         # Logging
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
@@ -101,6 +130,11 @@ class Config:
 
         # Performance settings (from old config.py)
         self.max_workers = int(os.getenv("VIDEO_GEN_MAX_WORKERS", "4"))
+        # Pipelines run at once per process, and jobs allowed to wait for a slot
+        self.job_workers = int(os.getenv("VIDEO_GEN_JOB_WORKERS", "2"))
+        self.job_queue_max = int(os.getenv("VIDEO_GEN_JOB_QUEUE_MAX", "100"))
+        # Video render worker processes (0 renders in a thread of this process)
+        self.render_workers = int(os.getenv("VIDEO_GEN_RENDER_WORKERS", str(self.job_workers)))
 
         # Temporary directory for processing
         self.temp_dir = self.base_dir / "temp"
@@ -155,6 +189,13 @@ class Config:
         if not self.ffmpeg_path:
             logger.warning("FFmpeg path not configured, video generation may fail")
 
+        # Validate video encoder
+        if self.video_encoder not in ("auto", "nvenc", "libx264", "libx265"):
+            raise ValueError(
+                f"video_encoder must be one of auto, nvenc, libx264, libx265, "
+                f"got {self.video_encoder}"
+            )
+
     def get_voice(self, voice_id: str) -> str:
         """Get Edge TTS voice identifier."""
         return self.voice_config.get(voice_id, self.voice_config["male"])
@@ -171,6 +212,7 @@ class Config:
             "video_width": self.video_width,
             "video_height": self.video_height,
             "video_fps": self.video_fps,
+            "video_encoder": self.video_encoder,
             "log_level": self.log_level,
         }
 
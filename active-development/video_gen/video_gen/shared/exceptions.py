@@ -39,3 +39,15 @@ class AudioGenerationError(StageError):
 
 class VideoGenerationError(StageError):
     """Raised when video generation fails."""
+
+
+class QueueFullError(VideoGenError):
+    """Raised when the job queue cannot accept more work."""
+
+    def __init__(self, message: str, retry_after: int = 60, details: dict = None):
+        super().__init__(message, details=details)
+        self.retry_after = retry_after
+
+
+class TaskCancelledError(VideoGenError):
+    """Raised inside a task's stages once the task has been cancelled."""
@@ -0,0 +1,496 @@
+"""
+Performance instrumentation for pipeline stages.
+
+Stage.run() measures every stage with a StageMetrics collector: wall and
+CPU time, peak RSS, and whatever the stage's code reports while it runs.
+The collector is held in a context variable (like the cancellation
+token), so code anywhere below a stage reports to it without being
+passed anything:
+
+- span(name) times a block. Spans nest, so inside span("encode") a
+  span("ffmpeg") is recorded as ``encode/ffmpeg``.
+- timed(iterable, name) times each step of a lazy iterable, e.g. frames
+  that are rendered as the encoder pulls them.
+- count(name, amount) adds to a counter such as frames or bytes written.
+
+Outside a stage (tests, scripts) there is no collector and all of these
+do nothing. Work done in other processes is measured there and merged
+back with merge_metrics().
+
+Finished stages are recorded in ``registry``, which the web app serves
+in the Prometheus text format at ``/metrics``. The per-run numbers are
+also kept in the task state (``stages[name].metadata["metrics"]``).
+"""
+
+import math
+import os
+import re
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# How often peak RSS is sampled while a stage runs (seconds)
+RSS_SAMPLE_INTERVAL = 0.1
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _lifetime_peak_rss_bytes() -> Optional[int]:
+    # Fallback for platforms without /proc: peak since the process started
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageMetrics:
+    """
+    Measurements of one stage run.
+
+    Spans and counters may be reported from several threads at once.
+    CPU time and RSS are process-wide, so stages that run concurrently
+    see each other's usage.
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss_bytes: Optional[int] = None
+        self.worker_peak_rss_bytes: Optional[int] = None
+        self.spans: Dict[str, List[float]] = {}  # path -> [seconds, calls]
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self) -> Iterator["StageMetrics"]:
+        """Make this the current collector and measure the block."""
+        stop = threading.Event()
+        sampler = None
+        if current_rss_bytes() is not None:
+            sampler = threading.Thread(target=self._sample_rss, args=(stop,), daemon=True)
+            sampler.start()
+
+        reset = _scope.set((self, ""))
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield self
+        finally:
+            self.wall_seconds += time.perf_counter() - wall_start
+            self.cpu_seconds += time.process_time() - cpu_start
+            _scope.reset(reset)
+            stop.set()
+            if sampler is not None:
+                sampler.join()
+            else:
+                self._update_peak(_lifetime_peak_rss_bytes())
+
+    def _sample_rss(self, stop: threading.Event):
+        while True:
+            self._update_peak(current_rss_bytes())
+            if stop.wait(RSS_SAMPLE_INTERVAL):
+                self._update_peak(current_rss_bytes())
+                return
+
+    def _update_peak(self, rss: Optional[int]):
+        if rss is not None and (self.peak_rss_bytes is None or rss > self.peak_rss_bytes):
+            self.peak_rss_bytes = rss
+
+    def add_span(self, path: str, seconds: float, calls: int = 1):
+        """Add time spent in a span."""
+        with self._lock:
+            totals = self.spans.setdefault(path, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += calls
+
+    def count(self, name: str, amount: float = 1):
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, data: Dict[str, Any], prefix: str = ""):
+        """
+        Add measurements taken in another process (a to_dict() result).
+
+        Its spans are nested under ``prefix``; its CPU time is added to
+        this stage's and its peak RSS is kept as the worker peak.
+        """
+        for path, totals in data.get("spans", {}).items():
+            self.add_span(f"{prefix}/{path}" if prefix else path, totals["seconds"], totals["calls"])
+        for name, amount in data.get("counters", {}).items():
+            self.count(name, amount)
+        with self._lock:
+            self.cpu_seconds += data.get("cpu_seconds", 0.0)
+            for key in ("peak_rss_bytes", "worker_peak_rss_bytes"):
+                rss = data.get(key)
+                if rss is not None and (self.worker_peak_rss_bytes is None or rss > self.worker_peak_rss_bytes):
+                    self.worker_peak_rss_bytes = rss
+
+    @property
+    def frames_per_second(self) -> Optional[float]:
+        """Frames counted per second of wall time, if the stage counts frames."""
+        frames = self.counters.get("frames")
+        if frames is None or self.wall_seconds <= 0:
+            return None
+        return frames / self.wall_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        with self._lock:
+            data = {
+                "wall_seconds": round(self.wall_seconds, 6),
+                "cpu_seconds": round(self.cpu_seconds, 6),
+                "peak_rss_bytes": self.peak_rss_bytes,
+                "spans": {
+                    path: {"seconds": round(seconds, 6), "calls": calls}
+                    for path, (seconds, calls) in sorted(self.spans.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+        if self.worker_peak_rss_bytes is not None:
+            data["worker_peak_rss_bytes"] = self.worker_peak_rss_bytes
+        fps = self.frames_per_second
+        if fps is not None:
+            data["frames_per_second"] = round(fps, 3)
+        return data
+
+
+# Current collector and span path
+_scope: ContextVar[Optional[Tuple[StageMetrics, str]]] = ContextVar(
+    "video_gen_metrics_scope", default=None
+)
+
+
+def current_metrics() -> Optional[StageMetrics]:
+    """Collector of the stage running in this context, if any."""
+    scope = _scope.get()
+    return scope[0] if scope else None
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time a block as a span of the current stage.
+
+    Don't hold a span open across a ``yield``: the consumer of the
+    generator would be timed (and nested) as part of it. Use timed().
+    """
+    scope = _scope.get()
+    if scope is None:
+        yield
+        return
+
+    collector, parent = scope
+    path = f"{parent}/{name}" if parent else name
+    reset = _scope.set((collector, path))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        collector.add_span(path, time.perf_counter() - start)
+        _scope.reset(reset)
+
+
+def timed(iterable: Iterable[T], name: str) -> Iterator[T]:
+    """Iterate ``iterable``, timing the production of each item as span ``name``."""
+    if _scope.get() is None:
+        yield from iterable
+        return
+
+    iterator = iter(iterable)
+    while True:
+        with span(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def count(name: str, amount: float = 1):
+    """Add to a counter of the current stage."""
+    scope = _scope.get()
+    if scope is not None:
+        scope[0].count(name, amount)
+
+
+def merge_metrics(data: Dict[str, Any]):
+    """Merge a worker process's measurements under the current span."""
+    scope = _scope.get()
+    if scope is not None:
+        collector, path = scope
+        collector.merge(data, prefix=path)
+
+
+# --- Prometheus export -----------------------------------------------------
+
+DEFAULT_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def _label_text(self, values: LabelValues, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labels, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Exposition lines for every label set, without HELP/TYPE."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Add ``amount`` (must not be negative)."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Current value for a label set."""
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_text(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        """Set the value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        """Add ``amount`` (may be negative)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            counts, totals = self._values.setdefault(key, ([0] * len(self.buckets), [0.0, 0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = sorted((k, (list(c), list(t))) for k, (c, t) in self._values.items())
+        for key, (counts, (total, observations)) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = self._label_text(key, (("le", _format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {observations}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, description: str, labels: Tuple[str, ...], **kwargs):
+        name = _NAME_INVALID.sub("_", name)
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description, tuple(labels), **kwargs)
+            elif type(metric) is not cls or metric.labels != tuple(labels):
+                raise ValueError(f"Metric {name} is already registered differently")
+            return metric
+
+    def counter(self, name: str, description: str, labels: Tuple[str, ...] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get(Counter, name, description, labels)
+
+    def gauge(self, name: str, description: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get(Gauge, name, description, labels)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get(Histogram, name, description, labels, buckets=buckets)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for _, metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+#: Process-wide registry served at /metrics
+registry = MetricsRegistry()
+
+
+def record_stage(metrics: StageMetrics, success: bool):
+    """Add a finished stage run to the registry."""
+    stage = metrics.stage
+    registry.counter(
+        "video_gen_stage_runs_total", "Stage runs by outcome", ("stage", "status")
+    ).inc(stage=stage, status="success" if success else "failure")
+    registry.histogram(
+        "video_gen_stage_duration_seconds", "Wall time of stage runs", ("stage",)
+    ).observe(metrics.wall_seconds, stage=stage)
+    registry.counter(
+        "video_gen_stage_cpu_seconds_total",
+        "Process CPU time used while the stage ran, including worker processes",
+        ("stage",)
+    ).inc(metrics.cpu_seconds, stage=stage)
+
+    if metrics.peak_rss_bytes is not None:
+        registry.gauge(
+            "video_gen_stage_peak_rss_bytes", "Peak RSS during the last run of the stage", ("stage",)
+        ).set(metrics.peak_rss_bytes, stage=stage)
+    if metrics.worker_peak_rss_bytes is not None:
+        registry.gauge(
+            "video_gen_stage_worker_peak_rss_bytes",
+            "Peak RSS of the stage's worker processes during its last run",
+            ("stage",)
+        ).set(metrics.worker_peak_rss_bytes, stage=stage)
+
+    span_seconds = registry.counter(
+        "video_gen_stage_span_seconds_total", "Time spent in instrumented spans", ("stage", "span")
+    )
+    span_calls = registry.counter(
+        "video_gen_stage_span_calls_total", "Times instrumented spans were entered", ("stage", "span")
+    )
+    for path, (seconds, calls) in list(metrics.spans.items()):
+        span_seconds.inc(seconds, stage=stage, span=path)
+        span_calls.inc(calls, stage=stage, span=path)
+
+    for name, amount in list(metrics.counters.items()):
+        registry.counter(
+            f"video_gen_stage_{name}_total", f"Stage counter: {name}", ("stage",)
+        ).inc(amount, stage=stage)
+
+    fps = metrics.frames_per_second
+    if fps is not None:
+        registry.gauge(
+            "video_gen_stage_frames_per_second", "Frames per second in the last run of the stage", ("stage",)
+        ).set(fps, stage=stage)
+
+
+__all__ = [
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsRegistry',
+    'StageMetrics',
+    'count',
+    'current_metrics',
+    'current_rss_bytes',
+    'merge_metrics',
+    'record_stage',
+    'registry',
+    'span',
+    'timed',
+]
@@ -2,15 +2,26 @@
 Audio Generation Stage - Generates TTS audio for all scenes with voice rotation support.
 """
 
+import asyncio
 import edge_tts
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import subprocess
 
 from ..pipeline.stage import Stage, StageResult
 from ..shared.models import VideoConfig
 from ..shared.config import config
 from ..shared.exceptions import AudioGenerationError
+from ..shared.cancellation import raise_if_cancelled
+from ..shared import metrics
+from ..audio_generator.tts import (
+    TTSBackend, tts_engine_id, with_retry, gather_bounded, concurrency_limit
+)
+from ..audio_generator.cache import AudioCache, audio_cache_key
+from ..audio_generator.duration import probe_duration, parse_ffmpeg_duration
+
+# Scene timing used when an audio file's duration can't be measured
+FALLBACK_AUDIO_DURATION = 5.0
 
 
 class AudioGenerationStage(Stage):
@@ -19,13 +30,56 @@ class AudioGenerationStage(Stage):
 
     - Creates audio files for each scene
     - Supports voice rotation across scenes
+    - Synthesizes scenes concurrently (bounded by config.max_workers)
+    - Retries failed TTS requests with exponential backoff
+    - Reuses cached audio for unchanged narration
     - Measures actual audio duration
     - Calculates final video timing
     - Generates timing report
     """
 
-    def __init__(self, event_emitter=None):
+    inputs = ("video_config",)
+    # video_config is updated in place (durations), not replaced, so later
+    # stages that need the durations depend on timing_report instead
+    outputs = ("audio_dir", "timing_report")
+    cacheable = True
+
+    def __init__(
+        self,
+        event_emitter=None,
+        tts_backend: Optional[TTSBackend] = None,
+        max_concurrency: Optional[int] = None,
+        retries: int = 2,
+        retry_backoff: float = 0.5,
+        audio_cache: Optional[AudioCache] = None
+    ):
+        """
+        Args:
+            event_emitter: Optional event emitter for progress events
+            tts_backend: TTS engine (default: Edge TTS)
+            max_concurrency: Scenes synthesized at once (default: config.max_workers)
+            retries: Extra attempts per scene after a failed TTS request
+            retry_backoff: Delay before the first retry in seconds (doubles per retry)
+            audio_cache: TTS audio cache (default: under config.cache_dir when
+                enabled; pass AudioCache() to disable)
+        """
         super().__init__("audio_generation", event_emitter)
+        self.tts_backend = tts_backend
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        if audio_cache is None:
+            audio_cache = AudioCache(
+                cache_dir=config.cache_dir / "audio" if config.audio_cache_enabled else None,
+                max_bytes=config.audio_cache_max_mb * 1024 * 1024
+            )
+        self.audio_cache = audio_cache
+
+    def cache_inputs(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Video config plus the TTS engine, which changes the audio."""
+        inputs = super().cache_inputs(context)
+        inputs["tts_engine"] = tts_engine_id(self.tts_backend)
+        return inputs
 
     async def execute(self, context: Dict[str, Any]) -> StageResult:
         """Execute audio generation with voice rotation support."""
@@ -40,65 +94,51 @@ class AudioGenerationStage(Stage):
         audio_dir = output_dir / audio_folder_name
         audio_dir.mkdir(parents=True, exist_ok=True)
 
-        self.logger.info(f"Generating audio for {len(video_config.scenes)} scenes")
+        scene_count = len(video_config.scenes)
+        limit = concurrency_limit(
+            self.max_concurrency if self.max_concurrency is not None else config.max_workers
+        )
+        self.logger.info(f"Generating audio for {scene_count} scenes ({limit} concurrent)")
 
         # Get available voices for rotation
         available_voices = video_config.voices if video_config.voices else ["male"]
         self.logger.info(f"Voice rotation enabled with voices: {available_voices}")
 
-        # Generate audio for each scene with voice rotation
-        total_duration = 0.0
+        # Voice rotation is assigned up front, in scene order, so it does not
+        # depend on which synthesis finishes first
         for i, scene in enumerate(video_config.scenes):
-            progress = i / len(video_config.scenes)
-            await self.emit_progress(
-                context["task_id"],
-                progress,
-                f"Generating audio for scene {i+1}/{len(video_config.scenes)}"
-            )
-
-            # Voice rotation: if scene doesn't have explicit voice, rotate through video's voice array
+            # If scene doesn't have explicit voice, rotate through video's voice array
             if not scene.voice or scene.voice == "male":  # Default voice, apply rotation
                 rotated_voice = available_voices[i % len(available_voices)]
                 scene.voice = rotated_voice
                 self.logger.info(f"Scene {scene.scene_id}: Assigned voice '{rotated_voice}' (rotation index {i % len(available_voices)})")
 
-            # Get voice configuration
-            voice = config.get_voice(scene.voice)
-
-            # Generate audio file
-            audio_file = audio_dir / f"{scene.scene_id}.mp3"
-
-            try:
-                # Generate TTS
-                communicate = edge_tts.Communicate(
-                    scene.narration,
-                    voice,
-                    rate="+0%",
-                    volume="+0%"
-                )
-                await communicate.save(str(audio_file))
-
-                # Measure duration
-                duration = await self._get_audio_duration(audio_file)
+        await self.emit_progress(
+            context["task_id"],
+            0.0,
+            f"Generating audio for {scene_count} scenes"
+        )
 
-                # Update scene
-                scene.actual_audio_duration = duration
-                scene.audio_file = audio_file
-                scene.final_duration = max(scene.min_duration, duration + 1.0)
+        completed = 0
 
-                total_duration += scene.final_duration
+        async def generate(scene):
+            nonlocal completed
+            raise_if_cancelled()
+            await self._generate_scene_audio(scene, audio_dir)
+            completed += 1
+            await self.emit_progress(
+                context["task_id"],
+                completed / scene_count,
+                f"Generated audio for scene {completed}/{scene_count}"
+            )
 
-                self.logger.debug(
-                    f"Generated audio for {scene.scene_id}: "
-                    f"{duration:.2f}s -> {scene.final_duration:.2f}s (voice: {scene.voice})"
-                )
+        await gather_bounded(
+            [lambda scene=scene: generate(scene) for scene in video_config.scenes],
+            limit
+        )
 
-            except Exception as e:
-                raise AudioGenerationError(
-                    f"Failed to generate audio for scene {scene.scene_id}: {e}",
-                    stage=self.name,
-                    details={"scene_id": scene.scene_id, "error": str(e)}
-                )
+        # Sum in scene order so the total is independent of completion order
+        total_duration = sum(scene.final_duration for scene in video_config.scenes)
 
         # Update video config
         video_config.total_duration = total_duration
@@ -125,39 +165,108 @@ class AudioGenerationStage(Stage):
                 "scene_count": len(video_config.scenes),
                 "audio_files_generated": len(video_config.scenes),
                 "voices_used": list(set(scene.voice for scene in video_config.scenes)),
+                "audio_cache": self.audio_cache.stats(),
             }
         )
 
-    async def _get_audio_duration(self, audio_file: Path) -> float:
-        """Get audio file duration using ffmpeg."""
+    async def _generate_scene_audio(self, scene, audio_dir: Path):
+        """Synthesize one scene (with retries) and record its audio timing."""
+        # Get voice configuration
+        voice = config.get_voice(scene.voice)
+
+        # Generate audio file
+        audio_file = audio_dir / f"{scene.scene_id}.mp3"
+
+        cache_key = audio_cache_key(
+            scene.narration, voice, "+0%", "+0%", tts_engine_id(self.tts_backend)
+        )
+
+        try:
+            duration = self.audio_cache.get(cache_key, audio_file)
+            if duration is None:
+                # Generate TTS (mostly network wait)
+                with metrics.span("tts"):
+                    await with_retry(
+                        lambda: self._synthesize(scene.narration, voice, audio_file),
+                        retries=self.retries,
+                        backoff=self.retry_backoff,
+                        description=f"TTS for scene {scene.scene_id}"
+                    )
+                metrics.count("tts_requests")
+
+                # Measure duration
+                with metrics.span("probe_duration"):
+                    duration = await self._get_audio_duration(audio_file)
+                if duration is None:
+                    # A guess must not be cached, or it would never be re-measured
+                    self.logger.warning(
+                        f"Could not determine duration for {audio_file}, "
+                        f"using {FALLBACK_AUDIO_DURATION}s"
+                    )
+                    duration = FALLBACK_AUDIO_DURATION
+                else:
+                    self.audio_cache.put(cache_key, audio_file, duration)
+            else:
+                self.logger.debug(f"Reused cached audio for {scene.scene_id}")
+                metrics.count("audio_cache_hits")
+
+            # Update scene
+            scene.actual_audio_duration = duration
+            scene.audio_file = audio_file
+            scene.final_duration = max(scene.min_duration, duration + 1.0)
+
+            self.logger.debug(
+                f"Generated audio for {scene.scene_id}: "
+                f"{duration:.2f}s -> {scene.final_duration:.2f}s (voice: {scene.voice})"
+            )
+
+        except Exception as e:
+            raise AudioGenerationError(
+                f"Failed to generate audio for scene {scene.scene_id}: {e}",
+                stage=self.name,
+                details={"scene_id": scene.scene_id, "error": str(e)}
+            )
+
+    async def _synthesize(self, text: str, voice: str, audio_file: Path):
+        """Run one TTS request through the configured backend."""
+        if self.tts_backend is not None:
+            await self.tts_backend.synthesize(text, voice, audio_file, rate="+0%", volume="+0%")
+            return
+
+        communicate = edge_tts.Communicate(
+            text,
+            voice,
+            rate="+0%",
+            volume="+0%"
+        )
+        await communicate.save(str(audio_file))
+
+    async def _get_audio_duration(self, audio_file: Path) -> Optional[float]:
+        """Get audio file duration (parsed in-process, ffmpeg as fallback).
+
+        Returns:
+            Duration in seconds, or None if it couldn't be measured
+        """
+        duration = probe_duration(audio_file)
+        if duration is not None:
+            return duration
+
+        # ffmpeg is a blocking subprocess; keep it off the event loop
+        return await asyncio.to_thread(self._ffmpeg_duration, audio_file)
+
+    def _ffmpeg_duration(self, audio_file: Path) -> Optional[float]:
+        """Get audio file duration using ffmpeg (None if it can't be read)."""
         try:
             result = subprocess.run(
                 [config.ffmpeg_path, "-i", str(audio_file)],
                 capture_output=True,
                 text=True
             )
-
-            # Parse duration from ffmpeg output
-            for line in result.stderr.split('\n'):
-                if 'Duration:' in line:
-                    try:
-                        time_str = line.split('Duration:')[1].split(',')[0].strip()
-                        parts = time_str.split(':')
-                        if len(parts) != 3:
-                            continue
-                        h, m, s = parts
-                        duration = int(h) * 3600 + int(m) * 60 + float(s)
-                        return duration
-                    except (ValueError, IndexError):
-                        self.logger.warning(f"Failed to parse duration from line: {line}")
-
-            # Fallback
-            self.logger.warning(f"Could not determine duration for {audio_file}, using default")
-            return 5.0
-
         except Exception as e:
             self.logger.error(f"Error getting audio duration: {e}")
-            return 5.0
+            return None
+
+        return parse_ffmpeg_duration(result.stderr)
 
     async def _generate_timing_report(self, video_config: VideoConfig, output_dir: Path) -> Path:
         """Generate timing report JSON for UnifiedVideoGenerator."""
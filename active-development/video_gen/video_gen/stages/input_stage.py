@@ -2,7 +2,8 @@
 Input Adaptation Stage - Converts various input formats to VideoConfig.
 """
 
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Optional
 
 from ..pipeline.stage import Stage, StageResult
 from ..shared.models import InputConfig
@@ -26,6 +27,10 @@ class InputStage(Stage):
     - programmatic: Direct VideoConfig objects
     """
 
+    inputs = ("input_config",)
+    outputs = ("video_config", "input_metadata")
+    cacheable = True
+
     def __init__(self, event_emitter=None):
         super().__init__("input_adaptation", event_emitter)
 
@@ -37,6 +42,26 @@ class InputStage(Stage):
             "programmatic": ProgrammaticAdapter(),
         }
 
+    def cache_inputs(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Input config plus the source file's content for local files."""
+        inputs = super().cache_inputs(context)
+        input_config: InputConfig = context["input_config"]
+        input_type = input_config.input_type.lower()
+        if input_type == "programmatic":
+            return inputs
+
+        if input_type in ("document", "yaml") and isinstance(input_config.source, str):
+            source = Path(input_config.source.strip().strip('"').strip("'"))
+            try:
+                if source.is_file():
+                    inputs["source_file"] = source
+                    return inputs
+            except OSError:
+                pass
+
+        # URLs and YouTube videos can change without the input changing
+        return None
+
     async def execute(self, context: Dict[str, Any]) -> StageResult:
         """Execute input adaptation."""
 
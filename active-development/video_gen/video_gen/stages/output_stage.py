@@ -25,6 +25,9 @@ class OutputStage(Stage):
     - Organizes final outputs
     """
 
+    inputs = ("video_config", "final_video_path", "scene_videos", "video_dir", "timing_report")
+    outputs = ("final_video_path", "output_dir", "metadata_path", "thumbnail_path")
+
     def __init__(self, event_emitter=None):
         super().__init__("output_handling", event_emitter)
 
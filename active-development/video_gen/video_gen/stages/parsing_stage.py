@@ -19,6 +19,10 @@ class ParsingStage(Stage):
     - Prepares for script generation
     """
 
+    inputs = ("video_config",)
+    outputs = ("video_config",)
+    cacheable = True
+
     def __init__(self, event_emitter=None):
         super().__init__("content_parsing", event_emitter)
         self.parser = ContentParser()
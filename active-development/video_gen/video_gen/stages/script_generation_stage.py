@@ -2,7 +2,7 @@
 Script Generation Stage - Generates narration scripts for all scenes.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from ..pipeline.stage import Stage, StageResult
 from ..shared.models import VideoConfig
@@ -21,11 +21,21 @@ class ScriptGenerationStage(Stage):
     - Adds engagement and clarity
     """
 
+    inputs = ("video_config",)
+    outputs = ("video_config",)
+    cacheable = True
+
     def __init__(self, event_emitter=None):
         super().__init__("script_generation", event_emitter)
         self.narration_generator = NarrationGenerator()
         self.ai_enhancer = AIScriptEnhancer() if hasattr(config, "openai_api_key") and config.openai_api_key else None
 
+    def cache_inputs(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Video config plus whether AI enhancement rewrites the scripts."""
+        inputs = super().cache_inputs(context)
+        inputs["ai_enhanced"] = bool(self.ai_enhancer and config.get("enhance_scripts", False))
+        return inputs
+
     async def execute(self, context: Dict[str, Any]) -> StageResult:
         """Execute script generation."""
 
@@ -2,15 +2,17 @@
 Video Generation Stage - Generates videos from audio timing using template-based rendering.
 """
 
+import asyncio
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import json
 
 from ..pipeline.stage import Stage, StageResult
 from ..shared.models import VideoConfig
 from ..video_generator.unified import UnifiedVideoGenerator
+from ..video_generator.render_pool import get_render_pool, shutdown_render_pool
 from ..shared.config import config
-from ..shared.exceptions import VideoGenerationError
+from ..shared.exceptions import TaskCancelledError, VideoGenerationError
 
 
 class VideoGenerationStage(Stage):
@@ -24,8 +26,22 @@ class VideoGenerationStage(Stage):
     - Renders complete video with proper keyframe-based rendering
     """
 
-    def __init__(self, event_emitter=None):
+    inputs = ("video_config", "timing_report", "audio_dir")
+    outputs = ("final_video_path", "video_dir")
+    cacheable = True
+    # Keyframes only need the scenes' visual content, so they are rendered
+    # while the audio is still being synthesized
+    prepare_inputs = ("video_config",)
+
+    def __init__(self, event_emitter=None, render_workers: Optional[int] = None):
+        """
+        Args:
+            event_emitter: Optional event emitter for progress events
+            render_workers: Render worker processes (default:
+                config.render_workers; 0 renders in a thread instead)
+        """
         super().__init__("video_generation", event_emitter)
+        self.render_workers = config.render_workers if render_workers is None else render_workers
 
         # Initialize UnifiedVideoGenerator with proper configuration
         self.generator = UnifiedVideoGenerator(
@@ -34,6 +50,44 @@ class VideoGenerationStage(Stage):
             ffmpeg_path=config.ffmpeg_path if hasattr(config, 'ffmpeg_path') else None
         )
 
+    async def prepare(self, context: Dict[str, Any]):
+        """Pre-render scene keyframes into the generator's keyframe cache."""
+        video_config: VideoConfig = context["video_config"]
+        accent_color = config.get_color(str(video_config.accent_color).lower())
+        scenes = [
+            {"type": scene.scene_type, "visual_content": scene.visual_content}
+            for scene in video_config.scenes
+        ]
+
+        # Without a disk tier only the memory LRU can hold them, and render
+        # worker processes don't see this process's memory
+        cache = self.generator.keyframe_cache
+        if cache.cache_dir is None:
+            if self.render_workers > 0:
+                return
+            scenes = scenes[:cache.max_entries]
+
+        rendered = await asyncio.to_thread(self._prerender_keyframes, scenes, accent_color)
+        self.logger.info(f"Pre-rendered keyframes for {rendered}/{len(video_config.scenes)} scenes")
+
+    def _prerender_keyframes(self, scenes: List[Dict[str, Any]], accent_color: Tuple[int, int, int]) -> int:
+        rendered = 0
+        for scene in scenes:
+            if scene["type"] not in self.generator.renderers:
+                continue  # execute() reports unknown scene types
+            self.generator._render_scene_keyframes(scene, accent_color)
+            rendered += 1
+        return rendered
+
+    def cache_inputs(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Stage inputs plus the encoder settings, which change the video."""
+        inputs = super().cache_inputs(context)
+        inputs["encoder"] = (
+            config.video_encoder, config.video_encoder_preset,
+            config.video_encoder_tune, config.video_encoder_crf
+        )
+        return inputs
+
     async def execute(self, context: Dict[str, Any]) -> StageResult:
         """Execute video generation using UnifiedVideoGenerator."""
 
@@ -66,7 +120,7 @@ class VideoGenerationStage(Stage):
             # 4. Encode with GPU acceleration
             # 5. Mux with audio
 
-            final_video_path = self.generator._generate_single_video(timing_report_path)
+            final_video_path = await self._render(timing_report_path, context["task_id"])
 
             if not final_video_path or not final_video_path.exists():
                 raise VideoGenerationError(
@@ -110,6 +164,8 @@ class VideoGenerationStage(Stage):
                 }
             )
 
+        except TaskCancelledError:
+            raise
         except Exception as e:
             raise VideoGenerationError(
                 f"Video generation failed: {e}",
@@ -117,6 +173,29 @@ class VideoGenerationStage(Stage):
                 details={"error": str(e), "timing_report": str(timing_report_path)}
             )
 
+    async def _render(self, timing_report_path: Path, task_id: str) -> Optional[Path]:
+        """
+        Render off the event loop.
+
+        Rendering and encoding block for minutes, so they run in a render
+        worker process (or a thread if render_workers is 0). Either way the
+        task's cancellation stops the render between scenes and kills FFmpeg.
+        """
+        if self.render_workers <= 0:
+            return await asyncio.to_thread(self.generator._generate_single_video, timing_report_path)
+
+        async def on_progress(progress: float, message: str):
+            # Rendering spans 10%-90% of the stage; muxing follows
+            await self.emit_progress(task_id, 0.1 + 0.8 * progress, message)
+
+        # Shared by every stage in the process (see render_pool.py)
+        render_pool = get_render_pool(self.render_workers)
+        return await render_pool.render(self.generator, timing_report_path, on_progress)
+
+    def close(self):
+        """Stop the render worker processes."""
+        shutdown_render_pool()
+
     async def _render_simple_scene(
         self,
         scene,
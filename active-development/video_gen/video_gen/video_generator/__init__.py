@@ -7,9 +7,13 @@ Main classes:
 - UnifiedVideoGenerator: Complete video generation with multiple modes
 - TimingReport: Audio timing report data structure
 - VideoConfig: Video configuration data structure
+- EncoderBackend: FFmpeg video encoder selection (NVENC or CPU)
+- RenderPool: Runs renders in worker processes, off the event loop
 
 Functions:
 - generate_videos_from_timings: Legacy compatibility function
+- select_encoder: Probe FFmpeg and choose an encoder backend
+- get_render_pool / shutdown_render_pool: The process-wide RenderPool
 """
 
 from .unified import (
@@ -18,10 +22,17 @@ from .unified import (
     VideoConfig,
     generate_videos_from_timings,
 )
+from .encoders import EncoderBackend, select_encoder
+from .render_pool import RenderPool, get_render_pool, shutdown_render_pool
 
 __all__ = [
     "UnifiedVideoGenerator",
     "TimingReport",
     "VideoConfig",
     "generate_videos_from_timings",
+    "EncoderBackend",
+    "select_encoder",
+    "RenderPool",
+    "get_render_pool",
+    "shutdown_render_pool",
 ]
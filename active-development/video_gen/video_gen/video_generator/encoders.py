@@ -0,0 +1,222 @@
+"""
+Video Encoder Backends
+======================
+Selects the FFmpeg video encoder used by UnifiedVideoGenerator.
+
+The available encoders are probed once per FFmpeg binary with
+``ffmpeg -encoders``. NVENC is used when it is present and actually
+usable (a one-frame test encode succeeds); otherwise a tuned CPU encoder
+(libx264 or libx265) is used so the same pipeline runs on GPU-less nodes.
+
+Backends:
+- "nvenc": h264_nvenc on GPU 0
+- "libx264": CPU H.264 (default ``veryfast`` + ``stillimage`` tuning)
+- "libx265": CPU HEVC
+- "auto": NVENC when usable, else libx264 (libx265 if x264 is missing)
+"""
+
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENCODER_CHOICES = ("auto", "nvenc", "libx264", "libx265")
+
+# FFmpeg encoder name for each backend
+_FFMPEG_ENCODERS = {
+    "nvenc": "h264_nvenc",
+    "libx264": "libx264",
+    "libx265": "libx265",
+}
+
+# Tunes each CPU encoder accepts (x265 has no "stillimage")
+_VALID_TUNES = {
+    "libx264": {"film", "animation", "grain", "stillimage", "fastdecode", "zerolatency"},
+    "libx265": {"animation", "grain", "psnr", "ssim", "fastdecode", "zerolatency"},
+}
+
+
+@dataclass(frozen=True)
+class EncoderBackend:
+    """FFmpeg video encoder and its output options"""
+
+    name: str
+    codec: str
+    options: Tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def is_gpu(self) -> bool:
+        """Whether this backend encodes on the GPU"""
+        return self.name == "nvenc"
+
+    def output_args(self) -> List[str]:
+        """FFmpeg output arguments (codec, rate control, pixel format)"""
+        return ["-c:v", self.codec, *self.options, "-pix_fmt", "yuv420p"]
+
+
+def nvenc_backend() -> EncoderBackend:
+    """NVENC H.264 backend (GPU 0)"""
+    return EncoderBackend(
+        name="nvenc",
+        codec="h264_nvenc",
+        options=(
+            "-preset", "p4",
+            "-tune", "hq",
+            "-rc", "vbr",
+            "-cq", "20",
+            "-b:v", "8M",
+            "-maxrate", "12M",
+            "-bufsize", "16M",
+            "-gpu", "0",
+        ),
+    )
+
+
+def cpu_backend(
+    name: str = "libx264",
+    preset: str = "veryfast",
+    tune: Optional[str] = "stillimage",
+    crf: int = 20
+) -> EncoderBackend:
+    """
+    Tuned CPU backend (libx264 or libx265)
+
+    Args:
+        name: "libx264" or "libx265"
+        preset: x264/x265 speed preset
+        tune: Content tuning; ignored if the encoder does not support it
+        crf: Constant rate factor (lower is better quality)
+    """
+    if name not in _VALID_TUNES:
+        raise ValueError(f"Unknown CPU encoder: {name}")
+
+    options = ["-preset", preset, "-crf", str(crf)]
+    if tune:
+        if tune in _VALID_TUNES[name]:
+            options += ["-tune", tune]
+        else:
+            logger.debug(f"{name} does not support tune '{tune}', ignoring")
+    if name == "libx265":
+        # Tag for QuickTime/browser playback compatibility
+        options += ["-tag:v", "hvc1"]
+
+    return EncoderBackend(name=name, codec=name, options=tuple(options))
+
+
+@lru_cache(maxsize=None)
+def probe_encoders(ffmpeg_path: str) -> FrozenSet[str]:
+    """
+    List video encoders compiled into an FFmpeg binary (cached per path)
+
+    Returns an empty set if FFmpeg cannot be run.
+    """
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Could not probe FFmpeg encoders ({ffmpeg_path}): {e}")
+        return frozenset()
+
+    if result.returncode != 0:
+        return frozenset()
+
+    encoders = set()
+    for line in str(result.stdout).splitlines():
+        parts = line.split()
+        # Encoder lines look like: " V....D libx264  libx264 H.264 ..."
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] == "V":
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+@lru_cache(maxsize=None)
+def nvenc_usable(ffmpeg_path: str) -> bool:
+    """
+    Check that NVENC can actually encode (cached per path)
+
+    Builds often list h264_nvenc even without an NVIDIA GPU or driver, so
+    a one-frame test encode is used to confirm it works.
+    """
+    if "h264_nvenc" not in probe_encoders(ffmpeg_path):
+        return False
+
+    try:
+        result = subprocess.run(
+            [
+                ffmpeg_path, "-hide_banner", "-loglevel", "error",
+                "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+                "-frames:v", "1", "-c:v", "h264_nvenc",
+                "-f", "null", "-"
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+    return result.returncode == 0
+
+
+def select_encoder(
+    ffmpeg_path: str,
+    preference: str = "auto",
+    preset: str = "veryfast",
+    tune: Optional[str] = "stillimage",
+    crf: int = 20
+) -> EncoderBackend:
+    """
+    Choose an encoder backend for an FFmpeg binary
+
+    Args:
+        ffmpeg_path: FFmpeg executable to probe
+        preference: One of ENCODER_CHOICES
+        preset: CPU encoder speed preset
+        tune: CPU encoder content tuning
+        crf: CPU encoder constant rate factor
+
+    Returns:
+        EncoderBackend (falls back to a CPU encoder when the preferred one
+        is unavailable)
+    """
+    if preference not in ENCODER_CHOICES:
+        raise ValueError(
+            f"Unknown video encoder '{preference}', expected one of {ENCODER_CHOICES}"
+        )
+
+    if preference in ("auto", "nvenc"):
+        if nvenc_usable(ffmpeg_path):
+            return nvenc_backend()
+        if preference == "nvenc":
+            logger.warning("NVENC requested but not usable, falling back to CPU encoding")
+
+    available = probe_encoders(ffmpeg_path)
+    name = preference if preference in _VALID_TUNES else "libx264"
+    if available and _FFMPEG_ENCODERS[name] not in available:
+        fallback = next(
+            (n for n in ("libx264", "libx265") if _FFMPEG_ENCODERS[n] in available),
+            name
+        )
+        if fallback != name:
+            logger.warning(f"{name} not available in FFmpeg, using {fallback}")
+        name = fallback
+
+    return cpu_backend(name, preset=preset, tune=tune, crf=crf)
+
+
+__all__ = [
+    "ENCODER_CHOICES",
+    "EncoderBackend",
+    "nvenc_backend",
+    "cpu_backend",
+    "probe_encoders",
+    "nvenc_usable",
+    "select_encoder",
+]
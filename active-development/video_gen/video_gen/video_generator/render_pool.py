@@ -0,0 +1,203 @@
+"""
+Render Pool
+===========
+Runs UnifiedVideoGenerator renders in worker processes.
+
+Rendering frames and waiting on FFmpeg are CPU-bound and blocking. Run
+inline, they freeze the event loop that serves the web API and SSE
+streams, and a thread would still share one interpreter with it. A
+RenderPool sends each render to a process pool instead, so several
+renders use separate cores and the loop stays responsive.
+
+Per render, a manager-backed queue carries the generator's progress
+callbacks back to the loop and a manager event carries cancellation to
+the worker. In the worker, the event fires a CancellationToken, so the
+generator stops between scenes and kills its FFmpeg children exactly as
+it does in-process. The worker's timing spans and counters are sent back
+with the result and merged into the calling stage's metrics.
+
+The pipeline stages share one process-wide pool (get_render_pool()), so
+the number of render processes doesn't grow with the number of pipelines
+built. The application stops it on shutdown with shutdown_render_pool().
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..shared.cancellation import CancellationToken, cancellation_scope, on_cancel
+from ..shared.metrics import StageMetrics, merge_metrics
+
+logger = logging.getLogger(__name__)
+
+# How often the loop drains progress messages while a render runs (seconds)
+PROGRESS_POLL_INTERVAL = 0.25
+
+ProgressHandler = Callable[[float, str], Awaitable[None]]
+
+
+def _render_in_worker(
+    generator: Any,
+    timing_report_path: Path,
+    cancel_event: Any,
+    progress_queue: Any
+) -> Tuple[Optional[Path], Dict[str, Any]]:
+    """
+    Worker process: render one video
+
+    Module-level so it can be pickled by the process pool. Returns the
+    video and the worker's measurements.
+    """
+    token = CancellationToken()
+    done = threading.Event()
+
+    def watch_cancel():
+        while not done.is_set():
+            if cancel_event.wait(PROGRESS_POLL_INTERVAL):
+                token.cancel()
+                return
+
+    watcher = threading.Thread(target=watch_cancel, daemon=True)
+    watcher.start()
+
+    def report(stage: str, progress: float, message: str):
+        progress_queue.put((progress, message))
+
+    generator.progress_callback = report
+    render_metrics = StageMetrics("render")
+    try:
+        with cancellation_scope(token), render_metrics.measure():
+            video = generator._generate_single_video(timing_report_path)
+        return video, render_metrics.to_dict()
+    finally:
+        done.set()
+        watcher.join()
+
+
+class RenderPool:
+    """
+    Process pool for video renders.
+
+    Worker processes are started on first use with the ``spawn`` start
+    method, which is safe in a process already running threads (the web
+    server, asyncio.to_thread workers).
+
+    Args:
+        workers: Renders that run at once
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._context = multiprocessing.get_context("spawn")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._executor is None:
+                self._manager = self._context.Manager()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=self._context
+                )
+                logger.info(f"Render pool started with {self.workers} workers")
+            return self._executor, self._manager
+
+    async def render(
+        self,
+        generator: Any,
+        timing_report_path: Path,
+        on_progress: Optional[ProgressHandler] = None
+    ) -> Optional[Path]:
+        """
+        Render a video in a worker process.
+
+        Args:
+            generator: UnifiedVideoGenerator (a copy is sent to the worker;
+                only the disk tier of its keyframe cache goes with it)
+            timing_report_path: Timing report of the video
+            on_progress: Awaited with (progress, message) for each progress
+                report from the generator
+
+        Returns:
+            Path to the final video, or None if rendering failed
+
+        Raises:
+            TaskCancelledError: If the current task was cancelled
+        """
+        executor, manager = await asyncio.to_thread(self._start)
+        cancel_event = manager.Event()
+        progress_queue = manager.Queue()
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            executor, _render_in_worker,
+            generator, timing_report_path, cancel_event, progress_queue
+        )
+
+        try:
+            with on_cancel(cancel_event.set):
+                while True:
+                    done, _ = await asyncio.wait({future}, timeout=PROGRESS_POLL_INTERVAL)
+                    await self._drain(progress_queue, on_progress)
+                    if done:
+                        video, worker_metrics = future.result()
+                        merge_metrics(worker_metrics)
+                        return video
+        except asyncio.CancelledError:
+            # The worker only stops once told to
+            cancel_event.set()
+            raise
+
+    async def _drain(self, progress_queue: Any, on_progress: Optional[ProgressHandler]):
+        while True:
+            try:
+                progress, message = progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            if on_progress is not None:
+                await on_progress(progress, message)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._manager.shutdown()
+                self._executor = None
+                self._manager = None
+
+
+_shared_pool: Optional[RenderPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_render_pool(workers: int) -> RenderPool:
+    """
+    Get the process-wide render pool, creating it on first use.
+
+    Args:
+        workers: Renders that run at once (only used when the pool is
+            created)
+    """
+    global _shared_pool
+
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = RenderPool(workers)
+        return _shared_pool
+
+
+def shutdown_render_pool():
+    """Stop the process-wide pool's workers (a later render restarts them)."""
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.shutdown()
+
+
+__all__ = ['RenderPool', 'get_render_pool', 'shutdown_render_pool']
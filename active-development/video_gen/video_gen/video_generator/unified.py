@@ -5,18 +5,27 @@ Consolidates all video generation scripts with optimizations from v2 and v3.
 
 Features:
 - NumPy-accelerated frame blending (87% faster than PIL)
-- GPU encoding with NVENC
+- GPU encoding with NVENC, tuned libx264/libx265 fallback on CPU-only nodes
 - All 12 scene types supported
 - Smooth cubic easing transitions
 - Single, batch, and parallel modes
+- Streaming raw-frame encoding (no temp PNGs)
+- Lazy frame pipeline (memory bounded by a few frames)
+- Static holds rendered, written and encoded once as (frame, count) spans
+- Scene-parallel segment rendering joined with stream copy
 - Backward compatibility with legacy scripts
 
 Modes:
 - "fast": NumPy blending + GPU encoding (v3 optimized)
 - "baseline": PIL blending (v2 baseline)
 - "parallel": Concurrent scene processing (v3 parallel)
+
+scene_parallel=True renders and encodes each scene (plus its outgoing
+transition) to its own segment in a worker process, then joins the
+segments with FFmpeg's concat demuxer using -c copy.
 """
 
+import itertools
 import json
 import logging
 import os
@@ -26,10 +35,16 @@ import shutil
 import numpy as np
 from PIL import Image
 from pathlib import Path
-from typing import List, Optional, Callable, Literal, Dict, Any, Tuple
-from multiprocessing import Pool, cpu_count
+from typing import List, Optional, Callable, Literal, Dict, Any, Tuple, Iterable, Iterator
+from multiprocessing import Pool, TimeoutError as PoolTimeoutError, cpu_count, current_process
 from dataclasses import dataclass
 
+from .encoders import EncoderBackend, select_encoder
+from ..shared.config import config
+from ..shared.cancellation import kill_process, on_cancel, raise_if_cancelled, run_process
+from ..shared import metrics
+from ..shared.exceptions import TaskCancelledError
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,7 +57,8 @@ try:
         create_problem_keyframes, create_solution_keyframes,
         create_checkpoint_keyframes, create_quiz_keyframes,
         create_learning_objectives_keyframes, create_exercise_keyframes,
-        ease_out_cubic, FPS, WIDTH, HEIGHT
+        ease_out_cubic, FPS, WIDTH, HEIGHT,
+        KeyframeCache, keyframe_cache_key
     )
 except ImportError as e:
     logger.warning(f"Could not import rendering functions from renderers module: {e}")
@@ -59,6 +75,7 @@ except ImportError as e:
             create_learning_objectives_keyframes, create_exercise_keyframes,
             ease_out_cubic, FPS, WIDTH, HEIGHT
         )
+        from ..renderers.cache import KeyframeCache, keyframe_cache_key
     except ImportError:
         logger.error("Could not import rendering functions from either renderers module or legacy script")
         FPS = 30
@@ -69,6 +86,14 @@ except ImportError as e:
 TRANSITION_DURATION = 0.5
 ANIM_DURATION = 1.0
 
+# A frame shown for `count` consecutive video frames (count == 1 for
+# animated frames, count > 1 for static holds)
+FrameSpan = Tuple[np.ndarray, int]
+
+# MP4 track timescale shared by every streamed segment, so segments of
+# different frame rates join exactly with -c copy
+SEGMENT_TIMESCALE = FPS * 1000
+
 # FFmpeg path - cross-platform detection
 try:
     import imageio_ffmpeg
@@ -110,11 +135,12 @@ class UnifiedVideoGenerator:
 
     Features:
     - NumPy-accelerated frame blending (v3 optimization)
-    - GPU encoding with NVENC
+    - GPU encoding with NVENC (auto-detected, CPU encoder fallback)
     - All 12 scene types supported
     - Smooth cubic easing transitions
     - Single and batch modes
     - Optional parallel processing
+    - Streaming encoder (raw RGB frames piped into FFmpeg)
     """
 
     def __init__(
@@ -122,7 +148,12 @@ class UnifiedVideoGenerator:
         mode: Literal["fast", "baseline", "parallel"] = "fast",
         output_dir: Path = None,
         progress_callback: Optional[Callable] = None,
-        ffmpeg_path: str = FFMPEG_PATH
+        ffmpeg_path: str = FFMPEG_PATH,
+        streaming: bool = True,
+        encoder: Optional[EncoderBackend] = None,
+        scene_parallel: bool = False,
+        scene_workers: Optional[int] = None,
+        keyframe_cache: Optional[KeyframeCache] = None
     ):
         """
         Initialize video generator
@@ -132,12 +163,31 @@ class UnifiedVideoGenerator:
             output_dir: Where to save videos
             progress_callback: Progress reporting function
             ffmpeg_path: Path to FFmpeg executable
+            streaming: Pipe raw frames into FFmpeg's stdin instead of
+                writing temporary PNG files
+            encoder: Video encoder backend (detected from FFmpeg and
+                config.video_encoder on first use if not given)
+            scene_parallel: Render each scene to its own segment in a
+                worker process and join the segments with stream copy
+            scene_workers: Worker processes for scene_parallel
+                (default: number of CPUs)
+            keyframe_cache: Keyframe cache (default: memory LRU plus the
+                disk tier under config.cache_dir when enabled)
         """
         self.mode = mode
         self.output_dir = Path(output_dir) if output_dir else Path("./videos")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.progress_callback = progress_callback
         self.ffmpeg_path = ffmpeg_path
+        self.streaming = streaming
+        self._encoder = encoder
+        self.scene_parallel = scene_parallel
+        self.scene_workers = scene_workers or cpu_count()
+        if keyframe_cache is None:
+            keyframe_cache = KeyframeCache(
+                cache_dir=config.cache_dir / "keyframes" if config.keyframe_cache_enabled else None
+            )
+        self.keyframe_cache = keyframe_cache
 
         # Scene type to renderer mapping
         self.renderers = {
@@ -211,6 +261,7 @@ class UnifiedVideoGenerator:
         timing_report_path: Path
     ) -> Optional[Path]:
         """Generate single video from timing report"""
+        timing_data = None
         try:
             # Load timing report
             with open(timing_report_path) as f:
@@ -220,66 +271,220 @@ class UnifiedVideoGenerator:
             logger.info(f"GENERATING VIDEO: {timing_data['title']}")
             logger.info("=" * 80)
 
-            # Generate keyframes for each scene
-            frames = self._render_all_scenes(timing_data)
-
-            # Encode video
-            silent_video = self._encode_video(frames, timing_data['video_id'])
+            # Render scenes and encode video
+            # (spans are produced lazily and consumed by the encoder)
+            with metrics.span("encode"):
+                if self._use_scene_parallel(timing_data):
+                    silent_video = self._encode_scenes_parallel(timing_data)
+                elif self.streaming:
+                    spans = self._iter_frame_spans(timing_data)
+                    silent_video = self._encode_spans_stream(spans, timing_data['video_id'])
+                else:
+                    spans = self._iter_frame_spans(timing_data)
+                    silent_video = self._encode_spans(spans, timing_data['video_id'])
 
             # Process audio
-            audio_file = self._process_audio(timing_data)
+            with metrics.span("audio"):
+                audio_file = self._process_audio(timing_data)
 
             # Mux final video
-            final_video = self._mux_video_audio(silent_video, audio_file, timing_data)
+            with metrics.span("mux"):
+                final_video = self._mux_video_audio(silent_video, audio_file, timing_data)
 
             return final_video
 
+        except TaskCancelledError:
+            logger.info(f"Video generation cancelled: {timing_report_path}")
+            raise
         except Exception as e:
             logger.error(f"Error generating video: {e}", exc_info=True)
             return None
+        finally:
+            if timing_data is not None:
+                self._cleanup_temp_files(timing_data['video_id'])
+
+    def _cleanup_temp_files(self, video_id: str):
+        """Remove intermediate files left by a finished, failed or cancelled video"""
+        shutil.rmtree(Path(f"temp_audio_{video_id}"), ignore_errors=True)
+        silent_video = self.output_dir / f"{video_id}_silent.mp4"
+        try:
+            silent_video.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to remove {silent_video}: {e}")
 
     def _render_all_scenes(self, timing_data: Dict) -> List[np.ndarray]:
-        """Render all scenes and transitions"""
-        all_frames = []
+        """Render all scenes and transitions into a list of frames"""
+        return list(self._iter_frames(timing_data))
+
+    def _iter_frames(self, timing_data: Dict) -> Iterator[np.ndarray]:
+        """Lazily yield every frame of the video (scenes and transitions)"""
+        for frame, count in self._iter_frame_spans(timing_data):
+            for _ in range(count):
+                yield frame
+
+    def _iter_frame_spans(self, timing_data: Dict) -> Iterator[FrameSpan]:
+        """
+        Lazily yield the video as (frame, count) spans
+
+        Static holds come out as a single span, so rendering and frame
+        writing scale with the number of distinct frames rather than video
+        duration. Only the keyframes of the current and next scene are held
+        in memory, so peak usage is independent of video length.
+        """
+        # Determine accent color (convert to tuple for PIL operations)
+        accent_color = tuple(timing_data.get('accent_color', (59, 130, 246)))
+        scenes = timing_data['scenes']
+
+        total_frames = 0
+        distinct_frames = 0
+        for scene_num, scene in enumerate(scenes):
+            raise_if_cancelled()
+            if self.progress_callback:
+                self.progress_callback(
+                    stage="video",
+                    progress=scene_num / len(scenes),
+                    message=f"Rendering scene {scene_num + 1}/{len(scenes)}"
+                )
+            logger.info(f"[{scene_num + 1}/{len(scenes)}] {scene['scene_id']} ({scene['duration']:.2f}s)")
+
+            next_scene = scenes[scene_num + 1] if scene_num < len(scenes) - 1 else None
+            for frame, count in self._iter_segment_spans(scene, next_scene, accent_color):
+                total_frames += count
+                distinct_frames += 1
+                yield frame, count
 
+        logger.info(
+            f"Total frames: {total_frames} ({total_frames / FPS:.2f}s), "
+            f"{distinct_frames} distinct"
+        )
+
+    def _iter_segment_spans(
+        self,
+        scene: Dict,
+        next_scene: Optional[Dict],
+        accent_color: Tuple[int, int, int]
+    ) -> Iterator[FrameSpan]:
+        """Yield spans for one scene plus its transition into next_scene"""
         trans_frames = int(TRANSITION_DURATION * FPS)
         anim_frames = int(ANIM_DURATION * FPS)
 
-        # Determine accent color (convert to tuple for PIL operations)
+        # Render scene keyframes
+        start_frame, end_frame = self._render_scene_keyframes(scene, accent_color)
+
+        # Animate from start to end, then hold
+        yield from self._iter_scene_spans(
+            start_frame, end_frame,
+            anim_frames, scene['duration']
+        )
+
+        # Add transition to next scene
+        if next_scene is not None:
+            next_start, _ = self._render_scene_keyframes(next_scene, accent_color)
+
+            for frame in self._iter_transition_frames(
+                end_frame, next_start, trans_frames
+            ):
+                yield frame, 1
+
+    def _use_scene_parallel(self, timing_data: Dict) -> bool:
+        """Whether to render this video as parallel per-scene segments"""
+        if not self.scene_parallel or len(timing_data['scenes']) < 2:
+            return False
+        if current_process().daemon:
+            # Pool workers (e.g. _generate_parallel) cannot spawn children
+            logger.info("Scene-parallel disabled inside worker process")
+            return False
+        return True
+
+    def _encode_scenes_parallel(self, timing_data: Dict) -> Path:
+        """
+        Render and encode each scene to its own segment in parallel
+
+        Each worker renders one scene plus its outgoing transition and
+        streams it to an encoder. The segments are then joined with the
+        concat demuxer using -c copy, so nothing is re-encoded.
+        """
+        video_id = timing_data['video_id']
+        scenes = timing_data['scenes']
         accent_color = tuple(timing_data.get('accent_color', (59, 130, 246)))
 
-        for scene_num, scene in enumerate(timing_data['scenes']):
-            logger.info(f"[{scene_num + 1}/{len(timing_data['scenes'])}] {scene['scene_id']} ({scene['duration']:.2f}s)")
+        segment_dir = Path(f"temp_segments_{video_id}")
+        segment_dir.mkdir(exist_ok=True)
 
-            # Render scene keyframes
-            start_frame, end_frame = self._render_scene_keyframes(scene, accent_color)
+        # Resolve the encoder once so every segment uses identical settings
+        encoder = self.encoder
 
-            # Animate from start to end
-            scene_frames = self._animate_scene(
-                start_frame, end_frame,
-                anim_frames, scene['duration']
+        jobs = [
+            (
+                self.mode, self.ffmpeg_path, encoder, segment_dir,
+                f"segment_{i:04d}", scene,
+                scenes[i + 1] if i < len(scenes) - 1 else None,
+                accent_color
             )
-            all_frames.extend(scene_frames)
+            for i, scene in enumerate(scenes)
+        ]
 
-            # Add transition to next scene
-            if scene_num < len(timing_data['scenes']) - 1:
-                next_scene = timing_data['scenes'][scene_num + 1]
-                next_start, _ = self._render_scene_keyframes(next_scene, accent_color)
+        workers = min(self.scene_workers, len(jobs))
+        logger.info(f"Rendering {len(jobs)} scene segments with {workers} workers...")
 
-                transition_frames = self._render_transition(
-                    end_frame, next_start, trans_frames
-                )
-                all_frames.extend(transition_frames)
-
-        logger.info(f"Total frames: {len(all_frames)} ({len(all_frames) / FPS:.2f}s)")
-        return all_frames
+        try:
+            with Pool(workers) as executor:
+                pending = executor.map_async(_render_scene_segment, jobs)
+                # Leaving the block on cancellation terminates the workers
+                while True:
+                    try:
+                        results = pending.get(timeout=0.5)
+                        break
+                    except PoolTimeoutError:
+                        raise_if_cancelled()
+
+            # Segment timings were measured in the workers
+            segments = []
+            for segment, segment_metrics in results:
+                metrics.merge_metrics(segment_metrics)
+                segments.append(segment)
+
+            output_file = self.output_dir / f"{video_id}_silent.mp4"
+            self._concat_segments(segments, segment_dir, output_file)
+        finally:
+            # Cleanup with error handling
+            try:
+                shutil.rmtree(segment_dir)
+            except OSError as e:
+                logger.warning(f"Failed to remove temp directory {segment_dir}: {e}")
+
+        logger.info(f"✓ Video encoded ({len(segments)} segments)")
+        return output_file
 
     def _render_scene_keyframes(
         self,
         scene: Dict,
         accent_color: Tuple[int, int, int]
     ) -> Tuple[Image.Image, Image.Image]:
-        """Render keyframes for a scene"""
+        """Render keyframes for a scene (served from the keyframe cache when possible)"""
+        scene_type = scene['type']
+        if scene_type not in self.renderers:
+            raise ValueError(f"Unknown scene type: {scene_type}")
+
+        key = keyframe_cache_key(
+            scene_type,
+            scene.get('visual_content', {}),
+            tuple(accent_color)
+        )
+
+        def draw():
+            with metrics.span("draw"):
+                return self._draw_scene_keyframes(scene, accent_color)
+
+        with metrics.span("keyframes"):
+            return self.keyframe_cache.get_or_render(key, draw)
+
+    def _draw_scene_keyframes(
+        self,
+        scene: Dict,
+        accent_color: Tuple[int, int, int]
+    ) -> Tuple[Image.Image, Image.Image]:
+        """Draw keyframes for a scene with its PIL renderer"""
         scene_type = scene['type']
         visual = scene.get('visual_content', {})
 
@@ -386,8 +591,32 @@ class UnifiedVideoGenerator:
         scene_duration: float
     ) -> List[np.ndarray]:
         """Animate scene with easing"""
-        frames = []
+        return list(self._iter_scene_frames(
+            start_frame, end_frame, anim_frames, scene_duration
+        ))
 
+    def _iter_scene_frames(
+        self,
+        start_frame: Image.Image,
+        end_frame: Image.Image,
+        anim_frames: int,
+        scene_duration: float
+    ) -> Iterator[np.ndarray]:
+        """Lazily yield animated scene frames followed by the end-frame hold"""
+        for frame, count in self._iter_scene_spans(
+            start_frame, end_frame, anim_frames, scene_duration
+        ):
+            for _ in range(count):
+                yield frame
+
+    def _iter_scene_spans(
+        self,
+        start_frame: Image.Image,
+        end_frame: Image.Image,
+        anim_frames: int,
+        scene_duration: float
+    ) -> Iterator[FrameSpan]:
+        """Lazily yield animated scene frames, then the hold as one span"""
         if self.mode == "fast" or self.mode == "parallel":
             # NumPy acceleration (v3 optimization)
             start_np = np.array(start_frame, dtype=np.float32)
@@ -395,24 +624,20 @@ class UnifiedVideoGenerator:
 
             for i in range(anim_frames):
                 progress = ease_out_cubic(i / anim_frames)
-                blended = (start_np * (1 - progress) + end_np * progress).astype(np.uint8)
-                frames.append(blended)
+                yield (start_np * (1 - progress) + end_np * progress).astype(np.uint8), 1
         else:
             # PIL blending (v2 baseline)
             for i in range(anim_frames):
                 progress = ease_out_cubic(i / anim_frames)
                 blended = Image.blend(start_frame, end_frame, progress)
-                frames.append(np.array(blended, dtype=np.uint8))
+                yield np.array(blended, dtype=np.uint8), 1
 
         # Hold end frame
-        end_np = np.array(end_frame, dtype=np.uint8)
         total_scene_frames = int(scene_duration * FPS)
         hold_frames = total_scene_frames - anim_frames
 
-        for _ in range(hold_frames):
-            frames.append(end_np)
-
-        return frames
+        if hold_frames > 0:
+            yield np.array(end_frame, dtype=np.uint8), hold_frames
 
     def _render_transition(
         self,
@@ -421,8 +646,15 @@ class UnifiedVideoGenerator:
         trans_frames: int
     ) -> List[np.ndarray]:
         """Render transition between scenes"""
-        frames = []
+        return list(self._iter_transition_frames(frame1, frame2, trans_frames))
 
+    def _iter_transition_frames(
+        self,
+        frame1: Image.Image,
+        frame2: Image.Image,
+        trans_frames: int
+    ) -> Iterator[np.ndarray]:
+        """Lazily yield transition frames between scenes"""
         if self.mode == "fast" or self.mode == "parallel":
             # NumPy blending
             arr1 = np.array(frame1, dtype=np.float32)
@@ -430,82 +662,298 @@ class UnifiedVideoGenerator:
 
             for i in range(trans_frames):
                 progress = i / trans_frames
-                blended = (arr1 * (1 - progress) + arr2 * progress).astype(np.uint8)
-                frames.append(blended)
+                yield (arr1 * (1 - progress) + arr2 * progress).astype(np.uint8)
         else:
             # PIL blending
             for i in range(trans_frames):
                 progress = i / trans_frames
                 blended = Image.blend(frame1, frame2, progress)
-                frames.append(np.array(blended, dtype=np.uint8))
-
-        return frames
+                yield np.array(blended, dtype=np.uint8)
 
     def _encode_video(
         self,
-        frames: List[np.ndarray],
+        frames: Iterable[np.ndarray],
         video_id: str
     ) -> Path:
-        """Encode video with GPU acceleration (NVENC)"""
+        """Encode video via temp PNG files"""
+        return self._encode_spans(((frame, 1) for frame in frames), video_id)
+
+    def _encode_spans(
+        self,
+        spans: Iterable[FrameSpan],
+        video_id: str
+    ) -> Path:
+        """
+        Encode (frame, count) spans via temp PNGs and the concat demuxer
+
+        Each span is written as a single PNG whose concat ``duration``
+        covers all of its frames, so holds are encoded to disk only once.
+        """
         temp_dir = Path(f"temp_unified_{video_id}")
         temp_dir.mkdir(exist_ok=True)
+        try:
+            return self._encode_spans_in(temp_dir, spans, video_id)
+        finally:
+            # Cleanup with error handling
+            try:
+                shutil.rmtree(temp_dir)
+            except OSError as e:
+                logger.warning(f"Failed to remove temp directory {temp_dir}: {e}")
+
+    def _encode_spans_in(
+        self,
+        temp_dir: Path,
+        spans: Iterable[FrameSpan],
+        video_id: str
+    ) -> Path:
+        """Write span PNGs into temp_dir and encode them"""
+        logger.info("Writing frames...")
 
-        logger.info(f"Writing {len(frames)} frames...")
-
-        # Write frames to disk
-        for i, frame in enumerate(frames):
+        # Write one image per span to disk
+        # (timed: the frames are rendered as they are pulled)
+        entries = []
+        for i, (frame, count) in enumerate(metrics.timed(spans, "frames")):
             if i % 100 == 0:
-                logger.debug(f"  Frame {i}/{len(frames)}")
+                logger.debug(f"  Frame {i}")
 
             filename = temp_dir / f"frame_{i:05d}.png"
-            Image.fromarray(frame).save(filename, "PNG", compress_level=1)
+            with metrics.span("png_write"):
+                Image.fromarray(frame).save(filename, "PNG", compress_level=1)
+            metrics.count("frames", count)
+            metrics.count("bytes_written", filename.stat().st_size)
+            entries.append((filename, count))
+
+        if not entries:
+            raise ValueError(f"No frames to encode for {video_id}")
 
         # Create concat file
         concat_file = temp_dir / "concat.txt"
         with open(concat_file, 'w') as f:
-            frame_files = sorted(temp_dir.glob("frame_*.png"))
-            for i, fp in enumerate(frame_files):
+            for fp, count in entries:
                 f.write(f"file '{fp.absolute()}'\n")
-                if i < len(frame_files) - 1:
-                    f.write(f"duration {1/FPS}\n")
-            f.write(f"file '{frame_files[-1].absolute()}'\n")
+                f.write(f"duration {count / FPS}\n")
+            # The concat demuxer ignores the last duration unless the
+            # final file is repeated
+            f.write(f"file '{entries[-1][0].absolute()}'\n")
 
-        # Encode with GPU
+        # Encode
         output_file = self.output_dir / f"{video_id}_silent.mp4"
 
-        logger.info("GPU encoding video...")
+        logger.info(f"Encoding video with {self.encoder.name} ({len(entries)} distinct frames)...")
 
         cmd = [
             self.ffmpeg_path,
             "-y", "-f", "concat", "-safe", "0", "-i", str(concat_file),
-            "-c:v", "h264_nvenc",
-            "-preset", "p4",
-            "-tune", "hq",
-            "-rc", "vbr",
-            "-cq", "20",
-            "-b:v", "8M",
-            "-maxrate", "12M",
-            "-bufsize", "16M",
-            "-pix_fmt", "yuv420p",
-            "-gpu", "0",
+            # Resample the variable-duration images to constant FPS
+            "-vf", f"fps={FPS}",
+            *self._encoder_args(),
             str(output_file)
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        with metrics.span("ffmpeg"):
+            result = run_process(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
             logger.error(f"Encoding failed: {result.stderr[:300]}")
             raise RuntimeError("Video encoding failed")
 
-        # Cleanup with error handling
-        try:
-            shutil.rmtree(temp_dir)
-        except OSError as e:
-            logger.warning(f"Failed to remove temp directory {temp_dir}: {e}")
-
         logger.info("✓ Video encoded")
         return output_file
 
+    def _encode_video_stream(
+        self,
+        frames: Iterable[np.ndarray],
+        video_id: str
+    ) -> Path:
+        """Encode video by piping raw RGB frames into FFmpeg's stdin"""
+        return self._encode_spans_stream(((frame, 1) for frame in frames), video_id)
+
+    def _encode_spans_stream(
+        self,
+        spans: Iterable[FrameSpan],
+        video_id: str
+    ) -> Path:
+        """Encode (frame, count) spans by piping raw RGB frames into FFmpeg.
+
+        Frames are written to the encoder as they are consumed, so no
+        temporary PNGs are created. Consecutive single frames are streamed
+        into one encoder; a hold is piped and encoded once, as a one-frame
+        segment lasting the whole hold, so its cost does not depend on its
+        length. The segments are joined with the concat demuxer using
+        -c copy.
+        """
+        spans = iter(spans)
+        first_span = next(spans, None)
+        if first_span is None:
+            raise ValueError(f"No frames to encode for {video_id}")
+
+        expected_shape = first_span[0].shape
+        height, width = expected_shape[:2]
+        output_file = self.output_dir / f"{video_id}_silent.mp4"
+
+        logger.info(f"Streaming {width}x{height} frames to {self.encoder.name}...")
+
+        # Next to the output: scene-parallel workers reuse segment IDs
+        # across videos, but each video has its own output directory
+        segment_dir = self.output_dir / f"temp_stream_{video_id}"
+        segment_dir.mkdir(parents=True, exist_ok=True)
+        segments: List[Path] = []
+        process = None
+
+        def start_segment(rate: str):
+            nonlocal process
+            segment = segment_dir / f"part_{len(segments):04d}.mp4"
+            segments.append(segment)
+            process = self._start_segment_encoder(segment, width, height, rate)
+
+        def finish_segment():
+            nonlocal process
+            finished, process = process, None
+            self._finish_segment_encoder(finished)
+
+        frame_count = 0
+        try:
+            # Cancelling the task kills the running FFmpeg, which ends the
+            # segment with a BrokenPipeError
+            with on_cancel(lambda: process is not None and kill_process(process)):
+                # (timed: the frames are rendered as they are pulled)
+                for frame, count in metrics.timed(itertools.chain([first_span], spans), "frames"):
+                    if frame.shape != expected_shape:
+                        raise ValueError(
+                            f"Frame {frame_count} has shape {frame.shape}, "
+                            f"expected {expected_shape}"
+                        )
+                    buffer = memoryview(np.ascontiguousarray(frame, dtype=np.uint8))
+
+                    if count > 1:
+                        # The hold becomes its own segment, one frame long
+                        # at a frame rate of FPS/count
+                        if process is not None:
+                            finish_segment()
+                        start_segment(f"{FPS}/{count}")
+                    elif process is None:
+                        start_segment(str(FPS))
+
+                    try:
+                        with metrics.span("pipe_write"):
+                            process.stdin.write(buffer)
+                    except BrokenPipeError:
+                        # FFmpeg exited early; its stderr is reported here
+                        finish_segment()
+                        raise RuntimeError("Video encoding failed")
+
+                    if count > 1:
+                        finish_segment()
+                    frame_count += count
+                    metrics.count("frames", count)
+                    metrics.count("encoder_input_bytes", buffer.nbytes)
+
+                if process is not None:
+                    finish_segment()
+
+            if len(segments) == 1:
+                os.replace(segments[0], output_file)
+            else:
+                self._concat_segments(segments, segment_dir, output_file)
+        except BaseException:
+            if process is not None:
+                process.kill()
+                process.wait()
+            raise
+        finally:
+            # Cleanup with error handling
+            try:
+                shutil.rmtree(segment_dir)
+            except OSError as e:
+                logger.warning(f"Failed to remove temp directory {segment_dir}: {e}")
+
+        logger.info(f"✓ Video encoded ({frame_count} frames, {len(segments)} segments)")
+        return output_file
+
+    def _start_segment_encoder(
+        self,
+        output_file: Path,
+        width: int,
+        height: int,
+        rate: str
+    ) -> subprocess.Popen:
+        """Start an encoder reading raw RGB frames at ``rate`` fps from stdin"""
+        cmd = [
+            self.ffmpeg_path,
+            "-y", "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}",
+            "-r", rate,
+            "-i", "-",
+            *self._encoder_args(),
+            "-video_track_timescale", str(SEGMENT_TIMESCALE),
+            str(output_file)
+        ]
+
+        return subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+
+    def _finish_segment_encoder(self, process: subprocess.Popen):
+        """Close an encoder's input and wait for it to finish the segment"""
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        with metrics.span("ffmpeg_wait"):
+            stderr = process.stderr.read()
+            process.stderr.close()
+            returncode = process.wait()
+        raise_if_cancelled()
+
+        if returncode != 0:
+            logger.error(f"Encoding failed: {stderr.decode(errors='replace')[:300]}")
+            raise RuntimeError("Video encoding failed")
+
+    def _concat_segments(self, segments: List[Path], temp_dir: Path, output_file: Path):
+        """Join encoded segments with the concat demuxer (no re-encode)"""
+        concat_file = temp_dir / "segments.txt"
+        with open(concat_file, 'w') as f:
+            for segment in segments:
+                f.write(f"file '{Path(segment).absolute()}'\n")
+
+        cmd = [
+            self.ffmpeg_path,
+            "-y", "-f", "concat", "-safe", "0", "-i", str(concat_file),
+            "-c", "copy",
+            str(output_file)
+        ]
+
+        with metrics.span("concat"):
+            result = run_process(cmd, capture_output=True, text=True)
+
+        if result.returncode != 0:
+            logger.error(f"Segment concat failed: {result.stderr[:300]}")
+            raise RuntimeError("Video encoding failed")
+
+    @property
+    def encoder(self) -> EncoderBackend:
+        """Video encoder backend, probed from FFmpeg on first use"""
+        if self._encoder is None:
+            self._encoder = select_encoder(
+                self.ffmpeg_path,
+                preference=config.video_encoder,
+                preset=config.video_encoder_preset,
+                tune=config.video_encoder_tune,
+                crf=config.video_encoder_crf
+            )
+            logger.info(f"Video encoder: {self._encoder.name}")
+        return self._encoder
+
+    def _encoder_args(self) -> List[str]:
+        """FFmpeg output options for the selected video encoder"""
+        return self.encoder.output_args()
+
     def _process_audio(self, timing_data: Dict) -> Path:
         """Process and concatenate audio files"""
         temp_dir = Path(f"temp_audio_{timing_data['video_id']}")
@@ -573,7 +1021,7 @@ class UnifiedVideoGenerator:
             str(output_audio)
         ]
 
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        run_process(cmd, capture_output=True, text=True, check=True)
 
         return output_audio
 
@@ -598,14 +1046,16 @@ class UnifiedVideoGenerator:
             str(output_file)
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run_process(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
             logger.error(f"Muxing failed: {result.stderr[:300]}")
             raise RuntimeError("Audio muxing failed")
 
         # Get file size BEFORE cleanup
-        file_size = output_file.stat().st_size / (1024 * 1024)
+        file_bytes = output_file.stat().st_size
+        metrics.count("bytes_written", file_bytes)
+        file_size = file_bytes / (1024 * 1024)
         logger.info(f"✓ Complete: {file_size:.1f} MB, {timing_data['total_duration']:.1f}s")
 
         # Cleanup
@@ -616,6 +1066,29 @@ class UnifiedVideoGenerator:
         return output_file
 
 
+def _render_scene_segment(job: Tuple) -> Tuple[Path, Dict]:
+    """
+    Pool worker: render one scene (plus outgoing transition) to a segment
+
+    Module-level so it can be pickled by multiprocessing. Returns the
+    segment and the worker's measurements (see shared/metrics.py).
+    """
+    mode, ffmpeg_path, encoder, segment_dir, segment_id, scene, next_scene, accent_color = job
+
+    generator = UnifiedVideoGenerator(
+        mode=mode,
+        output_dir=segment_dir,
+        ffmpeg_path=ffmpeg_path,
+        streaming=True,
+        encoder=encoder
+    )
+    segment_metrics = metrics.StageMetrics(segment_id)
+    with segment_metrics.measure():
+        spans = generator._iter_segment_spans(scene, next_scene, accent_color)
+        segment = generator._encode_spans_stream(spans, segment_id)
+    return segment, segment_metrics.to_dict()
+
+
 # Backward compatibility functions
 def generate_videos_from_timings(timing_reports: List[Path], output_dir: Path):
     """Legacy function for backward compatibility"""
@@ -8,14 +8,26 @@ Enhanced to check MULTIPLE source types: markdown, audio scripts, JSON specs
 
 import os
 import re
+import sys
 import json
 import hashlib
+import importlib.util
 import subprocess
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from glob import glob
 
+# Duration probe shared with video_gen, loaded from its file so neither the
+# video_gen package nor its audio_generator siblings get imported
+_DURATION_PY = (Path(__file__).parent.parent / 'active-development' / 'video_gen'
+                / 'video_gen' / 'audio_generator' / 'duration.py')
+_spec = importlib.util.spec_from_file_location('video_gen_audio_duration', _DURATION_PY)
+_duration = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = _duration
+_spec.loader.exec_module(_duration)
+mp3_duration = _duration.mp3_duration
+
 class AudioAuditor:
     def __init__(self):
         self.results = {}
@@ -208,27 +220,32 @@ class AudioAuditor:
         return len(phrase_lines) // 6
 
     def get_audio_info(self, resource_id: int) -> Dict:
-        """Get audio file metadata using ffprobe"""
+        """Get audio file metadata (duration parsed from the MP3 headers)"""
         audio_file = self.audio_dir / f'resource-{resource_id}.mp3'
 
         if not audio_file.exists():
             return {'exists': False}
 
         try:
-            # Get duration
-            duration_cmd = [
-                'ffprobe', '-i', str(audio_file),
-                '-show_entries', 'format=duration',
-                '-v', 'quiet',
-                '-of', 'csv=p=0'
-            ]
-            duration = float(subprocess.check_output(duration_cmd).decode().strip())
+            # Read once for both the duration and the hash
+            data = audio_file.read_bytes()
+
+            # Get duration (ffprobe only if the headers can't be parsed)
+            duration = mp3_duration(data)
+            if duration is None:
+                duration_cmd = [
+                    'ffprobe', '-i', str(audio_file),
+                    '-show_entries', 'format=duration',
+                    '-v', 'quiet',
+                    '-of', 'csv=p=0'
+                ]
+                duration = float(subprocess.check_output(duration_cmd).decode().strip())
 
             # Get file size
-            file_size = audio_file.stat().st_size
+            file_size = len(data)
 
             # Get MD5 hash
-            md5_hash = hashlib.md5(audio_file.read_bytes()).hexdigest()
+            md5_hash = hashlib.md5(data).hexdigest()
 
             return {
                 'exists': True,
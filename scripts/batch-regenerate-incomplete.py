@@ -10,12 +10,15 @@ Options:
     --resource-id ID    Regenerate specific resource only
     --batch NUM         Process specific batch only (1 or 2)
     --verify-only       Only run verification, skip generation
+    --workers N         Resources processed at once (default: 3)
+    --fresh             Ignore resources recorded as done by an interrupted run
 """
 
 import os
 import sys
 import json
 import argparse
+import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional
 import subprocess
@@ -24,6 +27,15 @@ from datetime import datetime
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from batch_runner import Manifest, ResourceProgress, run_batch
+from tts_cache import TokenBucket
+
+DEFAULT_WORKERS = 3
+MANIFEST_FILE = Path(__file__).parent / 'batch-regenerate-manifest.json'
+
+# One edge-tts request per resource; shared by all workers
+TTS_LIMITER = TokenBucket(rate=0.5, burst=DEFAULT_WORKERS)
 
 RESOURCES = [
     {
@@ -256,71 +268,83 @@ def verify_audio(resource_id: int, expected_phrases: int) -> bool:
     print(f"  ✓ Audio verified: {file_size_mb:.2f} MB")
     return True
 
-def process_resource(resource: Dict, verify_only: bool = False) -> bool:
+def process_resource(resource: Dict, verify_only: bool = False,
+                     progress: Optional[ResourceProgress] = None) -> bool:
     """Process a single resource"""
 
-    print(f"\n{'='*70}")
-    print(f"Resource {resource['id']}: {resource['title']}")
-    print(f"Priority: {resource['priority']} | Missing: {resource['missing_phrases']} phrases")
-    print(f"{'='*70}")
+    say = progress or print
+
+    if progress is None:
+        print(f"\n{'='*70}")
+        print(f"Resource {resource['id']}: {resource['title']}")
+        print(f"Priority: {resource['priority']} | Missing: {resource['missing_phrases']} phrases")
+        print(f"{'='*70}")
+    else:
+        say(f"{resource['title']} (priority {resource['priority']}, "
+            f"missing {resource['missing_phrases']} phrases)")
 
     try:
         # Step 1: Extract phrases
-        print(f"  1. Extracting phrases from markdown...")
+        say(f"  1. Extracting phrases from markdown...")
         markdown_path = resource['markdown']
 
         phrases = extract_phrases_from_markdown(markdown_path)
 
         if not phrases:
-            print(f"  ✗ No phrases extracted from: {markdown_path}")
+            say(f"  ✗ No phrases extracted from: {markdown_path}")
             return False
 
-        print(f"  ✓ Extracted {len(phrases)} phrases")
+        say(f"  ✓ Extracted {len(phrases)} phrases")
 
         if verify_only:
             return verify_audio(resource['id'], len(phrases))
 
         # Step 2: Create compact script
-        print(f"  2. Creating compact tutorial script...")
+        say(f"  2. Creating compact tutorial script...")
         script = create_compact_script(resource, phrases)
         script_path = f"audio-specs/resource-{resource['id']}-compact.txt"
 
         os.makedirs('audio-specs', exist_ok=True)
         with open(script_path, 'w', encoding='utf-8') as f:
             f.write(script)
-        print(f"  ✓ Script created: {script_path}")
+        say(f"  ✓ Script created: {script_path}")
 
         # Step 3: Generate audio
-        print(f"  3. Generating audio...")
+        say(f"  3. Generating audio...")
         output_path = f"out/audio/resource-{resource['id']}.mp3"
         os.makedirs('out/audio', exist_ok=True)
 
         if not generate_audio_azure_tts(resource['id'], script_path, output_path):
-            print(f"  ⚠ Audio generation skipped - script ready for manual processing")
-            return True  # Script is ready, consider it a partial success
+            # Not done: left out of the manifest so the next run retries it
+            say(f"  ⚠ Audio not generated - script ready for manual processing")
+            return False
 
         # Step 4: Verify
-        print(f"  4. Verifying audio...")
+        say(f"  4. Verifying audio...")
         if verify_audio(resource['id'], len(phrases)):
-            print(f"  ✓ Resource {resource['id']} COMPLETE")
+            say(f"  ✓ Resource {resource['id']} COMPLETE")
             return True
         else:
-            print(f"  ✗ Resource {resource['id']} FAILED verification")
+            say(f"  ✗ Resource {resource['id']} FAILED verification")
             return False
 
     except Exception as e:
-        print(f"  ✗ ERROR: {str(e)}")
+        say(f"  ✗ ERROR: {str(e)}")
         import traceback
         traceback.print_exc()
         return False
 
-def main():
+async def main():
     """Main batch regeneration process"""
 
     parser = argparse.ArgumentParser(description='Batch regenerate incomplete resources')
     parser.add_argument('--resource-id', type=int, help='Regenerate specific resource only')
     parser.add_argument('--batch', type=int, choices=[1, 2], help='Process specific batch only')
     parser.add_argument('--verify-only', action='store_true', help='Only verify, skip generation')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Resources processed at once (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Ignore resources recorded as done by an interrupted run')
 
     args = parser.parse_args()
 
@@ -352,19 +376,27 @@ def main():
 
     print(f"Processing {len(resources_to_process)} resources...\n")
 
-    # Process resources
-    for resource in resources_to_process:
-        success = process_resource(resource, verify_only=args.verify_only)
+    # Process resources concurrently; generation runs are resumable
+    by_id = {r['id']: r for r in resources_to_process}
+    manifest = None
+    if not args.verify_only:
+        manifest = Manifest(MANIFEST_FILE, by_id)
+        if args.fresh:
+            manifest.reset()
+
+    async def process(resource_id: int, progress: ResourceProgress) -> bool:
+        if not args.verify_only:
+            await TTS_LIMITER.acquire()
+        return await asyncio.to_thread(
+            process_resource, by_id[resource_id], args.verify_only, progress
+        )
 
-        if success:
-            results['success'].append(resource['id'])
-            results['total_phrases'] += resource.get('total_phrases', 0)
-        else:
-            results['failed'].append(resource['id'])
+    batch = await run_batch(list(by_id), process, workers=args.workers, manifest=manifest)
 
-        # Small delay between resources to avoid API throttling
-        if not args.verify_only and len(resources_to_process) > 1:
-            time.sleep(3)
+    results['success'] = sorted(batch.succeeded + batch.skipped)
+    results['failed'] = sorted(batch.failed)
+    results['skipped'] = sorted(batch.skipped)
+    results['total_phrases'] = sum(by_id[rid].get('total_phrases', 0) for rid in results['success'])
 
     # Summary
     total_time = time.time() - total_start
@@ -375,6 +407,8 @@ def main():
     print(f"\nCompleted: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Total Time: {total_time/60:.1f} minutes")
     print(f"Successfully Processed: {len(results['success'])} resources")
+    if results['skipped']:
+        print(f"Already Done (manifest): {len(results['skipped'])} resources")
     print(f"Failed: {len(results['failed'])} resources")
 
     if results['success']:
@@ -396,4 +430,4 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(asyncio.run(main()))
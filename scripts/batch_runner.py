@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Concurrent batch runner shared by the regeneration scripts
+
+Regenerating the catalog one resource after another leaves the machine
+idle while each TTS request is in flight. run_batch() processes several
+resources at once instead; the TTS service is protected by the shared
+TokenBucket in tts_cache rather than by fixed sleeps between requests.
+
+Each finished resource is recorded in a JSON manifest, rewritten
+atomically after every completion. Records are kept per batch, i.e. per
+set of requested resource IDs: an interrupted (or partly failed) run
+started again with the same resources skips everything already done,
+while a one-off run of other resources neither skips nor clears them.
+Once every resource of a batch has succeeded its record is removed, so
+the next run of that batch starts fresh.
+
+    manifest = Manifest('scripts/regeneration-manifest.json', resource_ids)
+    result = await run_batch(resource_ids, regenerate, workers=4, manifest=manifest)
+
+``regenerate(resource_id, progress)`` is a coroutine returning True on
+success; ``progress(message)`` prints a line tagged with the resource ID,
+so the output of concurrent resources stays readable.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+Log = Callable[[str], Any]
+
+
+def batch_key(resource_ids: Iterable[Any]) -> str:
+    """Manifest key of a batch: its resource IDs, order-independent"""
+    return ','.join(sorted({str(resource_id) for resource_id in resource_ids}))
+
+
+class Manifest:
+    """
+    Record of completed resources, for resuming interrupted batches
+
+    Args:
+        path: JSON file holding the record (created on first completion)
+        batch: Resource IDs requested by this run; only the record of
+            this exact set is read, extended and reset
+    """
+
+    def __init__(self, path: Union[str, Path], batch: Iterable[Any]):
+        self.path = Path(path)
+        self.key = batch_key(batch)
+        # Records of every batch in the file, by batch key
+        self.batches: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                self.batches = data.get('batches', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable manifest {self.path}: {e}")
+        self.completed: Dict[str, Dict[str, Any]] = self.batches.get(self.key, {})
+
+    def is_done(self, resource_id) -> bool:
+        """Whether the resource finished in an earlier run"""
+        return str(resource_id) in self.completed
+
+    def mark_done(self, resource_id, **details):
+        """Record a finished resource and save the manifest"""
+        self.completed[str(resource_id)] = {
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            **details
+        }
+        self.batches[self.key] = self.completed
+        self.save()
+
+    def reset(self):
+        """Forget this batch's completed resources (other batches are kept)"""
+        self.completed.clear()
+        if self.batches.pop(self.key, None) is None:
+            return
+        if self.batches:
+            self.save()
+        else:
+            self.path.unlink(missing_ok=True)
+
+    def save(self):
+        """Write the manifest atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'batches': self.batches}, f, indent=2)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+class ResourceProgress:
+    """Progress lines for one resource, tagged with its ID"""
+
+    def __init__(self, resource_id, log: Log = print):
+        self.resource_id = resource_id
+        self.log = log
+
+    def __call__(self, message: str):
+        self.log(f"   [{self.resource_id}] {message}")
+
+    def step(self, done: int, total: int, message: str = ''):
+        """Report a count of finished units (phrases, lines)"""
+        percent = (done / total * 100) if total else 100.0
+        self(f"{done}/{total} ({percent:.0f}%) {message}".rstrip())
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch"""
+
+    succeeded: List[Any] = field(default_factory=list)
+    failed: List[Any] = field(default_factory=list)
+    skipped: List[Any] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+async def run_batch(
+    resource_ids: Iterable[Any],
+    process: Callable[[Any, ResourceProgress], Awaitable[bool]],
+    workers: int = 4,
+    manifest: Optional[Manifest] = None,
+    log: Log = print
+) -> BatchResult:
+    """
+    Process resources concurrently, at most ``workers`` at a time
+
+    Args:
+        resource_ids: Resources in the order they should be started
+        process: Coroutine function (resource_id, progress) -> success
+        workers: Resources processed at once
+        manifest: Completed resources are skipped and new completions
+            recorded; the batch's record is reset once all of it has
+            succeeded (None processes everything)
+        log: Function printing one line of output
+
+    Returns:
+        BatchResult (lists keep completion order)
+    """
+    result = BatchResult()
+    pending = []
+    for resource_id in resource_ids:
+        if manifest is not None and manifest.is_done(resource_id):
+            result.skipped.append(resource_id)
+        else:
+            pending.append(resource_id)
+
+    if result.skipped:
+        log(f"⏭️  Skipping {len(result.skipped)} resources already completed "
+            f"(manifest: {manifest.path})")
+
+    semaphore = asyncio.Semaphore(max(1, workers))
+    start = time.monotonic()
+
+    async def run_one(resource_id):
+        async with semaphore:
+            progress = ResourceProgress(resource_id, log)
+            progress("started")
+            resource_start = time.monotonic()
+            try:
+                success = await process(resource_id, progress)
+            except Exception as e:
+                progress(f"❌ {e}")
+                success = False
+            seconds = time.monotonic() - resource_start
+
+            if success:
+                result.succeeded.append(resource_id)
+                if manifest is not None:
+                    manifest.mark_done(resource_id, seconds=round(seconds, 1))
+            else:
+                result.failed.append(resource_id)
+
+            finished = len(result.succeeded) + len(result.failed)
+            status = "done" if success else "FAILED"
+            log(f"📦 {finished}/{len(pending)} finished - resource {resource_id} "
+                f"{status} in {seconds:.0f}s")
+
+    await asyncio.gather(*(run_one(resource_id) for resource_id in pending))
+    result.elapsed = time.monotonic() - start
+
+    if manifest is not None and not result.failed:
+        manifest.reset()
+    return result
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Language Detection Benchmark
+Measures accuracy and speed of scripts/language_detect.py on the
+regression corpus built from scripts/final-phrases-only/
+
+Also checks that the detectors give the same answers as the per-keyword
+implementations they replaced, on every line of those scripts.
+
+Usage:
+    python scripts/benchmark-language-detect.py
+    python scripts/benchmark-language-detect.py --min-accuracy 0.95 --show-errors
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from language_detect import (
+    CORPUS_DIR, build_corpus, detect_language, detect_languages, is_likely_english
+)
+
+
+def legacy_detect_language(text: str) -> str:
+    """Previous generate-wsl-audio.py detector (reference for speed/answers)"""
+    if re.search(r'[¿¡áéíóúüñ]', text):
+        return 'spanish'
+
+    spanish_words = [
+        'hola', 'tengo', 'su', 'entrega', 'español', 'gracias',
+        'día', 'gran', 'está', 'estoy', 'puede', 'quiere',
+        'necesito', 'disculpe', 'por favor', 'buenos', 'buenas',
+        'cómo', 'dónde', 'cuál', 'qué', 'soy', 'eres',
+        'usted', 'señor', 'señora', 'de', 'el', 'la',
+        'los', 'las', 'un', 'una', 'para', 'por', 'con'
+    ]
+
+    text_lower = text.lower()
+    for word in spanish_words:
+        pattern = r'\b' + re.escape(word) + r'\b'
+        if re.search(pattern, text_lower):
+            return 'spanish'
+
+    english_words = r'\b(hello|how|are|you|delivery|order|customer|thank|thanks|please|have|your|great|good|day|hi|morning|evening|night|yes|no|can|could|would|will|my|the|this|that|what|where|when|who|why|sorry|excuse|me)\b'
+    if re.search(english_words, text.lower()):
+        return 'english'
+
+    if re.search(r"(I'm|I am|you're|you are|it's|that's|what's)", text, re.IGNORECASE):
+        return 'english'
+
+    has_articles_the = re.search(r'\bthe\b', text_lower)
+    has_articles_el = re.search(r'\bel\b|\bla\b', text_lower)
+
+    if has_articles_the:
+        return 'english'
+    if has_articles_el:
+        return 'spanish'
+
+    return 'english'
+
+
+def legacy_is_likely_english(text: str) -> bool:
+    """Previous regenerate-from-source-complete.py check"""
+    text_lower = text.lower()
+
+    spanish_chars = ['á', 'é', 'í', 'ó', 'ú', 'ñ', '¿', '¡']
+    if any(char in text_lower for char in spanish_chars):
+        return False
+
+    spanish_words = [
+        'tengo', 'está', 'puede', 'gracias', 'por favor', 'aquí', 'pedido', 'días',
+        'usted', 'tenga', 'excelente', 'estoy', 'afuera', 'salir', 'dejé', 'puerta',
+        'solo', 'recojo', 'entrego', 'entregas', 'entrega', 'dejaré', 'edificio',
+        'apartamento', 'bolsa', 'orden', 'cliente', 'dirección', 'código',
+        'confirmación', 'propina', 'efectivo', 'restaurante'
+    ]
+    for word in spanish_words:
+        if re.search(r'\b' + re.escape(word) + r'\b', text_lower):
+            return False
+
+    return True
+
+
+def timed(func, *args, repeat: int = 5) -> float:
+    """Best wall time of several runs (seconds)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def accuracy(predicted, corpus) -> float:
+    return sum(p == label for p, (_, label) in zip(predicted, corpus)) / len(corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Spanish/English line detection')
+    parser.add_argument('--corpus-dir', default=str(CORPUS_DIR), help='Phrase scripts to build the corpus from')
+    parser.add_argument('--min-accuracy', type=float, default=0.0,
+                        help='Exit with status 1 if voice-routing accuracy is below this (0-1)')
+    parser.add_argument('--show-errors', action='store_true', help='List misclassified corpus lines')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.corpus_dir)
+    if not corpus:
+        print(f"❌ No labelled lines found in {args.corpus_dir}")
+        return 1
+
+    texts = [text for text, _ in corpus]
+    spanish_count = sum(label == 'spanish' for _, label in corpus)
+    print(f"📚 Corpus: {len(corpus)} lines ({len(corpus) - spanish_count} English, {spanish_count} Spanish)")
+
+    # Same answers as the implementations they replaced, on every script line
+    all_lines = []
+    for path in sorted(Path(args.corpus_dir).glob('*.txt')):
+        all_lines += [line.strip() for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+    mismatches = [line for line in all_lines if detect_language(line) != legacy_detect_language(line)]
+    mismatches += [line for line in all_lines if is_likely_english(line) != legacy_is_likely_english(line)]
+    batch_mismatch = detect_languages(all_lines) != [detect_language(line) for line in all_lines]
+    print(f"🔁 Parity with previous detectors on {len(all_lines)} lines: "
+          f"{'OK' if not mismatches and not batch_mismatch else 'MISMATCH'}")
+    for line in mismatches[:10]:
+        print(f"   ≠ {line[:80]}")
+
+    # Accuracy
+    routed = detect_languages(texts)
+    extraction = ['english' if is_likely_english(text) else 'spanish' for text in texts]
+    routing_accuracy = accuracy(routed, corpus)
+    print(f"🎯 Voice routing accuracy (detect_language): {routing_accuracy:.1%}")
+    print(f"🎯 Phrase extraction accuracy (is_likely_english): {accuracy(extraction, corpus):.1%}")
+
+    if args.show_errors:
+        for predicted, (text, label) in zip(routed, corpus):
+            if predicted != label:
+                print(f"   ✗ expected {label}, got {predicted}: {text[:80]}")
+
+    # Speed
+    legacy = timed(lambda: [legacy_detect_language(line) for line in all_lines])
+    single = timed(lambda: [detect_language(line) for line in all_lines])
+    batch = timed(detect_languages, all_lines)
+    per_line = 1e6 / len(all_lines)
+    print(f"⏱️  Previous detector: {legacy * per_line:7.2f} µs/line")
+    print(f"⏱️  detect_language:   {single * per_line:7.2f} µs/line ({legacy / single:.1f}x)")
+    print(f"⏱️  detect_languages:  {batch * per_line:7.2f} µs/line ({legacy / batch:.1f}x)")
+
+    if mismatches or batch_mismatch:
+        return 1
+    if routing_accuracy < args.min_accuracy:
+        print(f"❌ Accuracy below {args.min_accuracy:.1%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,14 +17,21 @@ import os
 import sys
 import argparse
 
-# Add ffmpeg to PATH BEFORE importing pydub
+# Add ffmpeg to PATH BEFORE running it
 os.environ['PATH'] = r'C:\ffmpeg\bin' + os.pathsep + os.environ.get('PATH', '')
 
 import asyncio
-import re
 from pathlib import Path
-from pydub import AudioSegment
-import edge_tts
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lesson_audio import LessonAudio
+from language_detect import detect_languages
+from tts_cache import TTSCache, TokenBucket
+
+# Synthesized segments, shared with the other audio scripts; new text is
+# sent to the TTS service at most 2 requests/second
+tts_cache = TTSCache(limiter=TokenBucket(2.0, burst=4))
 
 # ============================================================================
 # RESOURCE MAPPING - 19 ALIGNED RESOURCES
@@ -99,58 +106,13 @@ def get_voices_for_resource(resource_id: int) -> tuple:
 
     return (spanish, english)
 
-def detect_language(text: str) -> str:
-    """Detect if text is Spanish or English using word-boundary matching"""
-    # Spanish characters are definitive
-    if re.search(r'[¿¡áéíóúüñ]', text):
-        return 'spanish'
-
-    # Use word boundaries to match complete words only
-    spanish_words = [
-        'hola', 'tengo', 'su', 'entrega', 'español', 'gracias',
-        'día', 'gran', 'está', 'estoy', 'puede', 'quiere',
-        'necesito', 'disculpe', 'por favor', 'buenos', 'buenas',
-        'cómo', 'dónde', 'cuál', 'qué', 'soy', 'eres',
-        'usted', 'señor', 'señora', 'de', 'el', 'la',
-        'los', 'las', 'un', 'una', 'para', 'por', 'con'
-    ]
-
-    text_lower = text.lower()
-    for word in spanish_words:
-        pattern = r'\b' + re.escape(word) + r'\b'
-        if re.search(pattern, text_lower):
-            return 'spanish'
-
-    # English indicators
-    english_words = r'\b(hello|how|are|you|delivery|order|customer|thank|thanks|please|have|your|great|good|day|hi|morning|evening|night|yes|no|can|could|would|will|my|the|this|that|what|where|when|who|why|sorry|excuse|me)\b'
-    if re.search(english_words, text.lower()):
-        return 'english'
-
-    # Check for common English patterns
-    if re.search(r"(I'm|I am|you're|you are|it's|that's|what's)", text, re.IGNORECASE):
-        return 'english'
-
-    # Count definitive indicators
-    has_articles_the = re.search(r'\bthe\b', text_lower)
-    has_articles_el = re.search(r'\bel\b|\bla\b', text_lower)
-
-    if has_articles_the:
-        return 'english'
-    if has_articles_el:
-        return 'spanish'
-
-    # Default to English (safer for mixed/unclear content)
-    return 'english'
-
-async def generate_segment(text: str, voice: str, temp_file: str) -> bool:
-    """Generate audio for one text segment"""
+async def generate_segment(text: str, voice: str) -> Optional[Path]:
+    """Generate (or reuse) audio for one text segment"""
     try:
-        communicate = edge_tts.Communicate(text=text, voice=voice, rate="-20%")
-        await communicate.save(temp_file)
-        return True
+        return await tts_cache.synthesize(text, voice, rate="-20%")
     except Exception as e:
         print(f"   ⚠️  Error generating segment: {e}")
-        return False
+        return None
 
 async def generate_dual_voice_audio(resource_id: int):
     """
@@ -253,31 +215,23 @@ async def generate_dual_voice_audio(resource_id: int):
         print(f"   ❌ No content in script after filtering")
         return False
 
-    # Create temp directory
-    temp_dir = Path('temp_audio_segments')
-    temp_dir.mkdir(exist_ok=True)
-
     # Process each line into audio segments
-    segments = []
-    segment_count = 0
+    lesson = LessonAudio()
 
-    for i, line in enumerate(lines):
-        # Detect language
-        lang = detect_language(line)
+    # Detect the language of every line up front
+    languages = detect_languages(lines)
 
+    for i, (line, lang) in enumerate(zip(lines, languages)):
         # Get appropriate voice
         voice = spanish_voice if lang == 'spanish' else english_voice
 
-        # Generate this segment
-        temp_file = temp_dir / f'segment_{segment_count:03d}.mp3'
-
         print(f"   [{i+1}/{len(lines)}] {lang[:2].upper()}: {line[:50]}...")
 
-        if await generate_segment(line, voice, str(temp_file)):
+        segment_file = await generate_segment(line, voice)
+        if segment_file:
             try:
-                # Load the audio segment
-                audio = AudioSegment.from_mp3(str(temp_file))
-                segments.append(audio)
+                # Decode the audio segment
+                lesson.add_file(segment_file)
             except Exception as e:
                 print(f"   ⚠️  Error loading segment: {e}")
                 continue
@@ -285,37 +239,23 @@ async def generate_dual_voice_audio(resource_id: int):
             # Add pause after each line
             if lang == 'english':
                 # Longer pause after English (1 second)
-                segments.append(AudioSegment.silent(duration=1000))
+                lesson.add_silence(1000)
             else:
                 # Shorter pause after Spanish (500ms)
-                segments.append(AudioSegment.silent(duration=500))
+                lesson.add_silence(500)
 
-            segment_count += 1
-
-        await asyncio.sleep(0.5)  # Rate limiting
-
-    if not segments:
+    if not lesson:
         print(f"   ❌ No segments generated")
         return False
 
-    # Concatenate all segments
-    print(f"\n   🔄 Concatenating {len(segments)} segments...")
-    final_audio = segments[0]
-    for segment in segments[1:]:
-        final_audio += segment
-
-    # Export
+    # Encode all segments and pauses in a single ffmpeg run
     output_file = f'public/audio/resource-{resource_id}.mp3'
-    print(f"   💾 Exporting to {output_file}...")
-    final_audio.export(output_file, format='mp3', bitrate='128k')
+    print(f"\n   💾 Encoding {len(lesson)} segments to {output_file}...")
+    lesson.export_mp3(output_file, bitrate='128k')
 
     file_size = os.path.getsize(output_file) / (1024 * 1024)
     print(f"   ✅ COMPLETE: {file_size:.1f} MB")
 
-    # Cleanup temp files
-    import shutil
-    shutil.rmtree(temp_dir, ignore_errors=True)
-
     return True
 
 def parse_resource_list(args) -> list:
@@ -401,6 +341,7 @@ Examples:
         print(f"❌ Failed: {failed}")
 
     print(f"\n📁 Location: public/audio/")
+    print(f"🗄️  {tts_cache.summary()}")
     print("🎉 Batch complete!")
 
 if __name__ == '__main__':
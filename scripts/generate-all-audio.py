@@ -19,8 +19,15 @@ os.environ['PATH'] = r'C:\ffmpeg\bin' + os.pathsep + os.environ.get('PATH', '')
 import asyncio
 import re
 from pathlib import Path
+from typing import Optional
 from pydub import AudioSegment
-import edge_tts
+
+sys.path.insert(0, str(Path(__file__).parent))
+from tts_cache import TTSCache, TokenBucket
+
+# Synthesized segments, shared with the other audio scripts; new text is
+# sent to the TTS service at most 2 requests/second
+tts_cache = TTSCache(limiter=TokenBucket(2.0, burst=4))
 
 # Voice configuration - assign voices based on resource ID patterns
 def get_voices_for_resource(resource_id: int) -> tuple:
@@ -99,15 +106,13 @@ def detect_language(text: str) -> str:
     # Default to English (safer for mixed/unclear content)
     return 'english'
 
-async def generate_segment(text: str, voice: str, temp_file: str) -> bool:
-    """Generate audio for one text segment"""
+async def generate_segment(text: str, voice: str) -> Optional[Path]:
+    """Generate (or reuse) audio for one text segment"""
     try:
-        communicate = edge_tts.Communicate(text=text, voice=voice, rate="-20%")
-        await communicate.save(temp_file)
-        return True
+        return await tts_cache.synthesize(text, voice, rate="-20%")
     except Exception as e:
         print(f"   ⚠️  Error generating segment: {e}")
-        return False
+        return None
 
 async def generate_dual_voice_audio(resource_id: int):
     """
@@ -210,13 +215,8 @@ async def generate_dual_voice_audio(resource_id: int):
         print(f"   ❌ No content in script after filtering")
         return False
 
-    # Create temp directory
-    temp_dir = Path('temp_audio_segments')
-    temp_dir.mkdir(exist_ok=True)
-
     # Process each line into audio segments
     segments = []
-    segment_count = 0
 
     for i, line in enumerate(lines):
         # Detect language
@@ -225,15 +225,14 @@ async def generate_dual_voice_audio(resource_id: int):
         # Get appropriate voice
         voice = spanish_voice if lang == 'spanish' else english_voice
 
-        # Generate this segment
-        temp_file = temp_dir / f'segment_{segment_count:03d}.mp3'
-
         print(f"   [{i+1}/{len(lines)}] {lang[:2].upper()}: {line[:50]}...")
 
-        if await generate_segment(line, voice, str(temp_file)):
+        # Generate this segment
+        segment_file = await generate_segment(line, voice)
+        if segment_file:
             try:
                 # Load the audio segment
-                audio = AudioSegment.from_mp3(str(temp_file))
+                audio = AudioSegment.from_mp3(str(segment_file))
                 segments.append(audio)
             except Exception as e:
                 print(f"   ⚠️  Error loading segment: {e}")
@@ -247,10 +246,6 @@ async def generate_dual_voice_audio(resource_id: int):
                 # Shorter pause after Spanish (500ms)
                 segments.append(AudioSegment.silent(duration=500))
 
-            segment_count += 1
-
-        await asyncio.sleep(0.5)  # Rate limiting
-
     if not segments:
         print(f"   ❌ No segments generated")
         return False
@@ -269,10 +264,6 @@ async def generate_dual_voice_audio(resource_id: int):
     file_size = os.path.getsize(output_file) / (1024 * 1024)
     print(f"   ✅ COMPLETE: {file_size:.1f} MB")
 
-    # Cleanup temp files
-    import shutil
-    shutil.rmtree(temp_dir, ignore_errors=True)
-
     return True
 
 def parse_resource_list(args) -> list:
@@ -330,8 +321,6 @@ async def main():
             print(f"\n❌ Error processing resource {resource_id}: {e}")
             failed.append(resource_id)
 
-        await asyncio.sleep(2)  # Pause between resources
-
     print("\n" + "=" * 70)
     print(f"✅ Success: {success_count}/{len(resource_ids)} files generated")
 
@@ -339,6 +328,7 @@ async def main():
         print(f"❌ Failed: {failed}")
 
     print(f"\n📁 Location: public/audio/")
+    print(f"🗄️  {tts_cache.summary()}")
     print("🎉 Batch complete!")
 
 if __name__ == '__main__':
@@ -40,8 +40,15 @@ os.environ['PATH'] = wrapper_dir + os.pathsep + os.environ.get('PATH', '')
 import asyncio
 import re
 from pathlib import Path
+from typing import Optional
 from pydub import AudioSegment
-import edge_tts
+
+sys.path.insert(0, str(Path(__file__).parent))
+from tts_cache import TTSCache, TokenBucket
+
+# Synthesized segments, shared with the other audio scripts; new text is
+# sent to the TTS service at most 2 requests/second
+tts_cache = TTSCache(limiter=TokenBucket(2.0, burst=4))
 
 # Voice configuration for Resource 1
 SPANISH_VOICE = 'es-CO-SalomeNeural'  # Colombian female
@@ -71,15 +78,13 @@ def detect_language(text: str) -> str:
     # Default to English
     return 'english'
 
-async def generate_segment(text: str, voice: str, temp_file: str) -> bool:
-    """Generate audio for one text segment"""
+async def generate_segment(text: str, voice: str) -> Optional[Path]:
+    """Generate (or reuse) audio for one text segment"""
     try:
-        communicate = edge_tts.Communicate(text=text, voice=voice, rate="-20%")
-        await communicate.save(temp_file)
-        return True
+        return await tts_cache.synthesize(text, voice, rate="-20%")
     except Exception as e:
         print(f"   ⚠️  Error generating segment: {e}")
-        return False
+        return None
 
 async def generate_dual_voice_audio():
     """Generate concatenated dual-voice audio for Resource 1"""
@@ -156,13 +161,8 @@ async def generate_dual_voice_audio():
 
     print(f"   📝 Found {len(lines)} lines to process")
 
-    # Create temp directory
-    temp_dir = Path('temp_audio_segments')
-    temp_dir.mkdir(exist_ok=True)
-
     # Process each line into audio segments
     segments = []
-    segment_count = 0
 
     for i, line in enumerate(lines):
         # Detect language
@@ -171,15 +171,15 @@ async def generate_dual_voice_audio():
         # Get appropriate voice
         voice = SPANISH_VOICE if lang == 'spanish' else ENGLISH_VOICE
 
-        # Generate this segment
-        temp_file = temp_dir / f'segment_{segment_count:03d}.mp3'
-
         print(f"   [{i+1}/{len(lines)}] {lang[:2].upper()}: {line[:60]}...")
 
-        if await generate_segment(line, voice, str(temp_file)):
+        # Generate this segment
+        segment_file = await generate_segment(line, voice)
+        if segment_file:
             try:
-                # Load the audio segment using Windows ffmpeg
-                audio = AudioSegment.from_mp3(str(temp_file))
+                # Load the audio segment using Windows ffmpeg, which needs
+                # a relative path rather than a /mnt/... one
+                audio = AudioSegment.from_mp3(os.path.relpath(segment_file))
                 segments.append(audio)
             except Exception as e:
                 print(f"   ⚠️  Error loading segment: {e}")
@@ -191,10 +191,6 @@ async def generate_dual_voice_audio():
             else:
                 segments.append(AudioSegment.silent(duration=500))   # 0.5 seconds
 
-            segment_count += 1
-
-        await asyncio.sleep(0.5)  # Rate limiting
-
     if not segments:
         print(f"❌ No segments generated")
         return False
@@ -233,10 +229,7 @@ async def generate_dual_voice_audio():
     print(f"   ✅ COMPLETE!")
     print(f"   📊 File size: {file_size:.1f} MB")
     print(f"   ⏱️  Duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
-
-    # Cleanup temp files
-    import shutil
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    print(f"   🗄️  {tts_cache.summary()}")
 
     return True
 
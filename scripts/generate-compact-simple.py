@@ -9,13 +9,19 @@ import sys
 import asyncio
 import re
 from pathlib import Path
+from typing import Optional
 
-import edge_tts
+sys.path.insert(0, str(Path(__file__).parent))
+from tts_cache import TTSCache, TokenBucket
 
 # Voice configuration
 SPANISH_VOICE = 'es-CO-SalomeNeural'  # Female Colombian narrator
 ENGLISH_VOICE = 'en-US-JennyNeural'   # Female US voice for English phrases
 
+# Synthesized segments, shared with the other audio scripts; new text is
+# sent to the TTS service at most 2 requests/second
+tts_cache = TTSCache(limiter=TokenBucket(2.0, burst=4))
+
 def parse_compact_script(filepath: Path) -> list:
     """Parse compact tutorial script into audio segments"""
 
@@ -53,15 +59,13 @@ def parse_compact_script(filepath: Path) -> list:
 
     return segments
 
-async def generate_audio_segment(text: str, voice: str, rate: str, output_file: str) -> bool:
-    """Generate audio for one segment"""
+async def generate_audio_segment(text: str, voice: str, rate: str) -> Optional[Path]:
+    """Generate (or reuse) audio for one segment"""
     try:
-        communicate = edge_tts.Communicate(text=text, voice=voice, rate=rate)
-        await communicate.save(output_file)
-        return True
+        return await tts_cache.synthesize(text, voice, rate=rate)
     except Exception as e:
         print(f"❌ Error generating segment: {e}")
-        return False
+        return None
 
 async def generate_tutorial_audio(script_file: str, output_file: str):
     """Generate complete tutorial audio"""
@@ -75,26 +79,20 @@ async def generate_tutorial_audio(script_file: str, output_file: str):
     segments = parse_compact_script(script_path)
     print(f"✅ Found {len(segments)} audio segments")
 
-    # Create temp directory for segments
-    temp_dir = Path('temp_audio_segments')
-    temp_dir.mkdir(exist_ok=True)
-
     # Generate all audio segments
     segment_files = []
 
     for i, segment in enumerate(segments, 1):
         print(f"🎙️  [{i}/{len(segments)}] {segment['text'][:60]}...")
 
-        temp_file = temp_dir / f"seg_{i:04d}.mp3"
-        success = await generate_audio_segment(
+        segment_file = await generate_audio_segment(
             text=segment['text'],
             voice=segment['voice'],
-            rate=segment['rate'],
-            output_file=str(temp_file)
+            rate=segment['rate']
         )
 
-        if success and temp_file.exists():
-            segment_files.append(temp_file)
+        if segment_file:
+            segment_files.append(segment_file)
 
     print(f"\n✅ Generated {len(segment_files)}/{len(segments)} segments")
 
@@ -109,17 +107,6 @@ async def generate_tutorial_audio(script_file: str, output_file: str):
             with open(seg_file, 'rb') as infile:
                 outfile.write(infile.read())
 
-    # Clean up temp files
-    print("🧹 Cleaning up temporary files...")
-    for seg_file in segment_files:
-        try:
-            seg_file.unlink()
-        except:
-            pass
-
-    if temp_dir.exists() and not list(temp_dir.iterdir()):
-        temp_dir.rmdir()
-
     # Get file size
     file_size_mb = output_path.stat().st_size / (1024 * 1024)
 
@@ -127,6 +114,7 @@ async def generate_tutorial_audio(script_file: str, output_file: str):
     print(f"💾 File size: {file_size_mb:.1f} MB")
     print(f"📁 Output: {output_file}")
     print(f"📊 Segments: {len(segment_files)}")
+    print(f"🗄️  {tts_cache.summary()}")
 
     return True
 
@@ -17,13 +17,21 @@ ffmpeg_path = '/mnt/c/ffmpeg/bin'
 if os.path.exists(ffmpeg_path):
     os.environ['PATH'] = ffmpeg_path + os.pathsep + os.environ.get('PATH', '')
 
+from typing import Optional
+
 from pydub import AudioSegment
-import edge_tts
+
+sys.path.insert(0, str(Path(__file__).parent))
+from tts_cache import TTSCache, TokenBucket
 
 # Voice configuration
 SPANISH_VOICE = 'es-CO-SalomeNeural'  # Female Colombian narrator
 ENGLISH_VOICE = 'en-US-JennyNeural'   # Female US voice for English phrases
 
+# Synthesized segments, shared with the other audio scripts; new text is
+# sent to the TTS service at most 2 requests/second
+tts_cache = TTSCache(limiter=TokenBucket(2.0, burst=4))
+
 def parse_compact_script(filepath: Path) -> list:
     """Parse compact tutorial script into audio segments"""
 
@@ -63,15 +71,13 @@ def parse_compact_script(filepath: Path) -> list:
 
     return segments
 
-async def generate_audio_segment(text: str, voice: str, rate: str, temp_file: str) -> bool:
-    """Generate audio for one segment"""
+async def generate_audio_segment(text: str, voice: str, rate: str) -> Optional[Path]:
+    """Generate (or reuse) audio for one segment"""
     try:
-        communicate = edge_tts.Communicate(text=text, voice=voice, rate=rate)
-        await communicate.save(temp_file)
-        return True
+        return await tts_cache.synthesize(text, voice, rate=rate)
     except Exception as e:
         print(f"❌ Error generating segment: {e}")
-        return False
+        return None
 
 async def generate_tutorial_audio(script_file: str, output_file: str):
     """Generate complete tutorial audio"""
@@ -87,24 +93,20 @@ async def generate_tutorial_audio(script_file: str, output_file: str):
 
     # Generate audio segments
     final_audio = AudioSegment.empty()
-    temp_dir = Path('temp_audio')
-    temp_dir.mkdir(exist_ok=True)
 
     for i, segment in enumerate(segments, 1):
         print(f"🎙️  Generating segment {i}/{len(segments)}: {segment['text'][:50]}...")
 
-        temp_file = temp_dir / f"segment_{i}.mp3"
-        success = await generate_audio_segment(
+        segment_file = await generate_audio_segment(
             text=segment['text'],
             voice=segment['voice'],
-            rate=segment['rate'],
-            temp_file=str(temp_file)
+            rate=segment['rate']
         )
 
-        if success and temp_file.exists():
+        if segment_file:
             try:
                 # Load and append audio
-                audio = AudioSegment.from_file(str(temp_file), format='mp3')
+                audio = AudioSegment.from_file(str(segment_file), format='mp3')
                 final_audio += audio
 
                 # Add pause
@@ -112,19 +114,9 @@ async def generate_tutorial_audio(script_file: str, output_file: str):
                 final_audio += pause
             except Exception as e:
                 print(f"⚠️  Error loading segment {i}: {e}")
-
-            # Clean up temp file
-            try:
-                temp_file.unlink()
-            except:
-                pass
         else:
             print(f"⚠️  Skipping segment {i}")
 
-    # Clean up temp directory
-    if temp_dir.exists() and not list(temp_dir.iterdir()):
-        temp_dir.rmdir()
-
     # Export final audio
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -141,6 +133,7 @@ async def generate_tutorial_audio(script_file: str, output_file: str):
     print(f"📊 Duration: {duration_minutes:.1f} minutes ({duration_seconds:.0f} seconds)")
     print(f"💾 File size: {file_size_mb:.1f} MB")
     print(f"📁 Output: {output_file}")
+    print(f"🗄️  {tts_cache.summary()}")
 
     # Quality check
     if duration_minutes < 12 or duration_minutes > 15:
@@ -13,8 +13,15 @@ os.environ['PATH'] = r'C:\ffmpeg\bin' + os.pathsep + os.environ.get('PATH', '')
 import asyncio
 import re
 from pathlib import Path
+from typing import Optional
 from pydub import AudioSegment
-import edge_tts
+
+sys.path.insert(0, str(Path(__file__).parent))
+from tts_cache import TTSCache, TokenBucket
+
+# Synthesized segments, shared with the other audio scripts; new text is
+# sent to the TTS service at most 2 requests/second
+tts_cache = TTSCache(limiter=TokenBucket(2.0, burst=4))
 
 # Voice configuration for Resource #1 tutorial
 SPANISH_NARRATOR = 'es-CO-SalomeNeural'  # Warm, professional female narrator
@@ -53,15 +60,13 @@ def detect_language(text: str) -> str:
     # Default to Spanish for narrator segments
     return 'spanish'
 
-async def generate_segment(text: str, voice: str, temp_file: str, rate: str = "-20%") -> bool:
-    """Generate audio for one text segment"""
+async def generate_segment(text: str, voice: str, rate: str = "-20%") -> Optional[Path]:
+    """Generate (or reuse) audio for one text segment"""
     try:
-        communicate = edge_tts.Communicate(text=text, voice=voice, rate=rate)
-        await communicate.save(temp_file)
-        return True
+        return await tts_cache.synthesize(text, voice, rate=rate)
     except Exception as e:
         print(f"   ⚠️  Error generating segment: {e}")
-        return False
+        return None
 
 async def generate_tutorial_audio():
     """Generate tutorial audio from full tutorial script"""
@@ -117,13 +122,8 @@ async def generate_tutorial_audio():
 
     print(f"   📝 Processing {len(lines)} lines of content\n")
 
-    # Create temp directory
-    temp_dir = Path('temp_audio_segments')
-    temp_dir.mkdir(exist_ok=True)
-
     # Process each line into audio segments
     segments = []
-    segment_count = 0
 
     for i, line in enumerate(lines):
         # Detect language
@@ -137,16 +137,15 @@ async def generate_tutorial_audio():
             voice = ENGLISH_VOICE
             rate = "-20%"  # Slower for learning (80% speed)
 
-        # Generate this segment
-        temp_file = temp_dir / f'segment_{segment_count:03d}.mp3'
-
         preview = line[:60] + "..." if len(line) > 60 else line
         print(f"   [{i+1}/{len(lines)}] {lang[:2].upper()}: {preview}")
 
-        if await generate_segment(line, voice, str(temp_file), rate):
+        # Generate this segment
+        segment_file = await generate_segment(line, voice, rate)
+        if segment_file:
             try:
                 # Load the audio segment
-                audio = AudioSegment.from_mp3(str(temp_file))
+                audio = AudioSegment.from_mp3(str(segment_file))
                 segments.append(audio)
             except Exception as e:
                 print(f"   ⚠️  Error loading segment: {e}")
@@ -160,10 +159,6 @@ async def generate_tutorial_audio():
                 # Shorter pause after Spanish narrator (500ms)
                 segments.append(AudioSegment.silent(duration=500))
 
-            segment_count += 1
-
-        await asyncio.sleep(0.5)  # Rate limiting
-
     if not segments:
         print(f"\n   ❌ No segments generated")
         return False
@@ -187,12 +182,9 @@ async def generate_tutorial_audio():
     print(f"   📁 File: {output_file}")
     print(f"   💾 Size: {file_size:.1f} MB")
     print(f"   ⏱️  Duration: {duration/60:.1f} minutes ({duration:.0f} seconds)")
+    print(f"   🗄️  {tts_cache.summary()}")
     print("=" * 70)
 
-    # Cleanup temp files
-    import shutil
-    shutil.rmtree(temp_dir, ignore_errors=True)
-
     return True
 
 if __name__ == '__main__':
@@ -52,12 +52,28 @@ if not os.path.exists(ffprobe_wrapper):
 # Add wrapper directory to PATH
 os.environ['PATH'] = wrapper_dir + os.pathsep + os.environ.get('PATH', '')
 
-# Now safe to import pydub
+# Now safe to import modules that run ffmpeg
 import asyncio
-import re
+import subprocess
+from functools import lru_cache
 from pathlib import Path
-from pydub import AudioSegment
-import edge_tts
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lesson_audio import LessonAudio
+from language_detect import detect_languages
+from tts_cache import TTSCache, TokenBucket
+from batch_runner import Manifest, ResourceProgress, run_batch
+
+# Resources generated at once, and TTS requests/second across all of them
+DEFAULT_WORKERS = 3
+TTS_REQUESTS_PER_SECOND = 2.0
+TTS_BURST = 4
+
+MANIFEST_FILE = Path(__file__).parent / 'wsl-audio-manifest.json'
+
+# Synthesized segments, shared with the other audio scripts
+tts_cache = TTSCache(limiter=TokenBucket(TTS_REQUESTS_PER_SECOND, TTS_BURST))
 
 # ============================================================================
 # RESOURCE MAPPING - 19 ALIGNED RESOURCES
@@ -125,73 +141,40 @@ def get_voices_for_resource(resource_id: int) -> tuple:
 
     return (spanish, english)
 
-# ============================================================================
-# LANGUAGE DETECTION
-# ============================================================================
-
-def detect_language(text: str) -> str:
-    """Detect if text is Spanish or English using word-boundary matching"""
-    # Spanish characters are definitive
-    if re.search(r'[¿¡áéíóúüñ]', text):
-        return 'spanish'
-
-    # Use word boundaries to match complete words only
-    spanish_words = [
-        'hola', 'tengo', 'su', 'entrega', 'español', 'gracias',
-        'día', 'gran', 'está', 'estoy', 'puede', 'quiere',
-        'necesito', 'disculpe', 'por favor', 'buenos', 'buenas',
-        'cómo', 'dónde', 'cuál', 'qué', 'soy', 'eres',
-        'usted', 'señor', 'señora', 'de', 'el', 'la',
-        'los', 'las', 'un', 'una', 'para', 'por', 'con'
-    ]
-
-    text_lower = text.lower()
-    for word in spanish_words:
-        pattern = r'\b' + re.escape(word) + r'\b'
-        if re.search(pattern, text_lower):
-            return 'spanish'
-
-    # English indicators
-    english_words = r'\b(hello|how|are|you|delivery|order|customer|thank|thanks|please|have|your|great|good|day|hi|morning|evening|night|yes|no|can|could|would|will|my|the|this|that|what|where|when|who|why|sorry|excuse|me)\b'
-    if re.search(english_words, text.lower()):
-        return 'english'
-
-    # Check for common English patterns
-    if re.search(r"(I'm|I am|you're|you are|it's|that's|what's)", text, re.IGNORECASE):
-        return 'english'
-
-    # Count definitive indicators
-    has_articles_the = re.search(r'\bthe\b', text_lower)
-    has_articles_el = re.search(r'\bel\b|\bla\b', text_lower)
-
-    if has_articles_the:
-        return 'english'
-    if has_articles_el:
-        return 'spanish'
-
-    # Default to English (safer for mixed/unclear content)
-    return 'english'
-
 # ============================================================================
 # AUDIO GENERATION
 # ============================================================================
 
-async def generate_segment(text: str, voice: str, temp_file: str) -> bool:
-    """Generate audio for one text segment"""
+@lru_cache(maxsize=None)
+def ffmpeg_path_for(path: Path) -> str:
+    """
+    A segment path as the Windows ffmpeg.exe behind the wrapper can open it
+
+    WSL doesn't translate command-line arguments, so a Linux path such as
+    /mnt/c/.../.tts-cache/ab/<key>.mp3 means nothing to ffmpeg.exe.
+    """
+    try:
+        result = subprocess.run(['wslpath', '-w', str(path)], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        # No wslpath: a relative path reads the same on both sides
+        return os.path.relpath(path)
+
+async def generate_segment(text: str, voice: str) -> Optional[Path]:
+    """Generate (or reuse) audio for one text segment"""
     try:
-        communicate = edge_tts.Communicate(text=text, voice=voice, rate="-20%")
-        await communicate.save(temp_file)
-        return True
+        return await tts_cache.synthesize(text, voice, rate="-20%")
     except Exception as e:
         print(f"   ⚠️  Error generating segment: {e}")
-        return False
+        return None
 
-async def generate_dual_voice_audio(resource_id: int):
+async def generate_dual_voice_audio(resource_id: int, progress: Optional[ResourceProgress] = None):
     """
     Generate concatenated dual-voice audio from aligned audio script
 
     Args:
         resource_id: Resource ID (must be in RESOURCE_PATHS)
+        progress: Reporter tagging lines with the resource ID (batch runs)
     """
     # Get script path from mapping
     if resource_id not in RESOURCE_PATHS:
@@ -289,87 +272,50 @@ async def generate_dual_voice_audio(resource_id: int):
 
     print(f"   📝 Found {len(lines)} lines to process")
 
-    # Create temp directory
-    temp_dir = Path('temp_audio_segments')
-    temp_dir.mkdir(exist_ok=True)
-
     # Process each line into audio segments
-    segments = []
-    segment_count = 0
+    lesson = LessonAudio()
+    say = progress or (lambda message: print(f"   {message}"))
 
-    for i, line in enumerate(lines):
-        # Detect language
-        lang = detect_language(line)
+    # Detect the language of every line up front
+    languages = detect_languages(lines)
 
+    for i, (line, lang) in enumerate(zip(lines, languages)):
         # Get appropriate voice
         voice = spanish_voice if lang == 'spanish' else english_voice
 
-        # Generate this segment
-        temp_file = temp_dir / f'segment_{segment_count:03d}.mp3'
-
-        print(f"   [{i+1}/{len(lines)}] {lang[:2].upper()}: {line[:60]}...")
+        say(f"[{i+1}/{len(lines)}] {lang[:2].upper()}: {line[:60]}...")
 
-        if await generate_segment(line, voice, str(temp_file)):
+        segment_file = await generate_segment(line, voice)
+        if segment_file:
             try:
-                # Load the audio segment using Windows ffmpeg
-                audio = AudioSegment.from_mp3(str(temp_file))
-                segments.append(audio)
+                # Decode the audio segment using Windows ffmpeg
+                await asyncio.to_thread(lesson.add_file, ffmpeg_path_for(segment_file))
             except Exception as e:
                 print(f"   ⚠️  Error loading segment: {e}")
                 continue
 
             # Add pause after each line
             if lang == 'english':
-                segments.append(AudioSegment.silent(duration=1000))  # 1 second
+                lesson.add_silence(1000)  # 1 second
             else:
-                segments.append(AudioSegment.silent(duration=500))   # 0.5 seconds
+                lesson.add_silence(500)   # 0.5 seconds
 
-            segment_count += 1
-
-        await asyncio.sleep(0.5)  # Rate limiting
-
-    if not segments:
+    if not lesson:
         print(f"   ❌ No segments generated")
         return False
 
-    # Concatenate all segments
-    print(f"\n   🔄 Concatenating {len(segments)} segments...")
-    final_audio = segments[0]
-    for segment in segments[1:]:
-        final_audio += segment
-
-    # Export - use Windows-accessible temp directory for WAV conversion
+    # Encode all segments and pauses in a single ffmpeg run
     output_file = f'public/audio/resource-{resource_id}.mp3'
-    print(f"   💾 Exporting to {output_file}...")
-
-    # Save as WAV first (no encoding issues in WSL)
-    temp_wav = f'temp_resource_{resource_id}.wav'
-    final_audio.export(temp_wav, format='wav')
-
-    # Convert to MP3 using ffmpeg directly (with proper path handling)
-    import subprocess
-    subprocess.run([
-        'ffmpeg', '-y', '-i', temp_wav,
-        '-b:a', '128k',
-        '-f', 'mp3',
-        output_file
-    ], check=True)
-
-    # Cleanup WAV
-    if os.path.exists(temp_wav):
-        os.remove(temp_wav)
+    print(f"\n   💾 Encoding {len(lesson)} segments to {output_file}...")
+    await asyncio.to_thread(lesson.export_mp3, output_file, '128k')
 
     file_size = os.path.getsize(output_file) / (1024 * 1024)
-    duration = len(final_audio) / 1000  # Convert ms to seconds
+    duration = lesson.duration_seconds
 
     print(f"   ✅ COMPLETE!")
     print(f"   📊 File size: {file_size:.1f} MB")
     print(f"   ⏱️  Duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
 
-    # Cleanup temp files
-    import shutil
-    shutil.rmtree(temp_dir, ignore_errors=True)
-
     return True
 
 # ============================================================================
@@ -422,8 +368,16 @@ Examples:
     parser.add_argument('--resources', help='Comma-separated resource IDs (e.g., 2,5,7)')
     parser.add_argument('--group', type=int, choices=[1, 2], help='Generate group 1 (50-batch) or group 2 (audio-scripts)')
     parser.add_argument('--all', action='store_true', help='Generate all 19 aligned resources')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Resources generated at once (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--tts-rate', type=float, default=TTS_REQUESTS_PER_SECOND,
+                        help=f'TTS requests per second across all workers (default: {TTS_REQUESTS_PER_SECOND})')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Ignore resources recorded as done by an interrupted run')
 
     args = parser.parse_args()
+    if args.tts_rate <= 0:
+        parser.error('--tts-rate must be greater than 0')
 
     resource_ids = parse_resource_list(args)
 
@@ -441,30 +395,33 @@ Examples:
     print(f"📊 Generating {len(resource_ids)} of 19 resources: {resource_ids}")
     print("=" * 70 + "\n")
 
-    success_count = 0
-    failed = []
+    tts_cache.limiter = TokenBucket(args.tts_rate, TTS_BURST)
+    manifest = Manifest(MANIFEST_FILE, resource_ids)
+    if args.fresh:
+        manifest.reset()
 
-    for resource_id in resource_ids:
+    async def process(resource_id: int, progress: ResourceProgress) -> bool:
         try:
-            if await generate_dual_voice_audio(resource_id):
-                success_count += 1
-            else:
-                failed.append(resource_id)
+            return await generate_dual_voice_audio(resource_id, progress)
         except Exception as e:
             print(f"\n❌ Error processing resource {resource_id}: {e}")
             import traceback
             traceback.print_exc()
-            failed.append(resource_id)
+            return False
 
-        await asyncio.sleep(2)  # Pause between resources
+    result = await run_batch(resource_ids, process, workers=args.workers, manifest=manifest)
+    failed = sorted(result.failed)
 
     print("\n" + "=" * 70)
-    print(f"✅ Success: {success_count}/{len(resource_ids)} files generated")
+    print(f"✅ Success: {len(result.succeeded)}/{len(resource_ids)} files generated")
+    if result.skipped:
+        print(f"⏭️  Already done: {sorted(result.skipped)}")
 
     if failed:
         print(f"❌ Failed: {failed}")
 
     print(f"\n📁 Location: public/audio/")
+    print(f"🗄️  {tts_cache.summary()}")
     print("🎉 Batch complete!")
 
     return 0 if not failed else 1
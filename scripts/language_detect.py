@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Spanish/English line detection shared by the audio scripts
+
+The dual-voice generators route every script line to the Spanish or the
+English voice. They used to build and run one ``\\b<word>\\b`` regex per
+Spanish keyword (~40 per line), then a few more English checks. Those
+English checks could never change the answer: every path after the
+Spanish checks returned 'english'. A line is Spanish if it contains a
+Spanish-only character or any Spanish keyword, English otherwise.
+
+LanguageDetector compiles each keyword list into a single alternation
+regex once, at import, so a line costs at most two searches.
+detect_lines() classifies all lines of a script in one call.
+
+build_corpus() collects labelled lines from the phrase scripts in
+``final-phrases-only/``: a line spoken twice in a row is an English
+phrase, and the line right after the pair is its Spanish translation.
+scripts/benchmark-language-detect.py measures accuracy and speed on it.
+
+    from language_detect import detect_language, detect_languages
+    detect_language("¿Eres Sarah?")                 # 'spanish'
+    detect_languages(["Are you Sarah?", "Hola"])    # ['english', 'spanish']
+"""
+
+import re
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+# Keywords of the dual-voice generators (generate-wsl-audio.py,
+# generate-aligned-audio.py)
+SPANISH_WORDS = (
+    'hola', 'tengo', 'su', 'entrega', 'español', 'gracias',
+    'día', 'gran', 'está', 'estoy', 'puede', 'quiere',
+    'necesito', 'disculpe', 'por favor', 'buenos', 'buenas',
+    'cómo', 'dónde', 'cuál', 'qué', 'soy', 'eres',
+    'usted', 'señor', 'señora', 'de', 'el', 'la',
+    'los', 'las', 'un', 'una', 'para', 'por', 'con'
+)
+SPANISH_CHARS = '¿¡áéíóúüñ'
+
+# Keywords used when pulling English/Spanish pairs out of source files
+# (regenerate-from-source-complete.py)
+PHRASE_SPANISH_WORDS = (
+    # Common Spanish words
+    'tengo', 'está', 'puede', 'gracias', 'por favor', 'aquí', 'pedido', 'días',
+    'usted', 'tenga', 'excelente', 'estoy', 'afuera', 'salir', 'dejé', 'puerta',
+    # Delivery-specific words
+    'solo', 'recojo', 'entrego', 'entregas', 'entrega', 'dejaré', 'edificio',
+    'apartamento', 'bolsa', 'orden', 'cliente', 'dirección', 'código',
+    'confirmación', 'propina', 'efectivo', 'restaurante'
+)
+PHRASE_SPANISH_CHARS = '¿¡áéíóúñ'
+
+CORPUS_DIR = Path(__file__).parent / 'final-phrases-only'
+
+
+class LanguageDetector:
+    """
+    Classifies lines as 'spanish' or 'english' by Spanish-only evidence
+
+    Args:
+        spanish_words: Keywords matched as whole words in the lowercased line
+        spanish_chars: Characters that mark a line as Spanish
+        fold_chars: Also match the characters in uppercase (Á, Ñ, ...)
+    """
+
+    def __init__(self, spanish_words: Iterable[str], spanish_chars: str = SPANISH_CHARS,
+                 fold_chars: bool = False):
+        # Longest first, so a keyword is never shadowed by its own prefix
+        words = sorted(set(spanish_words), key=lambda w: (-len(w), w))
+        self.words_re = re.compile(r'\b(?:' + '|'.join(map(re.escape, words)) + r')\b')
+        self.chars_re = re.compile(
+            '[' + re.escape(spanish_chars) + ']', re.IGNORECASE if fold_chars else 0
+        )
+
+    def is_spanish(self, text: str) -> bool:
+        """Whether the line has any Spanish evidence"""
+        return bool(self.chars_re.search(text) or self.words_re.search(text.lower()))
+
+    def detect(self, text: str) -> str:
+        """'spanish' or 'english' (the default for unclear lines)"""
+        return 'spanish' if self.is_spanish(text) else 'english'
+
+    def detect_lines(self, lines: Iterable[str]) -> List[str]:
+        """Classify all lines of a script"""
+        # Bound once for the whole script instead of per line
+        has_char = self.chars_re.search
+        has_word = self.words_re.search
+        return ['spanish' if has_char(line) or has_word(line.lower()) else 'english'
+                for line in lines]
+
+
+detector = LanguageDetector(SPANISH_WORDS)
+phrase_detector = LanguageDetector(PHRASE_SPANISH_WORDS, PHRASE_SPANISH_CHARS, fold_chars=True)
+
+
+def detect_language(text: str) -> str:
+    """Voice routing for one script line: 'spanish' or 'english'"""
+    return detector.detect(text)
+
+
+def detect_languages(lines: Iterable[str]) -> List[str]:
+    """Voice routing for all lines of a script at once"""
+    return detector.detect_lines(lines)
+
+
+def is_likely_english(text: str) -> bool:
+    """Whether a line extracted from a source file is an English phrase"""
+    return not phrase_detector.is_spanish(text)
+
+
+def build_corpus(directory: Union[str, Path] = CORPUS_DIR) -> List[Tuple[str, str]]:
+    """
+    Labelled (line, language) pairs from the final phrase scripts
+
+    Only lines whose language follows from the script layout are used:
+    a line repeated on the next line is English, and the line after such
+    a pair is Spanish. Duplicates are kept once.
+    """
+    corpus = {}
+    for path in sorted(Path(directory).glob('*.txt')):
+        lines = [line.strip() for line in path.read_text(encoding='utf-8').splitlines()]
+        lines = [line for line in lines if line]
+        for i in range(len(lines) - 2):
+            english, repeat, translation = lines[i:i + 3]
+            if english == repeat and translation != english:
+                corpus.setdefault(english, 'english')
+                corpus.setdefault(translation, 'spanish')
+    return list(corpus.items())
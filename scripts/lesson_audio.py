@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Lesson audio assembly shared by the audio scripts
+
+Builds a lesson from many short TTS segments and pauses in linear time.
+The scripts used to concatenate pydub AudioSegments with ``+=``, which
+copies the whole accumulated buffer on every step (quadratic for a
+200-segment lesson), and then round-tripped the result through a
+temporary WAV file.
+
+LessonAudio instead keeps the decoded PCM of each segment as a separate
+chunk, plus shared silence buffers (one per pause length, reused by
+every lesson in the process). A file added more than once, such as a
+repeated phrase, is decoded once. export_mp3() streams all chunks
+straight into a single FFmpeg encode. Nothing is copied more than once
+and no intermediate file is written.
+
+    lesson = LessonAudio()
+    lesson.add_file('segment_000.mp3')
+    lesson.add_silence(1000)
+    lesson.export_mp3('public/audio/resource-2.mp3')
+"""
+
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Union
+
+# edge-tts output format; segments in other formats are converted to it
+SAMPLE_RATE = 24000
+CHANNELS = 1
+SAMPLE_WIDTH = 2  # 16-bit signed little-endian
+
+
+@lru_cache(maxsize=64)
+def _zeros(size: int) -> bytes:
+    return bytes(size)
+
+
+class LessonAudio:
+    """
+    Ordered PCM segments and pauses, encoded once at the end
+
+    Args:
+        sample_rate: Output sample rate in Hz
+        channels: Output channel count
+        ffmpeg: FFmpeg executable used to decode and encode
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS, ffmpeg: str = 'ffmpeg'):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.ffmpeg = ffmpeg
+        self.chunks: List[bytes] = []
+        self.total_bytes = 0
+        self._decoded: Dict[str, bytes] = {}
+
+    @property
+    def frame_size(self) -> int:
+        """Bytes per sample frame (all channels)"""
+        return SAMPLE_WIDTH * self.channels
+
+    @property
+    def duration_seconds(self) -> float:
+        """Length of the lesson so far"""
+        return self.total_bytes / (self.frame_size * self.sample_rate)
+
+    def __len__(self) -> int:
+        """Number of segments and pauses added"""
+        return len(self.chunks)
+
+    def add_pcm(self, pcm: bytes):
+        """Append raw PCM already in the lesson's format"""
+        if len(pcm) % self.frame_size:
+            raise ValueError(f"PCM length {len(pcm)} is not a whole number of frames")
+        self.chunks.append(pcm)
+        self.total_bytes += len(pcm)
+
+    def add_file(self, path: Union[str, Path]):
+        """Decode an audio file (e.g. a TTS segment) and append it"""
+        pcm = self._decoded.get(str(path))
+        if pcm is None:
+            pcm = self._decoded[str(path)] = self._decode(path)
+        self.add_pcm(pcm)
+
+    def _decode(self, path: Union[str, Path]) -> bytes:
+        result = subprocess.run(
+            [self.ffmpeg, '-v', 'error', '-i', str(path),
+             '-f', 's16le', '-acodec', 'pcm_s16le',
+             '-ar', str(self.sample_rate), '-ac', str(self.channels), '-'],
+            capture_output=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Could not decode {path}: {result.stderr.decode(errors='replace').strip()[:300]}"
+            )
+        return result.stdout
+
+    def add_segment(self, segment):
+        """Append a pydub AudioSegment (converted to the lesson's format)"""
+        segment = (segment
+                   .set_frame_rate(self.sample_rate)
+                   .set_channels(self.channels)
+                   .set_sample_width(SAMPLE_WIDTH))
+        self.add_pcm(segment.raw_data)
+
+    def silence(self, duration_ms: int) -> bytes:
+        """Exact-length digital silence, built once per duration"""
+        frames = round(self.sample_rate * duration_ms / 1000)
+        return _zeros(frames * self.frame_size)
+
+    def add_silence(self, duration_ms: int):
+        """Append a pause"""
+        if duration_ms > 0:
+            self.add_pcm(self.silence(duration_ms))
+
+    def export_mp3(self, output_file: Union[str, Path], bitrate: str = '128k') -> Path:
+        """
+        Encode the lesson to an MP3 in one FFmpeg run
+
+        The chunks are piped to FFmpeg's stdin as they are; the output
+        file is written directly (seekable), so it gets a Xing/LAME
+        header with the exact frame count.
+        """
+        if not self.chunks:
+            raise ValueError("Lesson is empty")
+
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        process = subprocess.Popen(
+            [self.ffmpeg, '-y', '-v', 'error',
+             '-f', 's16le', '-ar', str(self.sample_rate), '-ac', str(self.channels), '-i', '-',
+             '-codec:a', 'libmp3lame', '-b:a', bitrate, '-f', 'mp3',
+             str(output_file)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        try:
+            for chunk in self.chunks:
+                process.stdin.write(chunk)
+        except BrokenPipeError:
+            # FFmpeg exited early; its error is reported below
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+        stderr = process.stderr.read()
+        process.stderr.close()
+        if process.wait() != 0:
+            raise RuntimeError(
+                f"MP3 encode failed: {stderr.decode(errors='replace').strip()[:300]}"
+            )
+        return output_file
@@ -6,11 +6,14 @@ Processes existing phrase files from scripts/final-phrases-only/
 """
 
 import asyncio
-import edge_tts
 from pathlib import Path
 import re
 import sys
 from datetime import datetime
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from tts_cache import TTSCache, TokenBucket
 
 # Voice configuration
 SPANISH_VOICE = 'es-CO-SalomeNeural'
@@ -24,6 +27,10 @@ OUTPUT_DIR = BASE_DIR / 'public' / 'audio'
 # Ensure output directory exists
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Synthesized phrases, shared with the other audio scripts; new text is
+# sent to the TTS service at most 2 requests/second
+tts_cache = TTSCache(limiter=TokenBucket(2.0, burst=4))
+
 # Progress tracking
 total_resources = 0
 successful_resources = 0
@@ -70,8 +77,8 @@ def is_spanish(text: str) -> bool:
 
     return False
 
-async def generate_audio_for_phrase(text: str, output_path: Path) -> bool:
-    """Generate audio for a single phrase"""
+async def generate_audio_for_phrase(text: str) -> Optional[Path]:
+    """Generate (or reuse) audio for a single phrase"""
     try:
         voice = SPANISH_VOICE if is_spanish(text) else ENGLISH_VOICE
         lang_marker = "ES" if is_spanish(text) else "EN"
@@ -79,12 +86,10 @@ async def generate_audio_for_phrase(text: str, output_path: Path) -> bool:
         # Debug output
         print(f"  [{lang_marker}] {text[:50]}...")
 
-        communicate = edge_tts.Communicate(text, voice)
-        await communicate.save(str(output_path))
-        return True
+        return await tts_cache.synthesize(text, voice)
     except Exception as e:
         print(f"  ❌ ERROR generating phrase: {e}")
-        return False
+        return None
 
 async def concatenate_audio_files(audio_files: list, output_path: Path) -> bool:
     """Concatenate multiple audio files into one using binary concatenation"""
@@ -97,11 +102,6 @@ async def concatenate_audio_files(audio_files: list, output_path: Path) -> bool:
                     with open(audio_file, 'rb') as infile:
                         outfile.write(infile.read())
 
-        # Clean up temporary files
-        for audio_file in audio_files:
-            if audio_file.exists() and audio_file.parent.name == 'temp':
-                audio_file.unlink()
-
         return True
     except Exception as e:
         print(f"  ❌ ERROR concatenating audio: {e}")
@@ -177,29 +177,19 @@ async def generate_resource(resource_id: int) -> bool:
 
     print(f"  Found {len(phrases)} phrases")
 
-    # Create temp directory for individual audio files
-    temp_dir = OUTPUT_DIR / 'temp'
-    temp_dir.mkdir(exist_ok=True)
-
     # Generate audio for each phrase
-    temp_files = []
+    phrase_files = []
     for i, phrase in enumerate(phrases):
-        temp_file = temp_dir / f'resource-{resource_id}-phrase-{i}.mp3'
-        success = await generate_audio_for_phrase(phrase, temp_file)
-        if success:
-            temp_files.append(temp_file)
+        phrase_file = await generate_audio_for_phrase(phrase)
+        if phrase_file:
+            phrase_files.append(phrase_file)
         else:
             print(f"  ⚠️  Failed to generate phrase {i}")
 
     # Concatenate all audio files
     output_file = OUTPUT_DIR / f'resource-{resource_id}.mp3'
-    print(f"\n  Concatenating {len(temp_files)} audio files...")
-    success = await concatenate_audio_files(temp_files, output_file)
-
-    # Clean up temp directory
-    if temp_dir.exists():
-        import shutil
-        shutil.rmtree(temp_dir, ignore_errors=True)
+    print(f"\n  Concatenating {len(phrase_files)} audio files...")
+    success = await concatenate_audio_files(phrase_files, output_file)
 
     if success:
         file_size = output_file.stat().st_size / (1024 * 1024)  # MB
@@ -269,7 +259,8 @@ def print_summary():
     if skipped_resources:
         print(f"Skipped resources: {skipped_resources}")
 
-    print(f"\nCompleted at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n{tts_cache.summary()}")
+    print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
 
 async def main():
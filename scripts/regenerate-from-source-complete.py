@@ -25,11 +25,11 @@ STRUCTURE:
 import os
 import sys
 import json
+import argparse
 import re
 import time
-import subprocess
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple, Optional, Union
 
 # Add edge-tts support
 try:
@@ -41,12 +41,26 @@ except ImportError:
     print("⚠️  edge-tts not installed. Install with: pip install edge-tts")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).parent))
+from tts_cache import TTSCache, TokenBucket
+from lesson_audio import LessonAudio
+from language_detect import is_likely_english
+from batch_runner import Manifest, ResourceProgress, run_batch
+
 # Configuration - all paths relative to script's parent directory (project root)
 BASE_DIR = Path(__file__).parent.parent  # Go up from scripts/ to project root
 MASTER_MAPPING_FILE = BASE_DIR / "resource-full-paths.json"
 OUTPUT_DIR = BASE_DIR / "public/audio"
-TEMP_DIR = BASE_DIR / "temp-audio-generation"
 LOG_FILE = BASE_DIR / "scripts/complete-regeneration-log.txt"
+MANIFEST_FILE = BASE_DIR / "scripts/complete-regeneration-manifest.json"
+
+# Concurrency: resources in flight, and TTS requests/second across all of them
+DEFAULT_WORKERS = 4
+TTS_REQUESTS_PER_SECOND = 2.0
+TTS_BURST = 4
+
+# Synthesized segments, shared by all resources and runs
+TTS_CACHE = TTSCache(limiter=TokenBucket(TTS_REQUESTS_PER_SECOND, TTS_BURST))
 
 # Voice configuration - CONSISTENT for all resources
 SPANISH_VOICE = "es-CO-SalomeNeural"  # Colombian Spanish
@@ -341,51 +355,16 @@ def extract_phrases_from_spec_json(file_path: Path) -> List[Tuple[str, str]]:
         return []
 
 
-def is_likely_english(text: str) -> bool:
-    """Quick check if text is likely English."""
-    text_lower = text.lower()
-
-    # Spanish indicators - accented characters (check FIRST for highest accuracy)
-    spanish_chars = ['á', 'é', 'í', 'ó', 'ú', 'ñ', '¿', '¡']
-    if any(char in text_lower for char in spanish_chars):
-        return False
-
-    # Spanish indicators - common words and delivery-specific vocabulary (check SECOND)
-    # Use word boundaries to avoid false positives
-    spanish_words = [
-        # Common Spanish words
-        'tengo', 'está', 'puede', 'gracias', 'por favor', 'aquí', 'pedido', 'días',
-        'usted', 'tenga', 'excelente', 'estoy', 'afuera', 'salir', 'dejé', 'puerta',
-        # Delivery-specific words
-        'solo', 'recojo', 'entrego', 'entregas', 'entrega', 'dejaré', 'edificio',
-        'apartamento', 'bolsa', 'orden', 'cliente', 'dirección', 'código',
-        'confirmación', 'propina', 'efectivo', 'restaurante'
-    ]
-    # Use word boundary check for more accurate matching
-    for word in spanish_words:
-        if re.search(r'\b' + re.escape(word) + r'\b', text_lower):
-            return False
-
-    # English indicators (check LAST)
-    english_words = ['have', 'your', 'the', 'can', 'you', 'please', 'thank', 'order', 'delivery', 'good', 'morning',
-                     'are', 'here', 'left', 'outside', 'come', 'confirm', 'code', 'great', 'day']
-    for word in english_words:
-        if re.search(r'\b' + re.escape(word) + r'\b', text_lower):
-            return True
-
-    # Default to English if no strong indicators
-    return True
-
-
-def load_phrases_for_resource(resource_id: str, mapping: Dict) -> List[Tuple[str, str]]:
+def load_phrases_for_resource(resource_id: str, mapping: Dict,
+                              say: Callable[[str], Any] = log_message) -> List[Tuple[str, str]]:
     """Load English/Spanish phrase pairs for a resource."""
     source_file = find_source_file(resource_id, mapping)
 
     if not source_file:
-        log_message(f"  ❌ No source file found for resource {resource_id}")
+        say(f"  ❌ No source file found for resource {resource_id}")
         return []
 
-    log_message(f"  📄 Source: {source_file.name}")
+    say(f"  📄 Source: {source_file.name}")
 
     # Extract based on file type
     if source_file.suffix == '.md':
@@ -395,76 +374,67 @@ def load_phrases_for_resource(resource_id: str, mapping: Dict) -> List[Tuple[str
     elif source_file.suffix == '.json':
         phrases = extract_phrases_from_spec_json(source_file)
     else:
-        log_message(f"  ⚠️  Unknown file type: {source_file.suffix}")
+        say(f"  ⚠️  Unknown file type: {source_file.suffix}")
         return []
 
-    log_message(f"  ✓ Extracted {len(phrases)} phrase pairs")
+    say(f"  ✓ Extracted {len(phrases)} phrase pairs")
     return phrases
 
 
-async def generate_silence_mp3(duration_ms: int, output_file: Path) -> bool:
-    """Generate a silent MP3 file using edge-tts."""
-    try:
-        # Generate a very short silent audio with edge-tts
-        # We'll use a space character which produces minimal audio
-        communicate = edge_tts.Communicate(" ", SPANISH_VOICE, rate="+0%")
-
-        temp_silent = TEMP_DIR / "temp_silence.mp3"
-        await communicate.save(str(temp_silent))
-
-        # Use ffmpeg to create exact duration silence
-        duration_sec = duration_ms / 1000.0
-        cmd = [
-            'ffmpeg', '-f', 'lavfi', '-i', f'anullsrc=r=44100:cl=stereo',
-            '-t', str(duration_sec), '-y', '-ar', '44100', '-ac', '2',
-            '-b:a', '128k', str(output_file)
-        ]
+class Pause(NamedTuple):
+    """Silence between segments; rendered as exact-length PCM, not synthesized."""
+    duration_ms: int
 
-        # SKIP: ffmpeg not available in WSL
-        # Natural pauses between TTS segments provide sufficient breaks
-        return True  # Return True but don't create pause file
 
-    except Exception as e:
-        # Silence errors are non-critical, continue without pauses
-        return True
+# A lesson is an ordered list of TTS segment files and pauses
+Segment = Union[Path, Pause]
 
 
 async def synthesize_text(text: str, voice: str, rate: str = "+0%") -> Optional[Path]:
-    """Synthesize text to speech using edge-tts, return temp file path."""
+    """Synthesize text to speech, return the (shared) cached file path."""
     try:
-        communicate = edge_tts.Communicate(text, voice, rate=rate)
-
-        # Create unique temp file
-        temp_file = TEMP_DIR / f"tts_{int(time.time() * 1000)}_{hash(text) % 10000}.mp3"
-        await communicate.save(str(temp_file))
-
-        return temp_file
+        return await TTS_CACHE.synthesize(text, voice, rate)
 
     except Exception as e:
         log_message(f"  ⚠️  TTS error: {e}")
         return None
 
 
-async def concatenate_audio_files(file_list: List[Path], output_file: Path) -> bool:
-    """Concatenate audio files using binary concatenation (no ffmpeg needed)."""
-    try:
-        # Simple binary concatenation - works for MP3 without ffmpeg
-        with open(output_file, 'wb') as outfile:
-            for audio_file in file_list:
-                if audio_file and audio_file.exists():
-                    with open(audio_file, 'rb') as infile:
-                        outfile.write(infile.read())
+def build_lesson_audio(segments: List[Segment], output_file: Path) -> LessonAudio:
+    """Decode segments, insert pauses and encode one MP3 (blocking)."""
+    lesson = LessonAudio()
+    for segment in segments:
+        if isinstance(segment, Pause):
+            lesson.add_silence(segment.duration_ms)
+        elif segment:
+            lesson.add_file(segment)
+    lesson.export_mp3(output_file, bitrate='128k')
+    return lesson
+
+
+async def concatenate_audio_files(segments: List[Segment], output_file: Path,
+                                  say: Callable[[str], Any] = log_message) -> bool:
+    """
+    Encode segments and pauses into a single MP3.
 
+    Every segment is decoded to PCM and the whole lesson is encoded once,
+    so the output has one Xing/LAME header and an exact duration (byte
+    concatenation left each segment's ID3 and Xing frames in the middle
+    of the stream, which broke duration reporting in browsers).
+    """
+    try:
+        lesson = await asyncio.to_thread(build_lesson_audio, segments, output_file)
+        say(f"  ⏱️  Duration: {lesson.duration_seconds / 60:.1f} minutes")
         return True
     except Exception as e:
-        log_message(f"  ⚠️  Concatenation error: {e}")
+        say(f"  ⚠️  Concatenation error: {e}")
         return False
 
 
 async def generate_phrase_audio(english: str, spanish: str, phrase_num: int,
-                               resource_type: str = 'basic_phrases') -> List[Path]:
+                               resource_type: str = 'basic_phrases') -> List[Segment]:
     """
-    Generate audio segments for a single phrase, return list of temp files.
+    Generate audio segments for a single phrase, return segment files and pauses.
 
     Args:
         english: English phrase text
@@ -499,19 +469,14 @@ async def generate_phrase_audio(english: str, spanish: str, phrase_num: int,
             segments.append(english_file_1)
 
         # 3. Pause 1
-        pause1 = TEMP_DIR / f"pause1_{phrase_num}.mp3"
-        if await generate_silence_mp3(pauses['after_english_1'], pause1):
-            segments.append(pause1)
+        segments.append(Pause(pauses['after_english_1']))
 
         # 4. English phrase (repeat) - ALWAYS for all types (proper repetition)
-        english_file_2 = await synthesize_text(english, ENGLISH_VOICE, english_speed)
-        if english_file_2:
-            segments.append(english_file_2)
+        if english_file_1:
+            segments.append(english_file_1)
 
         # 5. Pause 2 - always include
-        pause2 = TEMP_DIR / f"pause2_{phrase_num}.mp3"
-        if await generate_silence_mp3(pauses['after_english_2'], pause2):
-            segments.append(pause2)
+        segments.append(Pause(pauses['after_english_2']))
 
         # 6. Spanish translation
         spanish_file = await synthesize_text(spanish, SPANISH_VOICE, SPANISH_SPEED)
@@ -519,9 +484,7 @@ async def generate_phrase_audio(english: str, spanish: str, phrase_num: int,
             segments.append(spanish_file)
 
         # 7. Pause 3 (for learner repetition/thinking)
-        pause3 = TEMP_DIR / f"pause3_{phrase_num}.mp3"
-        if await generate_silence_mp3(pauses['after_spanish'], pause3):
-            segments.append(pause3)
+        segments.append(Pause(pauses['after_spanish']))
 
         return segments
 
@@ -571,7 +534,7 @@ async def generate_introduction(phrase_count: int, resource_type: str = 'basic_p
 
 
 async def generate_practice(phrases: List[Tuple[str, str]],
-                           resource_type: str = 'basic_phrases') -> List[Path]:
+                           resource_type: str = 'basic_phrases') -> List[Segment]:
     """Generate practice section adapted to resource type."""
     segments = []
     pauses = PAUSE_CONFIGS[resource_type]
@@ -590,9 +553,7 @@ async def generate_practice(phrases: List[Tuple[str, str]],
         segments.append(intro_file)
 
         # Add pause after intro
-        pause = TEMP_DIR / "practice_intro_pause.mp3"
-        if await generate_silence_mp3(pauses['section'], pause):
-            segments.append(pause)
+        segments.append(Pause(pauses['section']))
 
     # Generate practice based on type
     if resource_type == 'conversation':
@@ -604,9 +565,7 @@ async def generate_practice(phrases: List[Tuple[str, str]],
                 segments.append(english_file)
 
             # Pause for thinking
-            pause = TEMP_DIR / f"practice_pause_{i}.mp3"
-            if await generate_silence_mp3(3000, pause):  # 3 seconds
-                segments.append(pause)
+            segments.append(Pause(3000))  # 3 seconds
 
     elif resource_type == 'directions':
         # For directions: normal speed with adequate pauses
@@ -616,9 +575,7 @@ async def generate_practice(phrases: List[Tuple[str, str]],
                 segments.append(phrase_file)
 
             # Shorter pause
-            pause = TEMP_DIR / f"practice_pause_{i}.mp3"
-            if await generate_silence_mp3(1500, pause):
-                segments.append(pause)
+            segments.append(Pause(1500))
 
     else:  # basic_phrases and emergency
         # Standard: All English phrases at normal speed with pauses
@@ -628,9 +585,7 @@ async def generate_practice(phrases: List[Tuple[str, str]],
                 segments.append(phrase_file)
 
             # Pause for repetition
-            pause = TEMP_DIR / f"practice_pause_{i}.mp3"
-            if await generate_silence_mp3(pauses['after_spanish'], pause):
-                segments.append(pause)
+            segments.append(Pause(pauses['after_spanish']))
 
     return segments
 
@@ -673,7 +628,8 @@ async def generate_conclusion(phrase_count: int, resource_type: str = 'basic_phr
 
 
 async def generate_complete_audio(resource_id: str, phrases: List[Tuple[str, str]],
-                                 resource_type: str = 'basic_phrases') -> bool:
+                                 resource_type: str = 'basic_phrases',
+                                 progress: Optional[ResourceProgress] = None) -> bool:
     """
     Generate complete audio file for a resource with type-specific formatting.
 
@@ -681,44 +637,44 @@ async def generate_complete_audio(resource_id: str, phrases: List[Tuple[str, str
         resource_id: Resource ID number
         phrases: List of (English, Spanish) phrase tuples
         resource_type: Type of resource (conversation, directions, emergency, basic_phrases)
+        progress: Reporter tagging each step with the resource ID (batch runs)
     """
+    say = progress or log_message
     try:
-        TEMP_DIR.mkdir(parents=True, exist_ok=True)
-        all_segments = []
+        all_segments: List[Segment] = []
         pauses = PAUSE_CONFIGS[resource_type]
 
-        log_message(f"  🎯 Format: {resource_type.upper()}")
-        log_message(f"  🎤 Generating introduction...")
+        say(f"  🎯 Format: {resource_type.upper()}")
+        say(f"  🎤 Generating introduction...")
         intro = await generate_introduction(len(phrases), resource_type)
         if intro:
             all_segments.append(intro)
 
             # Pause after intro
-            pause = TEMP_DIR / "intro_pause.mp3"
-            if await generate_silence_mp3(pauses['section'], pause):
-                all_segments.append(pause)
+            all_segments.append(Pause(pauses['section']))
 
         # Generate each phrase
-        log_message(f"  🎤 Generating {len(phrases)} phrases...")
+        say(f"  🎤 Generating {len(phrases)} phrases...")
         for i, (english, spanish) in enumerate(phrases, 1):
             phrase_segments = await generate_phrase_audio(english, spanish, i, resource_type)
             all_segments.extend(phrase_segments)
 
             # Pause between phrases
-            pause = TEMP_DIR / f"between_pause_{i}.mp3"
-            if await generate_silence_mp3(pauses['between_phrases'], pause):
-                all_segments.append(pause)
+            all_segments.append(Pause(pauses['between_phrases']))
 
             if i % 5 == 0:
-                log_message(f"    ✓ {i}/{len(phrases)} phrases generated", also_print=False)
+                if progress:
+                    progress.step(i, len(phrases), "phrases generated")
+                else:
+                    log_message(f"    ✓ {i}/{len(phrases)} phrases generated", also_print=False)
 
         # Practice section
-        log_message(f"  🎤 Generating practice section...")
+        say(f"  🎤 Generating practice section...")
         practice_segments = await generate_practice(phrases, resource_type)
         all_segments.extend(practice_segments)
 
         # Conclusion
-        log_message(f"  🎤 Generating conclusion...")
+        say(f"  🎤 Generating conclusion...")
         conclusion = await generate_conclusion(len(phrases), resource_type)
         if conclusion:
             all_segments.append(conclusion)
@@ -727,23 +683,18 @@ async def generate_complete_audio(resource_id: str, phrases: List[Tuple[str, str
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         output_file = OUTPUT_DIR / f"resource-{resource_id}.mp3"
 
-        log_message(f"  🔧 Concatenating {len(all_segments)} audio segments...")
-        success = await concatenate_audio_files(all_segments, output_file)
+        say(f"  🔧 Encoding {len(all_segments)} audio segments and pauses...")
+        success = await concatenate_audio_files(all_segments, output_file, say)
 
         if success:
             # Verify
             file_size = output_file.stat().st_size
-            log_message(f"  ✅ Generated: {output_file.name} ({file_size/1024/1024:.2f} MB)")
-
-        # Clean up temp files
-        for segment in all_segments:
-            if segment and segment.exists():
-                segment.unlink()
+            say(f"  ✅ Generated: {output_file.name} ({file_size/1024/1024:.2f} MB)")
 
         return success
 
     except Exception as e:
-        log_message(f"  ❌ Error generating audio: {e}")
+        say(f"  ❌ Error generating audio: {e}")
         return False
 
 
@@ -777,44 +728,61 @@ def get_resource_title(resource_id: str, mapping: Dict) -> str:
     return f"Resource {resource_id}"
 
 
-async def regenerate_resource(resource_id: str, mapping: Dict) -> bool:
+async def regenerate_resource(resource_id: str, mapping: Dict,
+                              progress: Optional[ResourceProgress] = None) -> bool:
     """Regenerate audio for a single resource with type detection."""
-    log_message(f"\n{'='*60}")
-    log_message(f"🔄 Processing Resource {resource_id}")
-    log_message(f"{'='*60}")
+    say = progress or log_message
+    if progress is None:
+        log_message(f"\n{'='*60}")
+        log_message(f"🔄 Processing Resource {resource_id}")
+        log_message(f"{'='*60}")
 
     # Get resource title (from mapping or filename)
     title = get_resource_title(resource_id, mapping)
 
     # Detect resource type
     resource_type = detect_resource_type(resource_id, title)
-    log_message(f"  📋 Title/Type hint: {title}")
-    log_message(f"  🎯 Detected format: {resource_type}")
+    say(f"  📋 Title/Type hint: {title}")
+    say(f"  🎯 Detected format: {resource_type}")
 
     # Load phrases
-    phrases = load_phrases_for_resource(resource_id, mapping)
+    phrases = load_phrases_for_resource(resource_id, mapping, say)
 
     if not phrases:
-        log_message(f"  ❌ No phrases found")
+        say(f"  ❌ No phrases found")
         return False
 
     # Generate audio with type-specific formatting
-    success = await generate_complete_audio(resource_id, phrases, resource_type)
+    success = await generate_complete_audio(resource_id, phrases, resource_type, progress)
 
     if success:
-        log_message(f"  ✅ Resource {resource_id} COMPLETE")
+        say(f"  ✅ Resource {resource_id} COMPLETE")
     else:
-        log_message(f"  ❌ Resource {resource_id} FAILED")
+        say(f"  ❌ Resource {resource_id} FAILED")
 
     return success
 
 
 async def main():
     """Main regeneration process."""
+    parser = argparse.ArgumentParser(description='Regenerate all resource audio from source')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Resources processed at once (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--tts-rate', type=float, default=TTS_REQUESTS_PER_SECOND,
+                        help=f'TTS requests per second across all workers (default: {TTS_REQUESTS_PER_SECOND})')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Ignore the manifest and regenerate completed resources too')
+    args = parser.parse_args()
+    if args.tts_rate <= 0:
+        parser.error('--tts-rate must be greater than 0')
+
+    TTS_CACHE.limiter = TokenBucket(args.tts_rate, TTS_BURST)
+
     log_message("="*80)
     log_message("🚀 DEFINITIVE REGENERATION - ALL 56 RESOURCES")
     log_message("="*80)
     log_message(f"📅 Started: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    log_message(f"⚙️  {args.workers} workers, {args.tts_rate:g} TTS requests/s")
     log_message("")
 
     # Load master mapping
@@ -825,31 +793,27 @@ async def main():
 
     log_message(f"✅ Loaded mapping for {len(mapping)} resources")
 
-    # Track results
-    successful = []
-    failed = []
-
-    start_time = time.time()
+    # Completed resources are recorded so an interrupted run can resume
+    manifest = Manifest(MANIFEST_FILE, mapping)
+    if args.fresh:
+        manifest.reset()
 
-    # Process each resource
-    for resource_id in sorted(mapping.keys(), key=int):
-        try:
-            result = await regenerate_resource(resource_id, mapping)
+    async def process(resource_id: str, progress: ResourceProgress) -> bool:
+        return await regenerate_resource(resource_id, mapping, progress)
 
-            if result:
-                successful.append(resource_id)
-            else:
-                failed.append(resource_id)
+    start_time = time.time()
 
-            # Small delay
-            await asyncio.sleep(0.5)
+    try:
+        result = await run_batch(
+            sorted(mapping.keys(), key=int), process,
+            workers=args.workers, manifest=manifest, log=log_message
+        )
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        log_message("\n⚠️  Interrupted by user - rerun to resume from the manifest")
+        return
 
-        except KeyboardInterrupt:
-            log_message("\n⚠️  Interrupted by user")
-            break
-        except Exception as e:
-            log_message(f"❌ Unexpected error on resource {resource_id}: {e}")
-            failed.append(resource_id)
+    successful = sorted(result.succeeded, key=int)
+    failed = sorted(result.failed, key=int)
 
     # Summary
     elapsed = time.time() - start_time
@@ -859,7 +823,9 @@ async def main():
     log_message("="*80)
     log_message(f"✅ Successful: {len(successful)} resources")
     log_message(f"❌ Failed: {len(failed)} resources")
+    log_message(f"⏭️  Already complete: {len(result.skipped)} resources")
     log_message(f"⏱️  Total time: {elapsed/60:.1f} minutes")
+    log_message(f"🗄️  {TTS_CACHE.summary()}")
 
     if successful:
         log_message(f"\n✅ Successful: {', '.join(successful)}")
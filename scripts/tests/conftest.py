@@ -0,0 +1,6 @@
+"""Make the shared script modules (batch_runner, tts_cache, ...) importable"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,129 @@
+"""Tests for batch_runner.py (manifest and concurrent batch runs)"""
+
+import asyncio
+import json
+
+from batch_runner import Manifest, ResourceProgress, run_batch
+
+
+def run(resource_ids, results, manifest=None, workers=2):
+    """Run a batch whose resources succeed or fail as given in results"""
+    processed = []
+
+    async def process(resource_id, progress):
+        processed.append(resource_id)
+        await asyncio.sleep(0)
+        return results.get(resource_id, True)
+
+    result = asyncio.run(run_batch(resource_ids, process, workers=workers,
+                                   manifest=manifest, log=lambda message: None))
+    return result, processed
+
+
+def test_manifest_records_and_reloads(tmp_path):
+    path = tmp_path / 'manifest.json'
+    manifest = Manifest(path, [1, 2])
+    manifest.mark_done(1, seconds=3.0)
+
+    reloaded = Manifest(path, [2, 1])
+    assert reloaded.is_done(1)
+    assert not reloaded.is_done(2)
+    assert reloaded.completed['1']['seconds'] == 3.0
+
+
+def test_manifest_ignores_unreadable_file(tmp_path):
+    path = tmp_path / 'manifest.json'
+    path.write_text('{not json', encoding='utf-8')
+
+    assert Manifest(path, [1]).completed == {}
+
+
+def test_run_batch_skips_completed_and_records_new(tmp_path):
+    path = tmp_path / 'manifest.json'
+    Manifest(path, [1, 2, 3]).mark_done(1)
+
+    result, processed = run([1, 2, 3], {3: False}, Manifest(path, [1, 2, 3]))
+
+    assert sorted(processed) == [2, 3]
+    assert result.skipped == [1]
+    assert result.succeeded == [2]
+    assert result.failed == [3]
+    # The failure keeps the record, so the next run only retries 3
+    manifest = Manifest(path, [1, 2, 3])
+    assert manifest.is_done(1) and manifest.is_done(2)
+    assert not manifest.is_done(3)
+
+
+def test_run_batch_resets_record_once_batch_succeeds(tmp_path):
+    path = tmp_path / 'manifest.json'
+    Manifest(path, [1, 2]).mark_done(1)
+
+    result, processed = run([1, 2], {}, Manifest(path, [1, 2]))
+
+    assert processed == [2]
+    assert not path.exists()
+    # The next run of the same batch starts fresh
+    _, processed = run([1, 2], {}, Manifest(path, [1, 2]))
+    assert sorted(processed) == [1, 2]
+
+
+def test_other_batch_does_not_clear_interrupted_run(tmp_path):
+    path = tmp_path / 'manifest.json'
+    full = [1, 2, 3, 4]
+    for resource_id in (1, 2):
+        Manifest(path, full).mark_done(resource_id)
+
+    # A one-off run of a resource the full run already finished
+    _, processed = run([2], {}, Manifest(path, [2]))
+    assert processed == [2]
+
+    _, processed = run(full, {}, Manifest(path, full))
+    assert sorted(processed) == [3, 4]
+    assert not path.exists()
+
+
+def test_reset_keeps_other_batches(tmp_path):
+    path = tmp_path / 'manifest.json'
+    Manifest(path, [1, 2]).mark_done(1)
+    Manifest(path, [5]).mark_done(5)
+
+    Manifest(path, [5]).reset()
+
+    assert Manifest(path, [1, 2]).is_done(1)
+    assert list(json.loads(path.read_text(encoding='utf-8'))['batches']) == ['1,2']
+
+
+def test_run_batch_counts_exceptions_as_failures():
+    async def process(resource_id, progress):
+        raise RuntimeError('TTS down')
+
+    result = asyncio.run(run_batch([7], process, log=lambda message: None))
+
+    assert result.failed == [7]
+
+
+def test_run_batch_limits_concurrency():
+    active = 0
+    peak = 0
+
+    async def process(resource_id, progress):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return True
+
+    asyncio.run(run_batch(range(6), process, workers=2, log=lambda message: None))
+
+    assert peak == 2
+
+
+def test_progress_lines_are_tagged():
+    lines = []
+    progress = ResourceProgress(12, lines.append)
+
+    progress('started')
+    progress.step(5, 20, 'phrases generated')
+
+    assert lines == ['   [12] started', '   [12] 5/20 (25%) phrases generated']
@@ -0,0 +1,97 @@
+"""Tests for tts_cache.py (rate limiter and segment cache)"""
+
+import asyncio
+import sys
+import time
+import types
+
+import pytest
+
+from tts_cache import TTSCache, TokenBucket, cache_key
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+    with pytest.raises(ValueError):
+        TokenBucket(-1.0)
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=20.0, burst=3)
+
+    async def acquire_times(count):
+        start = time.monotonic()
+        times = []
+        for _ in range(count):
+            await bucket.acquire()
+            times.append(time.monotonic() - start)
+        return times
+
+    times = asyncio.run(acquire_times(5))
+
+    # Three tokens right away, then one every 1/20 s
+    assert times[2] < 0.02
+    assert times[4] == pytest.approx(0.1, abs=0.04)
+
+
+def test_cache_key_depends_on_voice_and_rate():
+    key = cache_key('Hola', 'es-CO-SalomeNeural', '+0%')
+
+    assert key == cache_key('Hola', 'es-CO-SalomeNeural', '+0%')
+    assert key != cache_key('Hola', 'en-US-JennyNeural', '+0%')
+    assert key != cache_key('Hola', 'es-CO-SalomeNeural', '-20%')
+
+
+@pytest.fixture
+def fake_edge_tts(monkeypatch):
+    """edge_tts stand-in that records the texts it synthesizes"""
+    calls = []
+
+    class Communicate:
+        def __init__(self, text, voice, rate='+0%'):
+            self.text = text
+
+        async def save(self, path):
+            calls.append(self.text)
+            await asyncio.sleep(0.01)
+            with open(path, 'wb') as f:
+                f.write(b'mp3:' + self.text.encode('utf-8'))
+
+    monkeypatch.setitem(sys.modules, 'edge_tts', types.SimpleNamespace(Communicate=Communicate))
+    return calls
+
+
+def test_cache_synthesizes_each_segment_once(tmp_path, fake_edge_tts):
+    cache = TTSCache(tmp_path)
+
+    async def main():
+        # Concurrent identical requests share one TTS call
+        first = await asyncio.gather(*(cache.synthesize('Hola', 'es-CO-SalomeNeural') for _ in range(3)))
+        again = await cache.synthesize('Hola', 'es-CO-SalomeNeural')
+        return first, again
+
+    first, again = asyncio.run(main())
+
+    assert fake_edge_tts == ['Hola']
+    assert len(set(first)) == 1 and again == first[0]
+    assert again.read_bytes() == b'mp3:Hola'
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_failed_synthesis_leaves_nothing_cached(tmp_path, monkeypatch):
+    class Communicate:
+        def __init__(self, text, voice, rate='+0%'):
+            pass
+
+        async def save(self, path):
+            raise ConnectionError('service unavailable')
+
+    monkeypatch.setitem(sys.modules, 'edge_tts', types.SimpleNamespace(Communicate=Communicate))
+    cache = TTSCache(tmp_path)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(cache.synthesize('Hola', 'es-CO-SalomeNeural'))
+
+    assert not list(tmp_path.rglob('*.mp3'))
+    assert not list(tmp_path.rglob('*.part'))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Content-addressed TTS segment cache shared by the audio scripts
+
+Every segment the scripts synthesize (phrases, "Frase N." context lines,
+intros, conclusions) is stored once under a key derived from exactly what
+edge-tts is asked for: the text, the voice and the rate. Regenerating the
+catalog then only calls the TTS service for text it has never produced
+before; a phrase repeated within a lesson, or shared by several
+resources, is synthesized once.
+
+Layout: ``<cache_dir>/<key[:2]>/<key>.mp3``. Entries are written to a
+temporary file and renamed into place, so an interrupted run never leaves
+a truncated segment behind. Cached files are shared: callers read them
+but must not delete or modify them.
+
+    cache = TTSCache()
+    path = await cache.synthesize("Frase 1.", "es-CO-SalomeNeural", "+0%")
+    lesson.add_file(path)
+
+The cache directory defaults to ``.tts-cache/`` in the project root and
+can be moved with the HABLAS_TTS_CACHE environment variable.
+
+Misses can be throttled by a TokenBucket. One bucket shared by every
+resource being regenerated bounds the request rate to the TTS service
+as a whole, however many resources run at once, and cache hits never
+wait for it.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('HABLAS_TTS_CACHE', Path(__file__).parent.parent / '.tts-cache')
+)
+
+# Bump when the synthesis settings change so old entries are ignored
+CACHE_FORMAT = 1
+
+
+def cache_key(text: str, voice: str, rate: str = '+0%') -> str:
+    """Hex SHA-256 identifying one synthesized segment"""
+    digest = hashlib.sha256()
+    for part in (str(CACHE_FORMAT), voice, rate, text):
+        digest.update(part.encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter
+
+    Allows ``rate`` acquisitions per second on average, with bursts of up
+    to ``burst``. Waiters are served in arrival order.
+
+    Args:
+        rate: Sustained acquisitions per second
+        burst: Acquisitions allowed back to back after an idle period
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self):
+        """Wait for a token"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class TTSCache:
+    """
+    Disk cache of edge-tts segments keyed by (text, voice, rate)
+
+    Args:
+        cache_dir: Directory holding the cached MP3 segments
+        limiter: Rate limiter every TTS request (cache miss) waits on
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+                 limiter: Optional[TokenBucket] = None):
+        self.cache_dir = Path(cache_dir)
+        self.limiter = limiter
+        self.hits = 0
+        self.misses = 0
+        # Requests in flight, so concurrent identical requests share one call
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def path_for(self, text: str, voice: str, rate: str = '+0%') -> Path:
+        """Location of a segment's cache entry (which may not exist yet)"""
+        key = cache_key(text, voice, rate)
+        return self.cache_dir / key[:2] / f'{key}.mp3'
+
+    async def synthesize(self, text: str, voice: str, rate: str = '+0%') -> Path:
+        """
+        Return the cached segment, synthesizing it on a miss
+
+        Raises:
+            Whatever edge-tts raises when synthesis fails; nothing is cached
+        """
+        path = self.path_for(text, voice, rate)
+        if path.exists():
+            self.hits += 1
+            return path
+
+        key = path.stem
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch(text, voice, rate, path))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self.hits += 1
+        # One caller giving up must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, text: str, voice: str, rate: str, path: Path) -> Path:
+        import edge_tts
+
+        if self.limiter is not None:
+            await self.limiter.acquire()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.part')
+        os.close(fd)
+        try:
+            communicate = edge_tts.Communicate(text, voice, rate=rate)
+            await communicate.save(tmp_name)
+            if os.path.getsize(tmp_name) == 0:
+                raise RuntimeError(f"No audio returned for {text[:40]!r}")
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return path
+
+    def summary(self) -> str:
+        """One-line hit/miss report"""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"TTS cache: {self.hits} hits, {self.misses} synthesized ({rate:.0f}% hit rate)"
@@ -3,6 +3,7 @@
 Deployed Audio Verification - Check what's ACTUALLY live on the site
 Downloads and analyzes deployed audio files from GitHub Pages
 """
+import importlib.util
 import json
 import os
 import sys
@@ -11,6 +12,15 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import subprocess
 
+# Same duration probe as video_gen (see audit-all-resources.py)
+_DURATION_PY = (Path(__file__).parent.parent / 'active-development' / 'video_gen'
+                / 'video_gen' / 'audio_generator' / 'duration.py')
+_spec = importlib.util.spec_from_file_location('video_gen_audio_duration', _DURATION_PY)
+_duration = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = _duration
+_spec.loader.exec_module(_duration)
+probe_duration = _duration.probe_duration
+
 def download_deployed_audio(resource_id: int, output_dir: Path) -> Optional[Path]:
     """Download audio file from GitHub Pages"""
 
@@ -44,7 +54,11 @@ def estimate_phrases_from_size(size_mb: float) -> int:
     return int(size_kb / kb_per_phrase)
 
 def analyze_audio_duration(file_path: Path) -> Optional[float]:
-    """Get audio duration in seconds using ffprobe if available"""
+    """Get audio duration in seconds (MP3 headers, ffprobe as fallback)"""
+    duration = probe_duration(file_path)
+    if duration is not None:
+        return duration
+
     try:
         result = subprocess.run(
             ['ffprobe', '-v', 'error', '-show_entries',